@@ -0,0 +1,251 @@
+"""
+Benchmark comparing the throughput of part searches made from a thread pool and from an event
+loop, against a local fake of the Digikey keyword search
+"""
+import os
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+import threading
+import contextlib
+import http.server
+from unittest.mock import patch
+
+from component_manager.src import *
+from component_manager.src.component_async import *
+from component_manager.benchmark.benchmark_suite import generate_bom
+
+# Number of BoM rows searched by default
+DEFAULT_ROWS = 2000
+
+# Number of seconds the fake search API takes to answer each search by default
+DEFAULT_LATENCY = 0.02
+
+# Numbers of searches in flight benchmarked by default
+DEFAULT_CONCURRENCIES = (8, 32, 128)
+
+def keyword_search_response(record):
+    """ Creates the keyword search response of the Digikey API giving a search result record.
+
+    Parameters:
+        - record: The search result record
+
+    Returns: The keyword search response as a dictionary ready to encode as JSON
+    """
+    if not record["found"]:
+        return {"Products": []}
+
+    pricing = [{"BreakQuantity": break_quantity, "UnitPrice": unit_price,
+                "TotalPrice": break_quantity * unit_price}
+               for break_quantity, unit_price in record["price_breaks"]
+               if break_quantity not in (1, 100)]
+    if record["price"][0]:
+        pricing.append({"BreakQuantity": 1, "UnitPrice": record["price"][0],
+                        "TotalPrice": record["price"][0]})
+    if record["price"][1]:
+        pricing.append({"BreakQuantity": 100, "UnitPrice": record["price"][1] / 100,
+                        "TotalPrice": record["price"][1]})
+    return {"Products": [{
+        "Parameters": [{"ParameterId": code, "Value": value}
+                       for code, value in record["parameters"].items()],
+        "StandardPricing": pricing,
+        "QuantityAvailable": 0 if record["lead_time"] != 0 else 1000,
+        "ManufacturerLeadWeeks": record["lead_time"]}]}
+
+
+class FakeDigikeyHandler(http.server.BaseHTTPRequestHandler):
+    """ Handler answering keyword searches from the recorded search results of its server, keeping
+        connections open between searches.
+    """
+    protocol_version = "HTTP/1.1"
+    # Headers and body are sent separately, so waiting to coalesce them would add a delay
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        with self.server._lock:
+            self.server._connections += 1
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with self.server._lock:
+            self.server._searches += 1
+        if self.server._latency > 0:
+            time.sleep(self.server._latency)
+
+        record = self.server._backend.recorded_record(request["Keywords"])
+        body = json.dumps(keyword_search_response(record)).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("X-RateLimit-Limit", "1000")
+        self.send_header("X-RateLimit-Remaining", "1000")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeDigikeyServer(http.server.ThreadingHTTPServer):
+    """ Local stand in for the Digikey keyword search, answering from recorded search results
+        after a fixed latency.
+
+    Parameters:
+        - backend: The fake backend holding the recorded search results
+        - latency: The number of seconds each search takes
+
+    Attributes:
+        - searches: The number of searches answered
+        - connections: The number of connections accepted
+    """
+    daemon_threads = True
+
+    def __init__(self, backend, latency=0):
+        super().__init__(("127.0.0.1", 0), FakeDigikeyHandler)
+        self._backend = backend
+        self._latency = latency
+        self._searches = 0
+        self._connections = 0
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def url(self):
+        """ Finds the base URL of the server.
+
+        Returns: The base URL searches are made to
+        """
+        return "http://127.0.0.1:" + str(self.server_address[1])
+
+    def start(self):
+        """ Starts answering searches in a background thread. """
+        self._thread = threading.Thread(target=self.serve_forever)
+        self._thread.start()
+
+    def stop(self):
+        """ Stops answering searches and closes the server. """
+        self.shutdown()
+        self.server_close()
+        self._thread.join()
+
+
+@contextlib.contextmanager
+def stored_token():
+    """ Stores an unexpired access token where the digikey-api client reads it, so searches are
+        made without authorising with Digikey.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        with open(os.path.join(directory, "token_storage.json"), "w") as token_file:
+            json.dump({"access_token": "token", "refresh_token": "refresh",
+                       "expires": time.time() + 3600, "token_type": "Bearer"}, token_file)
+        environment = {"DIGIKEY_CLIENT_ID": "id", "DIGIKEY_CLIENT_SECRET": "secret",
+                       "DIGIKEY_STORAGE_PATH": directory}
+        with patch.dict(os.environ, environment):
+            yield
+
+
+def time_threads(data, url, concurrency):
+    """ Times converting BoM rows with part searches made from a thread pool.
+
+    Parameters:
+        - data: The CSV rows to convert
+        - url: The base URL of the search API
+        - concurrency: The number of searching threads
+
+    Returns: A tuple of the seconds taken and the components created
+    """
+    converter = ComponentConverter(backend=DigikeyBackend(url))
+    converter._data = [list(component_data) for component_data in data]
+    start = time.perf_counter()
+    converter.create_component_list(concurrency)
+    return time.perf_counter() - start, converter._components
+
+
+def time_asyncio(data, url, concurrency):
+    """ Times converting BoM rows with part searches made from an event loop.
+
+    Parameters:
+        - data: The CSV rows to convert
+        - url: The base URL of the search API
+        - concurrency: The number of searches in flight at once
+
+    Returns: A tuple of the seconds taken and the components created
+    """
+    async def convert():
+        backend = AsyncDigikeyBackend(url)
+        converter = AsyncComponentConverter(backend=backend, concurrency=concurrency)
+        converter._data = [list(component_data) for component_data in data]
+        try:
+            await converter.create_component_list_async()
+        finally:
+            await backend.close()
+        return converter._components
+
+    start = time.perf_counter()
+    components = asyncio.run(convert())
+    return time.perf_counter() - start, components
+
+
+def run_benchmark(rows=DEFAULT_ROWS, latency=DEFAULT_LATENCY,
+                  concurrencies=DEFAULT_CONCURRENCIES, seed=0):
+    """ Times converting a synthetic BoM from the fake search API with each way of searching and
+        number of searches in flight.
+
+    Parameters:
+        - rows: The number of BoM rows
+        - latency: The number of seconds the fake search API takes to answer each search
+        - concurrencies: The numbers of searches in flight to benchmark
+        - seed: The seed of the synthetic BoM
+
+    Returns: A dictionary of the searches made and the seconds and searches per second of each
+             way of searching, keyed by number of searches in flight
+    """
+    data, records = generate_bom(rows, seed)
+    backend = FakeBackend()
+    backend.add_records(records)
+    part_count = len(set(component_data[CSV_PART_NUMBER_INDEX] for component_data in data))
+
+    results = {"rows": rows, "searches": part_count, "latency": latency, "concurrency": {}}
+    server = FakeDigikeyServer(backend, latency)
+    server.start()
+    try:
+        with stored_token():
+            for concurrency in concurrencies:
+                timings = {}
+                for name, time_path in (("threads", time_threads), ("asyncio", time_asyncio)):
+                    seconds, components = time_path(data, server.url(), concurrency)
+                    timings[name] = {"seconds": seconds, "searches_per_second": part_count /
+                                     seconds}
+                results["concurrency"][str(concurrency)] = timings
+    finally:
+        server.stop()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=("Compares part searches made from a thread pool "
+                                                  "and from an event loop against a local fake "
+                                                  "of the Digikey search API."))
+    parser.add_argument('--rows', type=int, default=DEFAULT_ROWS, help="Number of BoM rows")
+    parser.add_argument('--latency', type=float, default=DEFAULT_LATENCY,
+                        help="Seconds the fake search API takes to answer each search")
+    parser.add_argument('-c', type=int, nargs='+', default=list(DEFAULT_CONCURRENCIES),
+                        metavar="CONCURRENCY", help="Numbers of searches in flight to benchmark")
+    parser.add_argument('-o', metavar="OUTPUT", help="JSON file the results are written to")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.rows, args.latency, args.c)
+    for concurrency, timings in results["concurrency"].items():
+        for name, timing in timings.items():
+            print(str(results["searches"]) + " searches, " + concurrency + " in flight, " + name +
+                  ": " + str(round(timing["seconds"], 3)) + "s, " +
+                  str(round(timing["searches_per_second"])) + " searches/s")
+
+    if args.o is not None:
+        with open(args.o, "w") as output_file:
+            json.dump(results, output_file, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark measuring the memory used per component model
+"""
+import sys
+import tracemalloc
+
+from component_manager.src.components import *
+
+# Number of components created for each measurement
+COMPONENT_COUNT = 10000
+
+# Parameter values given to each resistor, as a search returns them
+RESISTOR_VALUES = {Resistor.TOLERANCE_SEARCH_CODE: "±1%",
+                   Resistor.PACKAGE_SEARCH_CODE: "0402 (1005 Metric)",
+                   Resistor.SIZE_SEARCH_CODE: "0.039\" L x 0.020\" W (1.00mm x 0.50mm)",
+                   Resistor.TEMPERATURE_SEARCH_CODE: "-55°C ~ 155°C",
+                   Resistor.HEIGHT_SEARCH_CODE: "0.016\" (0.40mm)",
+                   Resistor.STATUS_SEARCH_CODE: "Active",
+                   Resistor.POWER_SEARCH_CODE: "0.063W, 1/16W",
+                   Resistor.RESISTANCE_SEARCH_CODE: "715 kOhms"}
+
+class DictResistor():
+    """ Resistor with the attributes of a component before components were given a fixed
+        parameter layout, a per-instance attribute dictionary holding the name, a dictionary of
+        parameter values, the price and the lead time, used as the baseline.
+
+    Parameters:
+        - part_name: The name of the component to be created
+    """
+    def __init__(self, part_name):
+        self._name = part_name
+        self._parameters = {Resistor.TOLERANCE_SEARCH_CODE: None,
+                            Resistor.PACKAGE_SEARCH_CODE: None,
+                            Resistor.SIZE_SEARCH_CODE: None,
+                            Resistor.TEMPERATURE_SEARCH_CODE: None,
+                            Resistor.HEIGHT_SEARCH_CODE: None,
+                            Resistor.STATUS_SEARCH_CODE: None}
+        self._price = [0, 0]
+        self._lead_time = 0
+        self._parameters[Resistor.POWER_SEARCH_CODE] = None
+        self._parameters[Resistor.RESISTANCE_SEARCH_CODE] = None
+
+    def set_parameter(self, parameter_code, value):
+        """ Sets the value of the parameter with the given search code, as a search did.
+
+        Parameters:
+            - parameter_code: The search code of the parameter
+            - value: The raw value of the parameter
+        """
+        self._parameters[parameter_code] = value
+
+
+def measure(component_class, count=COMPONENT_COUNT):
+    """ Measures the memory allocated per component when creating the given number of resistors
+        with every parameter and its price set.
+
+    Parameters:
+        - component_class: The resistor class to create
+        - count: The number of components to create
+
+    Returns: The number of bytes allocated per component
+    """
+    part_names = ["RC0402FR-07" + str(i) + "KL" for i in range(count)]
+
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    components = []
+    for part_name in part_names:
+        component = component_class(part_name)
+        for code, value in RESISTOR_VALUES.items():
+            component.set_parameter(code, value)
+        component._price = [0.1, 0.66]
+        components.append(component)
+    end = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (end - start - sys.getsizeof(components)) / count
+
+
+def main():
+    before = measure(DictResistor)
+    after = measure(Resistor)
+    print("Dictionary layout: " + str(round(before)) + " bytes per component.")
+    print("Slotted layout: " + str(round(after)) + " bytes per component.")
+    print("Saving: " + str(round(100 * (before - after) / before)) + "%.")
+
+if __name__ == "__main__":
+    main()
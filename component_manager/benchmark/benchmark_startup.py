@@ -0,0 +1,113 @@
+"""
+Benchmark measuring the start up time of the application reading a snapshot, compared with the
+time taken to load the Digikey client and NumPy
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+import tempfile
+
+from component_manager.src import *
+
+# Root of the repository, added to the path of each measured process
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Recorded search results and BoM the benchmarked snapshot is created from
+FIXTURES = os.path.join(ROOT, "component_manager", "test", "fixtures.json")
+BOM = os.path.join(ROOT, "component_manager", "test", "toplevel_test.csv")
+
+# Modules that should only be loaded when a live search or vectorised check needs them
+HEAVY_MODULES = ("digikey", "numpy")
+
+# Number of times each command is run
+DEFAULT_REPEAT = 10
+
+# Runs the application on the given arguments, then prints the heavy modules it loaded
+SNAPSHOT_RUN = ("import sys\n"
+                "from component_manager.src.component_app import main\n"
+                "sys.argv = ['component_app.py'] + sys.argv[1:]\n"
+                "main()\n"
+                "print([module for module in " + repr(HEAVY_MODULES) +
+                " if module in sys.modules])\n")
+
+def run_python(arguments):
+    """ Runs a Python process from the root of the repository.
+
+    Parameters:
+        - arguments: The arguments given to the Python interpreter
+
+    Returns: A tuple of the wall time in seconds and the printed output
+    """
+    environment = dict(os.environ, PYTHONPATH=ROOT)
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable] + arguments, capture_output=True, text=True,
+                            check=True, cwd=ROOT, env=environment)
+    return time.perf_counter() - start, result.stdout
+
+
+def create_snapshot(directory):
+    """ Saves a snapshot of the test BoM, searched from the recorded search results.
+
+    Parameters:
+        - directory: The directory the snapshot is saved in
+
+    Returns: The name of the snapshot file
+    """
+    converter = ComponentConverter(backend=FakeBackend(FIXTURES))
+    converter.read_csv_file(BOM)
+    converter.create_component_list()
+    snapshot_filename = os.path.join(directory, "snapshot")
+    converter.save_component_list(snapshot_filename)
+    return snapshot_filename
+
+
+def loaded_modules(snapshot_filename):
+    """ Finds the heavy modules loaded when pricing a snapshot.
+
+    Parameters:
+        - snapshot_filename: The snapshot to price
+
+    Returns: The list of heavy modules loaded
+    """
+    elapsed, output = run_python(["-c", SNAPSHOT_RUN, snapshot_filename, "-p", "-n"])
+    return json.loads(output.strip().splitlines()[-1].replace("'", '"'))
+
+
+def median_time(arguments, repeat):
+    """ Finds the median wall time of running a Python process.
+
+    Parameters:
+        - arguments: The arguments given to the Python interpreter
+        - repeat: The number of times to run the process
+
+    Returns: The median wall time in seconds
+    """
+    return statistics.median(run_python(arguments)[0] for i in range(repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks the start up time of pricing a "
+                                                 "snapshot.")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT,
+                        help="Number of times each command is run")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        snapshot_filename = create_snapshot(directory)
+        results = {
+            "interpreter": median_time(["-c", "pass"], args.repeat),
+            "snapshot_price": median_time([os.path.join(ROOT, "component_manager", "src",
+                                                        "component_app.py"),
+                                           snapshot_filename, "-p", "-n"], args.repeat),
+            "heavy_imports": median_time(["-c", "import " + ", ".join(HEAVY_MODULES) + "\n"
+                                          "import digikey.v3.productinformation"], args.repeat),
+            "heavy_modules_loaded": loaded_modules(snapshot_filename)}
+
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+"""
+Benchmark suite timing enrichment, alternative checking, costing and snapshot I/O on synthetic
+BoMs, answered offline from recorded Digikey search results
+"""
+import os
+import io
+import csv
+import json
+import time
+import random
+import argparse
+import platform
+import tempfile
+import subprocess
+import contextlib
+
+from component_manager.src import *
+
+# Recorded search results the synthetic parts are copied from
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "test",
+                        "fixtures.json")
+
+# Numbers of BoM rows benchmarked by default
+DEFAULT_SIZES = (100, 10000, 100000)
+
+# Share of original rows of each kind in a synthetic BoM, each followed by an alternative row
+ROW_MIX = {"Resistor": 0.45, "Capacitor": 0.4, "IC": 0.15}
+
+# Number of BoM rows per distinct synthetic part number
+ROWS_PER_PART = 4
+
+# Stages timed for each BoM size, in the order they run
+STAGES = ("read_csv_file", "create_component_list", "save_component_list", "read_component_list",
+          "check_alternative", "check_bom_cost", "check_cost_curve", "check_lead_time")
+
+def fixture_templates(filename=FIXTURES):
+    """ Groups the found parts of the recorded search results by component type.
+
+    Parameters:
+        - filename: The JSON file of recorded search result records
+
+    Returns: A dictionary of (part number, record) lists keyed by component type name
+    """
+    with open(filename, "r") as fixture_file:
+        records = json.load(fixture_file)
+
+    templates = {"Resistor": [], "Capacitor": []}
+    for part_name, record in sorted(records.items()):
+        codes = set(int(code) for code in record["parameters"])
+        if not record["found"]:
+            continue
+        if Resistor.RESISTANCE_SEARCH_CODE in codes:
+            templates["Resistor"].append((part_name, record))
+        elif Capacitor.CAPACITANCE_SEARCH_CODE in codes:
+            templates["Capacitor"].append((part_name, record))
+    return templates
+
+
+def generate_bom(rows, seed=0, templates=None):
+    """ Generates a synthetic BoM of original rows each followed by an "Alternative" row, along
+        with search results for its part numbers. Each synthetic part copies a recorded part of
+        the same type, and ICs are left unrecorded so they aren't found.
+
+    Parameters:
+        - rows: The number of BoM rows to generate
+        - seed: The seed of the random generator choosing parts
+        - templates: The recorded parts to copy grouped by type, read from the fixtures if None
+
+    Returns: A tuple of the CSV rows and the search result records keyed by part number
+    """
+    if templates is None:
+        templates = fixture_templates()
+    generator = random.Random(seed)
+    part_count = max(1, rows // ROWS_PER_PART)
+
+    # Synthetic part numbers per type, with each pair of parts copying the same recorded part so
+    # alternatives are found valid as well as invalid
+    parts = {}
+    records = {}
+    for component_type, share in ROW_MIX.items():
+        parts[component_type] = []
+        for i in range(max(2, int(part_count * share))):
+            part_name = component_type[:3].upper() + "-" + str(i).zfill(6)
+            parts[component_type].append(part_name)
+            if component_type in templates:
+                template = templates[component_type][(i // 2) % len(templates[component_type])][1]
+                records[part_name] = template
+
+    data = []
+    component_types = list(ROW_MIX)
+    weights = [ROW_MIX[component_type] for component_type in component_types]
+    while len(data) < rows:
+        component_type = generator.choices(component_types, weights)[0]
+        original = generator.randrange(len(parts[component_type]))
+        if generator.random() < 0.5:
+            alternative = min(original ^ 1, len(parts[component_type]) - 1)
+        else:
+            alternative = generator.randrange(len(parts[component_type]))
+
+        description = component_type + ", synthetic " + str(original)
+        data.append([description, parts[component_type][original], "1"])
+        data.append(["Alternative", parts[component_type][alternative], "1"])
+    return data[:rows], records
+
+
+def write_bom(filename, data):
+    """ Writes BoM rows to a CSV file.
+
+    Parameters:
+        - filename: The name of the CSV file
+        - data: The CSV rows to write
+    """
+    with open(filename, "w", newline="") as file:
+        csv.writer(file).writerows(data)
+
+
+def time_stage(function, repeat):
+    """ Times a benchmark stage, keeping the fastest of the repeats. Printed output is discarded.
+
+    Parameters:
+        - function: The stage to time, called with no arguments
+        - repeat: The number of times to run the stage
+
+    Returns: A tuple of the fastest time in seconds and the result of the last run
+    """
+    best = None
+    for i in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            result = function()
+            elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def run_size(rows, directory, workers=DEFAULT_WORKERS, repeat=1, seed=0):
+    """ Times every stage on a synthetic BoM of the given size.
+
+    Parameters:
+        - rows: The number of BoM rows
+        - directory: The directory the BoM and its snapshot are written to
+        - workers: The number of part searches run at once
+        - repeat: The number of times each stage is run
+        - seed: The seed of the synthetic BoM
+
+    Returns: A dictionary of the fastest time in seconds of each stage
+    """
+    data, records = generate_bom(rows, seed)
+    csv_filename = os.path.join(directory, "bom_" + str(rows) + ".csv")
+    snapshot_filename = csv_filename[:-4]
+    write_bom(csv_filename, data)
+
+    def new_converter():
+        backend = FakeBackend()
+        backend.add_records(records)
+        return ComponentConverter(backend=backend)
+
+    def create():
+        converter = new_converter()
+        converter.read_csv_file(csv_filename)
+        converter.create_component_list(workers)
+        return converter
+
+    results = {}
+    results["read_csv_file"], converter = time_stage(
+        lambda: new_converter().read_csv_file(csv_filename), repeat)
+    results["create_component_list"], converter = time_stage(create, repeat)
+    results["save_component_list"], result = time_stage(
+        lambda: converter.save_component_list(snapshot_filename), repeat)
+    results["read_component_list"], result = time_stage(
+        lambda: converter.read_component_list(snapshot_filename), repeat)
+
+    manager = ComponentManager(snapshot_filename)
+    results["check_alternative"], result = time_stage(manager.check_alternative, repeat)
+    results["check_bom_cost"], result = time_stage(manager.check_bom_cost, repeat)
+    results["check_cost_curve"], result = time_stage(
+        lambda: manager.check_cost_curve(DEFAULT_BUILD_QUANTITIES), repeat)
+    results["check_lead_time"], result = time_stage(manager.check_lead_time, repeat)
+    return results
+
+
+def git_commit():
+    """ Finds the commit the benchmark is run on.
+
+    Returns: The commit hash, or None if it can't be found
+    """
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(os.path.abspath(__file__))
+                              ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(sizes=DEFAULT_SIZES, workers=DEFAULT_WORKERS, repeat=1, seed=0):
+    """ Runs the benchmark suite on each BoM size.
+
+    Parameters:
+        - sizes: The numbers of BoM rows to benchmark
+        - workers: The number of part searches run at once
+        - repeat: The number of times each stage is run
+        - seed: The seed of the synthetic BoMs
+
+    Returns: The machine readable results, with the timings in seconds keyed by BoM size then
+             stage
+    """
+    results = {"commit": git_commit(), "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+               "python": platform.python_version(), "platform": platform.platform(),
+               "workers": workers, "repeat": repeat, "seed": seed, "sizes": {}}
+    with tempfile.TemporaryDirectory() as directory:
+        for rows in sizes:
+            results["sizes"][str(rows)] = run_size(rows, directory, workers, repeat, seed)
+    return results
+
+
+def compare(previous, current):
+    """ Describes the change in each timing between two benchmark results.
+
+    Parameters:
+        - previous: The earlier benchmark results
+        - current: The later benchmark results
+
+    Returns: A list of lines giving each stage's times and the ratio of the later to the earlier
+    """
+    lines = []
+    for rows, timings in current["sizes"].items():
+        for stage, seconds in timings.items():
+            earlier = previous["sizes"].get(rows, {}).get(stage)
+            if earlier is None:
+                continue
+            lines.append(rows + " rows " + stage + ": " + str(round(earlier, 4)) + "s -> " +
+                         str(round(seconds, 4)) + "s (x" +
+                         str(round(seconds / earlier, 2) if earlier else "inf") + ")")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks the component manager on synthetic "
+                                                 "BoMs.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES),
+                        help="Numbers of BoM rows to benchmark")
+    parser.add_argument('-w', type=int, default=DEFAULT_WORKERS,
+                        help="Number of concurrent part searches")
+    parser.add_argument('--repeat', type=int, default=1,
+                        help="Number of times each stage is run, keeping the fastest")
+    parser.add_argument('--seed', type=int, default=0, help="Seed of the synthetic BoMs")
+    parser.add_argument('-o', metavar="OUTPUT", help="JSON file the results are written to")
+    parser.add_argument('--compare', metavar="PREVIOUS",
+                        help="JSON file of earlier results to compare against")
+    args = parser.parse_args()
+
+    results = run_suite(args.sizes, args.w, args.repeat, args.seed)
+    for rows, timings in results["sizes"].items():
+        for stage in STAGES:
+            print(rows + " rows " + stage + ": " + str(round(timings[stage], 4)) + "s")
+
+    if args.o is not None:
+        with open(args.o, "w") as output_file:
+            json.dump(results, output_file, indent=2)
+    if args.compare is not None:
+        with open(args.compare, "r") as previous_file:
+            for line in compare(json.load(previous_file), results):
+                print(line)
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,14 @@
+from component_manager.src.component_stats import *
+from component_manager.src.component_units import *
+from component_manager.src.component_report import *
 from component_manager.src.components import *
+from component_manager.src.component_cache import *
+from component_manager.src.component_backend import *
+from component_manager.src.component_scheduler import *
+from component_manager.src.component_catalogue import *
+from component_manager.src.component_store import *
+from component_manager.src.component_validator import *
+from component_manager.src.component_costing import *
+from component_manager.src.component_index import *
 from component_manager.src.component_converter import *
 from component_manager.src.component_app import *
\ No newline at end of file
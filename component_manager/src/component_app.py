@@ -5,6 +5,10 @@ import logging
 import argparse
 import os
 import sys
+import csv
+import json
+import glob
+import concurrent.futures
 
 from component_manager.src import *
 
@@ -14,44 +18,193 @@ class ComponentManager():
     Parameters:
         component_converter: The component_converter object responsible for handling all
                              data passing
+        workers: The number of part searches to run at once when reading a CSV file
+        cache: The part lookup cache used when reading a CSV file, if any
+        backend: The lookup backend used when reading a CSV file, defaults to Digikey
+        stream: True to leave the file unread until its checks are streamed by stream_checks
+        incremental: True to only search the rows of a CSV file that changed since its snapshot
+        renderer: The renderer the results of the checks are written to, defaults to text
+        facets: The facets of part information searched when reading a CSV file, with checks
+                searching the facets they need but the components are missing
+        read_file: False to leave the file unread, for components given to the converter directly
+
+    Attributes:
+        snapshot: The snapshot the component list is saved to, or None if it isn't saved
     """
-    def __init__(self, filename):
-        self._component_converter = ComponentConverter()
+    def __init__(self, filename, workers=DEFAULT_WORKERS, cache=None, backend=None, stream=False,
+                 incremental=False, renderer=None, facets=FACETS, read_file=True):
+        self._component_converter = ComponentConverter(cache, backend, facets)
+        self._filename = filename
+        self._workers = workers
+        self._renderer = renderer if renderer is not None else TextRenderer()
+        self._snapshot = None
 
-        if filename[-3:] == "csv":
+        if stream or not read_file:
+            return
+        elif filename[-3:] == "csv" and incremental and os.path.exists(filename[:-4]):
+            previous_converter = self._component_converter.read_component_list(filename[:-4])
+            self._component_converter.read_csv_file(filename)
+            reused, searched, removed = self._component_converter.update_component_list(
+                previous_converter._data, previous_converter._components, workers)
+            self._component_converter.save_component_list(filename[:-4])
+            self._renderer.write(CheckResult(
+                "update", None, VERDICT_SUMMARY,
+                values={"reused": reused, "searched": searched, "removed": removed},
+                message=("Reused " + str(reused) + " components, searched " + str(searched) +
+                         ", removed " + str(removed) + ".")))
+            self._renderer.flush()
+        elif filename[-3:] == "csv":
             self._component_converter.read_csv_file(filename)
-            self._component_converter.create_component_list()
+            self._component_converter.create_component_list(workers)
             self._component_converter.save_component_list(filename[:-4])
         else:
             self._component_converter = self._component_converter.read_component_list(filename)
-        
-    def check_alternative(self):
+        self._snapshot = filename[:-4] if filename[-3:] == "csv" else filename
+
+    def require_facets(self, facets):
+        """ Searches for the facets of part information a check needs but the components are
+            missing, saving the completed component list to its snapshot.
+
+        Parameters:
+            - facets: The facets of part information the check needs
+        """
+        converter = self._component_converter
+        if converter.complete_components(facets, self._workers) and self._snapshot is not None:
+            converter.save_component_list(self._snapshot)
+
+    def check_cache(self):
+        """ Reports the number of part searches answered by the lookup cache. """
+        report_cache(self._component_converter._cache, self._renderer)
+
+    def check_budget(self):
+        """ Reports how much of the daily request budget the part searches used. """
+        report_budget(self._component_converter._backend, self._renderer)
+
+    @timed("check_alternative")
+    def check_alternative(self, processes=None):
         """ Checks the component list as a list of alternatives and determines if the components
         are valid alternatives.
+
+        Parameters:
+            - processes: The number of processes to validate the pairs across, if any
+
+        Returns: The list of results, one per pair
         """
-        i = 0
-        while i < len(self._component_converter._components):
-            original_component_valid = not isinstance(self._component_converter._components[i], str)
-            alternate_component_valid = not isinstance(self._component_converter._components[i + 1], str)
-            
-            if (original_component_valid and not alternate_component_valid):
-                print("Can't compare parts " + self._component_converter._components[i]._name +
-                      " and " + self._component_converter._components[i + 1] + ".")
-            elif (not original_component_valid and alternate_component_valid):
-                print("Can't compare parts " + self._component_converter._components[i] +
-                      " and " + self._component_converter._components[i + 1]._name + ".")
-            elif (not original_component_valid and not alternate_component_valid):
-                print("Can't compare parts " + self._component_converter._components[i] +
-                      " and " + self._component_converter._components[i + 1] + ".")
+        self.require_facets((FACET_PARAMETERS,))
+        if processes is not None:
+            results = self.check_alternative_parallel(processes)
+        else:
+            components = self._component_converter._components
+            results = [self.check_pair(components[i], components[i + 1])
+                       for i in range(0, len(components) - 1, 2)]
+        self._renderer.flush()
+        return results
+
+    def check_alternative_parallel(self, processes):
+        """ Checks the component list as a list of alternatives, validating the pairs across a
+            pool of processes and reporting each pair as its results arrive.
+
+        Parameters:
+            - processes: The number of validation processes, or 0 for the number of CPUs
+
+        Returns: The list of results, one per pair
+        """
+        components = self._component_converter._components
+        alternatives = components[1::2]
+        originals = components[0:2 * len(alternatives):2]
+        results = []
+        for original, alternative, (valid, reason) in zip(
+                originals, alternatives,
+                validate_pairs_parallel(originals, alternatives, processes or None)):
+            original_name = original if isinstance(original, str) else original._name
+            alternative_name = alternative if isinstance(alternative, str) else alternative._name
+            if valid:
+                result = CheckResult("alternative", original_name, VERDICT_VALID, alternative_name)
+            elif reason == REASONS[REASON_NOT_FOUND]:
+                result = CheckResult("alternative", original_name, VERDICT_NOT_FOUND,
+                                     alternative_name, message=("Can't compare parts " +
+                                                                original_name + " and " +
+                                                                alternative_name + "."))
+            elif reason == REASONS[REASON_UNVERIFIABLE]:
+                result = CheckResult("alternative", original_name, VERDICT_UNVERIFIABLE,
+                                     alternative_name, message=("Can't compare parts " +
+                                                                original_name + " and " +
+                                                                alternative_name + "."))
             else:
-                self._component_converter._components[i].is_alternative(
-                    self._component_converter._components[i + 1])
-            i += 2
+                # The validators only give the reason, so the failing parameter and its values
+                # are found again here to report the same result as a serial check
+                result = original.alternative_result(alternative)
+            self._renderer.write(result)
+            results.append(result)
+        return results
+
+    def check_pair(self, original_component, alternate_component):
+        """ Determines if the alternate component is a valid alternative for the original
+        component.
+
+        Parameters:
+            - original_component: The original component, or its name if it wasn't found
+            - alternate_component: The alternate component, or its name if it wasn't found
 
+        Returns: The result of the check
+        """
+        original_component_valid = not isinstance(original_component, str)
+        alternate_component_valid = not isinstance(alternate_component, str)
+
+        if original_component_valid and alternate_component_valid:
+            result = original_component.alternative_result(alternate_component)
+        else:
+            original_name = original_component._name if original_component_valid else \
+                            original_component
+            alternate_name = alternate_component._name if alternate_component_valid else \
+                             alternate_component
+            result = CheckResult("alternative", original_name, VERDICT_NOT_FOUND, alternate_name,
+                                 message=("Can't compare parts " + original_name + " and " +
+                                          alternate_name + "."))
+        self._renderer.write(result)
+        return result
+
+    @timed("check_discovery")
+    def check_discovery(self, catalogue=()):
+        """ Finds the alternatives for each component of the component list among the component
+            list and the given catalogue of enriched components.
+
+        Parameters:
+            - catalogue: Further components to search for alternatives
+
+        Returns: The list of results, one per part with alternatives
+        """
+        self.require_facets((FACET_PARAMETERS,))
+        index = ComponentIndex(self._component_converter._components)
+        index.add_components(catalogue)
+
+        results = []
+        part_names = set()
+        for component in self._component_converter._components:
+            if isinstance(component, str) or component._name in part_names:
+                continue
+            part_names.add(component._name)
+
+            alternatives = [alternative._name for alternative in
+                            index.find_alternatives(component)]
+            if alternatives:
+                result = CheckResult("discovery", component._name, VERDICT_ALTERNATIVES,
+                                     values={"alternatives": alternatives},
+                                     message=("Alternatives for " + component._name + ": " +
+                                              ", ".join(alternatives) + "."))
+                self._renderer.write(result)
+                results.append(result)
+        self._renderer.flush()
+        return results
+
+    @timed("check_bom_cost")
     def check_bom_cost(self):
         """ Checks the price of components in the component list for 1 of and 100 of
         the BoM products.
+
+        Returns: The list of results, one per number of BoMs
         """
+        self.require_facets((FACET_PRICING,))
         one_of_cost = 0
         hundred_of_cost = 0
 
@@ -60,37 +213,552 @@ class ComponentManager():
                 one_of_cost += component._price[0]
                 hundred_of_cost += component._price[1]
 
-        print("Price of 1 BoM: " + str(round(one_of_cost, 2)) + " $AUD per BoM.")
-        print("Price of 100 BoMs: " + str(round(hundred_of_cost / 100, 2)) + " $AUD per BoM.")
+        return self.print_bom_cost(one_of_cost, hundred_of_cost)
+
+    def print_bom_cost(self, one_of_cost, hundred_of_cost):
+        """ Reports the cost per BoM for 1 of and 100 of the BoM products.
+
+        Parameters:
+            - one_of_cost: The total price of the components for 1 BoM
+            - hundred_of_cost: The total price of the components for 100 BoMs
+
+        Returns: The list of results, one per number of BoMs
+        """
+        results = [price_result("bom_cost", 1, one_of_cost, "1 BoM"),
+                   price_result("bom_cost", 100, hundred_of_cost)]
+        self._renderer.write_all(results)
+        self._renderer.flush()
+        return results
+
+    @timed("check_cost_curve")
+    def check_cost_curve(self, build_quantities):
+        """ Checks the price per BoM of building the given numbers of BoMs, using the quantity of
+            each CSV row and the price break each part reaches.
+
+        Parameters:
+            - build_quantities: The numbers of BoMs to price
 
+        Returns: The list of results, one per number of BoMs
+        """
+        self.require_facets((FACET_PRICING,))
+        converter = self._component_converter
+        costs = cost_curve(converter._components, converter.line_quantities(), build_quantities)
+        results = [price_result("cost_curve", build_quantity, cost) for build_quantity, cost in
+                   zip(build_quantities, costs.tolist())]
+        self._renderer.write_all(results)
+        self._renderer.flush()
+        return results
+
+    @timed("check_lead_time")
     def check_lead_time(self):
         """ Checks the list of components list for a estimated lead time on each product.
+
+        Returns: The list of results, one per component
         """
-        for component in self._component_converter._components:
-            if not isinstance(component, str) and component._lead_time != 0:
-                if component._lead_time == "No lead time information available":
-                    print(component._name + " is not available.")
+        self.require_facets((FACET_LEAD_TIME,))
+        results = [self.check_component_lead_time(component) for component in
+                   self._component_converter._components]
+        self._renderer.flush()
+        return results
+
+    def check_component_lead_time(self, component):
+        """ Checks a component for an estimated lead time.
+
+        Parameters:
+            - component: The component to check, or its name if it wasn't found
+
+        Returns: The result of the check
+        """
+        if isinstance(component, str):
+            result = CheckResult("lead_time", component, VERDICT_NOT_FOUND)
+        else:
+            result = lead_time_result(component._name, component._lead_time)
+        self._renderer.write(result)
+        return result
+
+    def stream_components(self, facets=NO_FACETS):
+        """ Reads the components of the file one at a time. CSV files are searched as they are
+            read, snapshots are read row by row with parts searched for the facets their
+            components are missing.
+
+        Parameters:
+            - facets: The facets of part information the components need
+
+        Returns: A generator of the components in the order of the file
+        """
+        converter = self._component_converter
+        converter.reset_searches(STREAM_SEARCH_LIMIT)
+        if self._filename[-3:] == "csv":
+            converter._facets = facet_set(converter._facets | facets)
+            yield from converter.stream_components(converter.stream_csv_file(self._filename),
+                                                   self._workers)
+        elif is_component_store(self._filename):
+            store = ComponentStore(self._filename)
+            try:
+                yield from converter.stream_completed(
+                    (component for component_data, component in store.iterate()), facets,
+                    self._workers)
+            finally:
+                store.close()
+        else:
+            yield from converter.stream_completed(
+                converter.read_component_list(self._filename)._components, facets, self._workers)
+
+    @timed("stream_checks")
+    def stream_checks(self, alternative, lead_time, bom_cost):
+        """ Runs the requested checks while the components are read, writing each result as soon
+            as the components it needs are ready. Components are searched for the facets the
+            checks need but they are missing. No component list or snapshot is kept.
+
+        Parameters:
+            - alternative: True to check each pair of components as alternatives
+            - lead_time: True to check each component for a lead time
+            - bom_cost: True to print the price of the BoM once every component is read
+        """
+        one_of_cost = 0
+        hundred_of_cost = 0
+        original_component = None
+        facets = (check_facets(alternative, lead_time, bom_cost)
+                  if alternative or lead_time or bom_cost else NO_FACETS)
+
+        for i, component in enumerate(self.stream_components(facets)):
+            if alternative:
+                if i % 2 == 0:
+                    original_component = component
                 else:
-                    print("Leads time of " + component._name + " is " + component._lead_time + ".")
+                    self.check_pair(original_component, component)
+
+            if lead_time:
+                self.check_component_lead_time(component)
+
+            if bom_cost and not isinstance(component, str):
+                one_of_cost += component._price[0]
+                hundred_of_cost += component._price[1]
+            self._renderer.flush()
+
+        if bom_cost:
+            self.print_bom_cost(one_of_cost, hundred_of_cost)
+
+def check_facets(alternative=False, lead_time=False, pricing=False):
+    """ Finds the facets of part information the requested checks need.
+
+    Parameters:
+        - alternative: True if components are checked against their alternatives
+        - lead_time: True if components are checked for a lead time
+        - pricing: True if the price of the BoM is checked
+
+    Returns: The set of facets, every facet if no check is requested so the snapshot is complete
+    """
+    facets = set()
+    if alternative:
+        facets.add(FACET_PARAMETERS)
+    if lead_time:
+        facets.add(FACET_LEAD_TIME)
+    if pricing:
+        facets.add(FACET_PRICING)
+    return frozenset(facets) or FACETS
+
+def price_result(check, build_quantity, cost, label=None):
+    """ Creates the result of pricing a number of BoMs.
+
+    Parameters:
+        - check: The name of the check
+        - build_quantity: The number of BoMs priced
+        - cost: The total price of the BoMs
+        - label: The text naming the BoMs priced, defaults to the number of BoMs
+
+    Returns: The result giving the price per BoM
+    """
+    price = round(cost / build_quantity, 2)
+    if label is None:
+        label = str(build_quantity) + " BoMs"
+    return CheckResult(check, None, VERDICT_PRICE,
+                       values={"boms": build_quantity, "price_per_bom": price},
+                       message="Price of " + label + ": " + str(price) + " $AUD per BoM.")
+
+
+def lead_time_result(part_name, lead_time):
+    """ Creates the result of checking a part's lead time.
+
+    Parameters:
+        - part_name: The part number
+        - lead_time: The lead time of the part, or 0 if it is in stock
+
+    Returns: The result of the check
+    """
+    if lead_time == 0:
+        return CheckResult("lead_time", part_name, VERDICT_VALID, values={"lead_time": 0})
+    if lead_time == "No lead time information available":
+        return CheckResult("lead_time", part_name, VERDICT_UNAVAILABLE,
+                           values={"lead_time": lead_time},
+                           message=part_name + " is not available.")
+    return CheckResult("lead_time", part_name, VERDICT_LEAD_TIME, values={"lead_time": lead_time},
+                       message="Leads time of " + part_name + " is " + lead_time + ".")
+
+
+def report_cache(cache, renderer):
+    """ Reports the number of part searches answered by a lookup cache.
+
+    Parameters:
+        - cache: The lookup cache, if any
+        - renderer: The renderer the report is written to
+    """
+    if cache is not None:
+        renderer.write(CheckResult("cache", None, VERDICT_SUMMARY,
+                                   values={"hits": cache._hits, "misses": cache._misses},
+                                   message=("Cache hits: " + str(cache._hits) + ", misses: " +
+                                            str(cache._misses) + ".")))
+        renderer.flush()
+
+
+def report_budget(backend, renderer):
+    """ Reports how much of the daily request budget a backend's part searches used.
+
+    Parameters:
+        - backend: The lookup backend
+        - renderer: The renderer the report is written to
+    """
+    if isinstance(backend, ScheduledBackend):
+        renderer.write(CheckResult("budget", None, VERDICT_SUMMARY,
+                                   values={"used": backend._requests,
+                                           "daily_budget": backend._daily_budget,
+                                           "remaining": backend.requests_remaining()},
+                                   message=backend.budget_report()))
+        renderer.flush()
+
+
+def read_catalogue(paths, converter):
+    """ Reads the components of the snapshots given by a list of file names, directories and glob
+        patterns, for finding alternatives among. CSV files are read from the snapshot saved
+        beside them.
+
+    Parameters:
+        - paths: The file names, directories and glob patterns of the snapshots
+        - converter: The component converter reading the snapshots
+
+    Returns: The list of components read
+    """
+    catalogue = []
+    for catalogue_filename in find_bom_files(paths):
+        if catalogue_filename[-3:] == "csv":
+            catalogue_filename = catalogue_filename[:-4]
+        if os.path.exists(catalogue_filename):
+            catalogue.extend(converter.read_component_list(catalogue_filename)._components)
+    return catalogue
+
+
+def find_bom_files(paths):
+    """ Finds the BoM files given by a list of file names, directories and glob patterns.
+        Directories give their CSV files and any snapshots without a CSV file.
+
+    Parameters:
+        - paths: The file names, directories and glob patterns to search
+
+    Returns: A sorted list of the BoM file names, without repeats
+    """
+    filenames = set()
+    for path in paths:
+        for match in glob.glob(path) or [path]:
+            if not os.path.isdir(match):
+                filenames.add(match)
+                continue
+
+            for name in os.listdir(match):
+                filename = os.path.join(match, name)
+                if name.endswith(".csv"):
+                    filenames.add(filename)
+                elif (os.path.isfile(filename) and "." not in name and
+                      not os.path.exists(filename + ".csv")):
+                    filenames.add(filename)
+    return sorted(filenames)
+
+
+class BatchManager():
+    """ Class that handles the top level functionality for a batch of BoMs. The part numbers of
+        every CSV BoM are searched once in a shared lookup session before the BoMs are read.
+
+    Parameters:
+        filenames: The names of the BoM files, either CSV files or snapshots
+        workers: The number of part searches and BoMs processed at once
+        cache: The part lookup cache used when searching parts, if any
+        backend: The lookup backend used when searching parts, defaults to Digikey
+        renderer: The renderer the results of every BoM are written to, defaults to text
+        facets: The facets of part information searched for each part before the checks run
+    """
+    def __init__(self, filenames, workers=DEFAULT_WORKERS, cache=None, backend=None,
+                 renderer=None, facets=FACETS):
+        self._filenames = filenames
+        self._renderer = renderer if renderer is not None else TextRenderer()
+        self._session = ComponentConverter(cache, backend, facets)
+
+        part_names = []
+        for filename in filenames:
+            if filename[-3:] == "csv":
+                with open(filename, "r") as file:
+                    part_names.extend(component_data[CSV_PART_NUMBER_INDEX]
+                                      for component_data in csv.reader(file))
+        self._session.search_parts(list(dict.fromkeys(part_names)), workers)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            self._managers = list(executor.map(
+                lambda filename: ComponentManager(filename, backend=SessionBackend(self._session),
+                                                  renderer=self._renderer, facets=facets),
+                filenames))
+
+    def check_cache(self):
+        """ Reports the number of part searches answered by the lookup cache. """
+        report_cache(self._session._cache, self._renderer)
+
+    def check_budget(self):
+        """ Reports how much of the daily request budget the part searches used. """
+        report_budget(self._session._backend, self._renderer)
+
+    @timed("check_boms")
+    def check_boms(self, alternative, lead_time, bom_cost, processes=None, discovery=False,
+                   catalogue=(), build_quantities=None):
+        """ Runs the requested checks on each BoM, then reports the aggregate of the batch.
+
+        Parameters:
+            - alternative: True to check each pair of components as alternatives
+            - lead_time: True to check each component for a lead time
+            - bom_cost: True to print the price of each BoM and of the whole batch
+            - processes: The number of processes to check alternatives across, if any
+            - discovery: True to find alternatives for the components of each BoM
+            - catalogue: Further components to find alternatives among
+            - build_quantities: The numbers of BoMs to price each BoM for, if any
+        """
+        for filename, manager in zip(self._filenames, self._managers):
+            self._renderer.write(CheckResult("bom", None, VERDICT_SUMMARY,
+                                             values={"filename": filename},
+                                             message="BoM " + filename + ":"))
+            if alternative:
+                manager.check_alternative(processes)
+            if discovery:
+                manager.check_discovery(catalogue)
+            if lead_time:
+                manager.check_lead_time()
+            if bom_cost:
+                manager.check_bom_cost()
+            if build_quantities is not None:
+                manager.check_cost_curve(build_quantities)
+        self.check_aggregate(lead_time, bom_cost)
+
+    def check_aggregate(self, lead_time, bom_cost):
+        """ Reports the aggregate of the batch, with parts used by several BoMs counted once for
+            lead times and once per use for prices.
+
+        Parameters:
+            - lead_time: True to report the parts with a lead time across the batch
+            - bom_cost: True to report the price of one of each BoM in the batch
+
+        Returns: The list of results of the batch
+        """
+        part_names = set()
+        missing_names = set()
+        lead_times = {}
+        one_of_cost = 0
+        hundred_of_cost = 0
+        for manager in self._managers:
+            for component in manager._component_converter._components:
+                if isinstance(component, str):
+                    part_names.add(component)
+                    missing_names.add(component)
+                    continue
+
+                part_names.add(component._name)
+                one_of_cost += component._price[0]
+                hundred_of_cost += component._price[1]
+                if component._lead_time != 0:
+                    lead_times[component._name] = component._lead_time
+
+        results = [CheckResult("batch", None, VERDICT_SUMMARY,
+                               values={"boms": len(self._managers), "parts": len(part_names),
+                                       "not_found": len(missing_names)},
+                               message=("Batch of " + str(len(self._managers)) + " BoMs: " +
+                                        str(len(part_names)) + " unique parts, " +
+                                        str(len(missing_names)) + " not found."))]
+        if lead_time:
+            results.extend(lead_time_result(part_name, part_lead_time) for part_name, part_lead_time
+                           in sorted(lead_times.items()))
+        if bom_cost:
+            results.append(CheckResult("batch_cost", None, VERDICT_PRICE,
+                                       values={"sets": 1, "price_per_set": round(one_of_cost, 2)},
+                                       message=("Price of 1 of each BoM: " +
+                                                str(round(one_of_cost, 2)) + " $AUD.")))
+            results.append(CheckResult("batch_cost", None, VERDICT_PRICE,
+                                       values={"sets": 100,
+                                               "price_per_set": round(hundred_of_cost / 100, 2)},
+                                       message=("Price of 100 of each BoM: " +
+                                                str(round(hundred_of_cost / 100, 2)) +
+                                                " $AUD per set.")))
+        self._renderer.write_all(results)
+        self._renderer.flush()
+        return results
 
 def main():
+    from component_manager.src.component_client import DEFAULT_SERVER_URL
+
     digikey_logger = logging.getLogger('digikey')
     digikey_logger.setLevel(logging.NOTSET)
     parser = argparse.ArgumentParser(description=("An application to manage and handle various "
                                                    "electronic component related tasks."))
-    parser.add_argument('filename', help="The name of the file storing component data")
+    parser.add_argument('filename', nargs='+',
+                        help=("The name of the file storing component data, or for a batch, "
+                              "several files, directories or glob patterns"))
     parser.add_argument('-a', action='store_true', help="Check if given components are valid alternatives")
+    parser.add_argument('-j', type=int, metavar="PROCESSES",
+                        help=("Check alternatives across the given number of processes, or one "
+                              "per CPU if 0"))
     parser.add_argument('-l', action='store_true', help="Check lead times of given components")
+    parser.add_argument('-d', action='store_true',
+                        help="Find alternatives for given components among the components read")
+    parser.add_argument('--catalogue', nargs='+', default=[], metavar="SNAPSHOT",
+                        help="Snapshots, directories or glob patterns of further components to "
+                             "find alternatives among")
     parser.add_argument('-p', action='store_true', help="Calculate price of given components")
+    parser.add_argument('-q', type=int, nargs='*', metavar="QUANTITY",
+                        help=("Calculate price per BoM for each number of BoMs, using the "
+                              "quantity column of the CSV file and every price break"))
+    parser.add_argument('-w', type=int,
+                        help=("Number of concurrent part searches used when reading a CSV file, "
+                              "defaults to " + str(DEFAULT_WORKERS)))
+    parser.add_argument('-n', action='store_true', help="Don't use the part lookup cache")
+    parser.add_argument('--price-ttl', type=float, default=DEFAULT_PRICE_TTL / 3600,
+                        help="Hours cached price, stock and lead time data stays valid")
+    parser.add_argument('--parameter-ttl', type=float, default=DEFAULT_PARAMETER_TTL / 3600,
+                        help="Hours cached parametric data stays valid")
+    parser.add_argument('-f', metavar="FIXTURES",
+                        help="Answer part searches from a JSON file of recorded search results")
+    parser.add_argument('-c', metavar="CATALOGUE",
+                        help=("Answer part searches from a catalogue built by "
+                              "component_catalogue.py, searching Digikey only for missing parts"))
+    parser.add_argument('-s', action='store_true',
+                        help="Print results as each component is read, without saving a snapshot")
+    parser.add_argument('-i', action='store_true',
+                        help="Only search the CSV rows that changed since the saved snapshot")
+    parser.add_argument('--rate', type=float, default=DEFAULT_REQUESTS_PER_MINUTE,
+                        help="Digikey requests allowed per minute")
+    parser.add_argument('--budget', type=int, default=DEFAULT_DAILY_BUDGET,
+                        help="Digikey requests allowed per day")
+    parser.add_argument('--stats', nargs='?', const="-", metavar="FILE",
+                        help=("Write timings, API calls, cache use and bytes written as JSON to "
+                              "the given file, or print them if no file is given"))
+    parser.add_argument('--server', default=DEFAULT_SERVER_URL, metavar="URL",
+                        help="Address of the component server answering queries when running")
+    parser.add_argument('--local', action='store_true',
+                        help="Run the checks locally even when the component server is running")
+    parser.add_argument('--format', choices=sorted(RENDERERS), default="text",
+                        help=("Write the results as text, one JSON object per line, or CSV rows"))
     args = parser.parse_args()
+    if args.s and (args.q is not None or args.d or args.j is not None or args.i):
+        parser.error("-s streams the -a, -l and -p checks only, it can't be combined with -q, "
+                     "-d, -j or -i")
+
+    RUN_STATS.reset()
+    run(args)
+    if args.stats is not None:
+        write_stats(args.stats)
+
+def write_stats(filename):
+    """ Writes the measurements of the current run as JSON.
+
+    Parameters:
+        - filename: The file to write, or "-" to print the measurements
+    """
+    report = json.dumps(RUN_STATS.report(), indent=2)
+    if filename == "-":
+        print(report)
+    else:
+        with open(filename, "w") as stats_file:
+            stats_file.write(report)
+
+def local_options(args):
+    """ Finds the given command line options that only apply to checks run locally, as the
+        component server searches parts with its own cache, backend and workers. Checks given any
+        of them are run locally even when a component server is running.
+
+    Parameters:
+        - args: The parsed command line arguments
+
+    Returns: A list of the local only options given
+    """
+    given = {"-n": args.n, "-f": args.f is not None, "-c": args.c is not None,
+             "-w": args.w is not None, "-j": args.j is not None, "--stats": args.stats is not None}
+    return [option for option, value in given.items() if value]
+
+def run(args):
+    """ Runs the application with the given command line arguments.
+
+    Parameters:
+        - args: The parsed command line arguments
+    """
+    from component_manager.src.component_client import server_running, query_server
+
+    facets = check_facets(args.a or args.d, args.l, args.p or args.q is not None)
+
+    # A running server answers the text checks of a single CSV file from its warm session, unless
+    # the checks are given options only a local run applies
+    if (not args.local and args.format == "text" and len(args.filename) == 1 and
+            args.filename[0][-3:] == "csv" and os.path.isfile(args.filename[0]) and
+            not (args.d or args.s or args.i) and not local_options(args) and
+            server_running(args.server)):
+        with open(args.filename[0], "r", newline="") as csv_file:
+            output, records = query_server(csv_file.read(), args.a, args.l, args.p, args.q,
+                                           args.server, records=True)
+        print(output, end="")
+        # The snapshot of a local run is saved from the records the server searched
+        ComponentManager(args.filename[0], backend=RecordBackend(records), facets=facets)
+        return
+
+    workers = args.w if args.w is not None else DEFAULT_WORKERS
+    cache = None
+    if not args.n:
+        cache = ComponentCache(price_ttl=args.price_ttl * 3600,
+                               parameter_ttl=args.parameter_ttl * 3600)
+
+    if args.f is not None:
+        backend = FakeBackend(args.f)
+    else:
+        backend = ScheduledBackend(DigikeyBackend(), args.rate, args.budget, workers)
+    if args.c is not None:
+        backend = CatalogueBackend(ComponentCatalogue(args.c), backend)
+    renderer = RENDERERS[args.format]()
+
+    if len(args.filename) > 1 or not os.path.isfile(args.filename[0]):
+        batch = BatchManager(find_bom_files(args.filename), workers, cache, backend, renderer,
+                             facets)
+        catalogue = read_catalogue(args.catalogue, batch._session) if args.d else ()
+        batch.check_boms(args.a, args.l, args.p, args.j, args.d, catalogue,
+                         args.q or DEFAULT_BUILD_QUANTITIES if args.q is not None else None)
+        # Checks search the facets they need, so the cache and budget are reported once they
+        # have run
+        batch.check_cache()
+        batch.check_budget()
+        return
+
+    filename = args.filename[0]
+    if args.s:
+        manager = ComponentManager(filename, workers, cache, backend, stream=True,
+                                   renderer=renderer, facets=facets)
+        manager.stream_checks(args.a, args.l, args.p)
+        manager.check_cache()
+        manager.check_budget()
+        return
 
-    manager = ComponentManager(args.filename)
+    manager = ComponentManager(filename, workers, cache, backend, incremental=args.i,
+                               renderer=renderer, facets=facets)
     if args.a:
-        manager.check_alternative()
+        manager.check_alternative(args.j)
+    if args.d:
+        manager.check_discovery(read_catalogue(args.catalogue, manager._component_converter))
     if args.l:
         manager.check_lead_time()
     if args.p:
         manager.check_bom_cost()
+    if args.q is not None:
+        manager.check_cost_curve(args.q or DEFAULT_BUILD_QUANTITIES)
+    manager.check_cache()
+    manager.check_budget()
     
 if __name__ == "__main__":
     main()
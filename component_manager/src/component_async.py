@@ -0,0 +1,528 @@
+"""
+Module containing the asyncio part search path, for running the converter inside an event loop
+"""
+import os
+import sys
+import ssl
+import abc
+import json
+import asyncio
+import urllib.parse
+
+from component_manager.src.component_stats import *
+from component_manager.src.component_backend import *
+from component_manager.src.component_converter import *
+
+# Number of part searches in flight at once on the asyncio path
+DEFAULT_CONCURRENCY = 16
+
+# Number of seconds a part search may take before it is cancelled
+DEFAULT_TIMEOUT = 30
+
+# Base URLs of the Digikey search API and its sandbox, and the path of the keyword search
+DIGIKEY_SEARCH_HOST = "https://api.digikey.com/Search/v3"
+DIGIKEY_SANDBOX_SEARCH_HOST = "https://sandbox-api.digikey.com/Search/v3"
+DIGIKEY_KEYWORD_PATH = "/Products/Keyword"
+
+# Values of DIGIKEY_CLIENT_SANDBOX that select the sandbox
+SANDBOX_TRUE_VALUES = ("y", "yes", "t", "true", "on", "1")
+
+# Largest response header block read before a response is treated as malformed
+MAX_HEADER_LINES = 100
+
+class AsyncLookupBackend(LookupBackend):
+    """ Generic part lookup backend that can also be searched from an event loop. Searches made
+        with part_search_async are coroutines giving the same records as part_search.
+    """
+    def part_search(self, part_name, facets=FACETS):
+        """ Searches for the given part outside of an event loop, running the coroutine search in
+            a loop of its own.
+
+        Parameters:
+            - part_name: The part number to search for
+            - facets: The facets of part information to search for, a backend may give more
+
+        Returns: The search result record of the part
+        """
+        return asyncio.run(self.part_search_async(part_name, facets))
+
+    @abc.abstractmethod
+    async def part_search_async(self, part_name, facets=FACETS):
+        """ Searches for the given part from the running event loop and extracts the search
+            result into a record.
+
+        Parameters:
+            - part_name: The part number to search for
+            - facets: The facets of part information to search for, a backend may give more
+
+        Returns: The search result record of the part
+        """
+
+    async def close(self):
+        """ Releases the connections held by the backend. """
+
+
+class AsyncHttpTransport():
+    """ Non-blocking HTTP/1.1 client over asyncio streams. Connections are kept open between
+        requests and reused, with one request on a connection at a time. Cancelling a request
+        closes its connection, so nothing is left running for it.
+
+    Parameters:
+        - url: The base URL requests are made to
+
+    Attributes:
+        - idle: The (reader, writer) pairs of the open connections not in use
+        - connections: The number of connections opened
+    """
+    def __init__(self, url):
+        parts = urllib.parse.urlsplit(url)
+        self._host = parts.hostname
+        self._ssl = ssl.create_default_context() if parts.scheme == "https" else None
+        self._port = parts.port or (443 if self._ssl is not None else 80)
+        self._base_path = parts.path.rstrip("/")
+        self._idle = []
+        self._connections = 0
+
+    async def connect(self):
+        """ Finds an idle connection, opening a new one if none is idle.
+
+        Returns: The (reader, writer) pair of the connection
+        """
+        while self._idle:
+            reader, writer = self._idle.pop()
+            if not writer.is_closing() and not reader.at_eof():
+                return reader, writer
+            writer.close()
+
+        connection = await asyncio.open_connection(self._host, self._port, ssl=self._ssl)
+        self._connections += 1
+        return connection
+
+    async def request(self, method, path, headers, body=b""):
+        """ Sends a request and reads its response. The connection is closed instead of reused if
+            the request fails or is cancelled part way.
+
+        Parameters:
+            - method: The HTTP method
+            - path: The path of the request below the base URL
+            - headers: The request headers
+            - body: The request body
+
+        Returns: A tuple of the response status, headers keyed by lower case name, and body
+        """
+        reader, writer = await self.connect()
+        try:
+            lines = [method + " " + self._base_path + path + " HTTP/1.1",
+                     "Host: " + self._host, "Content-Length: " + str(len(body))]
+            lines.extend(name + ": " + value for name, value in headers.items())
+            writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+            await writer.drain()
+
+            status_line = await reader.readline()
+            if not status_line:
+                raise BackendError("Connection to " + self._host + " closed without a response.")
+            status = int(status_line.split()[1])
+            response_headers = {}
+            for i in range(MAX_HEADER_LINES):
+                line = (await reader.readline()).decode("latin-1").strip()
+                if not line:
+                    break
+                name, value = line.split(":", 1)
+                response_headers[name.strip().lower()] = value.strip()
+
+            if response_headers.get("transfer-encoding", "").lower() == "chunked":
+                chunks = []
+                while True:
+                    size = int((await reader.readline()).split(b";")[0], 16)
+                    if size == 0:
+                        await reader.readline()
+                        break
+                    chunks.append(await reader.readexactly(size))
+                    await reader.readline()
+                response_body = b"".join(chunks)
+            elif "content-length" in response_headers:
+                response_body = await reader.readexactly(int(response_headers["content-length"]))
+            else:
+                response_body = await reader.read()
+        except BaseException:
+            writer.close()
+            raise
+
+        if response_headers.get("connection", "").lower() == "close" or reader.at_eof():
+            writer.close()
+        else:
+            self._idle.append((reader, writer))
+        return status, response_headers, response_body
+
+    async def close(self):
+        """ Closes the idle connections. """
+        idle, self._idle = self._idle, []
+        for reader, writer in idle:
+            writer.close()
+        for reader, writer in idle:
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, ssl.SSLError):
+                pass
+
+
+def digikey_sandbox():
+    """ Determines if searches are made against the Digikey sandbox, as set by
+        DIGIKEY_CLIENT_SANDBOX the same way as for the digikey-api client.
+
+    Returns: True if the sandbox is searched, False otherwise
+    """
+    return os.getenv('DIGIKEY_CLIENT_SANDBOX', "").lower() in SANDBOX_TRUE_VALUES
+
+
+class AsyncDigikeyBackend(AsyncLookupBackend):
+    """ Lookup backend that searches the Digikey keyword search API from an event loop over
+        non-blocking connections kept open between searches, so no thread is held by a search in
+        flight and a cancelled search stops at once. The access token is read by the digikey-api
+        client, and responses are extracted by the same parser as the Digikey backend's.
+
+    Parameters:
+        - host: The base URL of the search API, defaults to Digikey's or its sandbox's
+
+    Attributes:
+        - transport: The HTTP client the searches are made with
+        - backend: The Digikey backend answering searches made outside of an event loop
+        - token: The access token, read by the first search and again once it has expired
+        - remaining: The number of requests left in the daily quota, as reported by the last
+                     response, or None before the first response
+    """
+    def __init__(self, host=None):
+        if host is None:
+            host = DIGIKEY_SANDBOX_SEARCH_HOST if digikey_sandbox() else DIGIKEY_SEARCH_HOST
+        self._transport = AsyncHttpTransport(host)
+        self._backend = DigikeyBackend(host)
+        self._token = None
+        self._token_lock = None
+        self._remaining = None
+
+    def part_search(self, part_name, facets=FACETS):
+        """ Searches Digikey for the given part in the calling thread.
+
+        Parameters:
+            - part_name: The part number to search for
+            - facets: The facets of part information to search for
+
+        Returns: The search result record of the part
+        """
+        return self._backend.part_search(part_name, facets)
+
+    async def access_token(self):
+        """ Finds the access token, reading it in the default executor when it is first needed or
+            has expired, as the token may have to be refreshed over a blocking connection.
+
+        Returns: The digikey-api access token
+        """
+        if self._token_lock is None:
+            self._token_lock = asyncio.Lock()
+        async with self._token_lock:
+            if self._token is None or self._token.expired():
+                import digikey.oauth.oauth2
+
+                loop = asyncio.get_running_loop()
+                with RUN_STATS.phase("token_refresh"):
+                    self._token = await loop.run_in_executor(
+                        None, lambda: digikey.oauth.oauth2.TokenHandler(
+                            version=3, sandbox=digikey_sandbox()).get_access_token())
+        return self._token
+
+    @api_call
+    async def part_search_async(self, part_name, facets=FACETS):
+        """ Searches Digikey for the given part and extracts the search result into a record. Only
+            the product fields of the given facets are requested and extracted.
+
+        Parameters:
+            - part_name: The part number to search for
+            - facets: The facets of part information to search for
+
+        Returns: The search result record of the part
+        """
+        token = await self.access_token()
+        headers = {"Authorization": token.get_authorization(),
+                   "X-DIGIKEY-Client-Id": os.getenv('DIGIKEY_CLIENT_ID', ""),
+                   "Content-Type": "application/json", "Accept": "application/json"}
+        body = json.dumps({"Keywords": part_name, "RecordCount": 1}).encode("utf-8")
+        status, headers, response = await self._transport.request(
+            "POST", DIGIKEY_KEYWORD_PATH + "?" + urllib.parse.urlencode(
+                {"includes": digikey_includes(facets)}), headers, body)
+        if headers.get("x-ratelimit-remaining", "").isdigit():
+            self._remaining = int(headers["x-ratelimit-remaining"])
+
+        if status == HTTP_TOO_MANY_REQUESTS:
+            raise RateLimitError("Search for " + part_name + " exceeded the request quota.")
+        if status != 200:
+            raise BackendError("Search for " + part_name + " failed with status " + str(status) +
+                               ".")
+        return keyword_search_record(json.loads(response), self.empty_record(), facets)
+
+    def requests_remaining(self):
+        """ Finds the number of requests left in the Digikey daily quota.
+
+        Returns: The number of requests remaining as last reported by Digikey, or None if no
+                 search has been made
+        """
+        if self._remaining is not None:
+            return self._remaining
+        return self._backend.requests_remaining()
+
+    async def close(self):
+        """ Closes the connections to Digikey. """
+        await self._transport.close()
+
+
+class AsyncFakeBackend(AsyncLookupBackend):
+    """ Lookup backend answering part searches from recorded search results, waiting without
+        blocking the event loop for the given latency when searched from one.
+
+    Parameters:
+        - filename: The JSON file of recorded search result records keyed by part number
+        - latency: The number of seconds each part search takes
+
+    Attributes:
+        - fake: The fake backend holding the recorded search results
+    """
+    def __init__(self, filename=None, latency=0):
+        self._fake = FakeBackend(filename, latency)
+        self._latency = latency
+
+    def part_search(self, part_name, facets=FACETS):
+        """ Answers a part search from the recorded search results in the calling thread.
+
+        Parameters:
+            - part_name: The part number to search for
+            - facets: The facets of part information to search for
+
+        Returns: The search result record of the part
+        """
+        return self._fake.part_search(part_name, facets)
+
+    @api_call
+    async def part_search_async(self, part_name, facets=FACETS):
+        """ Answers a part search from the recorded search results, giving only the facets
+            searched for.
+
+        Parameters:
+            - part_name: The part number to search for
+            - facets: The facets of part information to search for
+
+        Returns: The search result record of the part
+        """
+        self._fake._search_count += 1
+        for facet in facets:
+            self._fake._facet_counts[facet] += 1
+        if self._latency > 0:
+            await asyncio.sleep(self._latency)
+        return facet_record(self._fake.recorded_record(part_name), facets)
+
+
+class AsyncComponentConverter(ComponentConverter):
+    """ Component converter that can also convert from an event loop. The coroutine methods end
+        in _async, with part searches bounded by a semaphore, each cancelled after a timeout, and
+        cancelling a conversion cancelling its searches. File reading, lookup cache access and
+        snapshot writing run in the loop's default executor. The converter's other methods search
+        the backend's blocking part_search as usual.
+
+    Parameters:
+        - cache: The part lookup cache to read search results from, if any
+        - backend: The asyncio lookup backend used to search for parts, defaults to Digikey
+        - concurrency: The number of part searches in flight at once
+        - timeout: The number of seconds a part search may take
+        - facets: The facets of part information components are created with
+
+    Attributes:
+        - semaphore: The semaphore bounding the searches in flight, created in the running loop
+    """
+    def __init__(self, cache=None, backend=None, concurrency=DEFAULT_CONCURRENCY,
+                 timeout=DEFAULT_TIMEOUT, facets=FACETS):
+        if backend is None:
+            backend = AsyncDigikeyBackend()
+        super().__init__(cache, backend, facets)
+        self._concurrency = concurrency
+        self._timeout = timeout
+        self._semaphore = None
+
+    def __setstate__(self, state):
+        """ Restores a pickled converter, which searches Digikey without a lookup cache. """
+        super().__setstate__(state)
+        self._backend = AsyncDigikeyBackend()
+        self._semaphore = None
+
+    async def read_csv_file_async(self, filename):
+        """ Reads the given file in the default executor and stores the resulting data in a 2D
+            list.
+
+        Parameters:
+            - filename: The name of the CSV file to convert
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.read_csv_file, filename)
+
+    async def part_search_async(self, part_name, facets=FACETS):
+        """ Searches the lookup backend for the given part, waiting for a free search slot and
+            cancelling the search once it takes longer than the timeout.
+
+        Parameters:
+            - part_name: The part number to search for
+            - facets: The facets of part information to search for
+
+        Returns: The search result record of the part
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._concurrency)
+        async with self._semaphore:
+            try:
+                return await asyncio.wait_for(self._backend.part_search_async(part_name, facets),
+                                              self._timeout)
+            except asyncio.TimeoutError:
+                raise BackendError("Search for " + part_name + " timed out after " +
+                                   str(self._timeout) + " seconds.")
+
+    async def find_record_async(self, part_name, facets):
+        """ Finds the given facets of a part, reading the lookup cache first and searching the
+            lookup backend for the facets the cache doesn't hold. The cache is read and written
+            in the default executor.
+
+        Parameters:
+            - part_name: The part number to search for
+            - facets: The facets of part information to find
+
+        Returns: The search result record of the part
+        """
+        loop = asyncio.get_running_loop()
+        record = None
+        if self._cache is not None:
+            record = await loop.run_in_executor(None, self._cache.read, part_name, facets)
+
+        if record is None or not facets <= record_facets(record):
+            missing = facets - record_facets(record) if record is not None else facets
+            update = await self.part_search_async(part_name, missing)
+            if self._cache is not None and not update.get("offline"):
+                await loop.run_in_executor(None, self._cache.write, part_name, update)
+            record = merge_records(record, update) if record is not None else update
+        return record
+
+    async def record_search_async(self, part_name, facets=None):
+        """ Finds the search result record of the given part, reading the lookup cache first.
+            Each part number is searched once per component list, with concurrent searches for
+            the same part number waiting on the first. A record missing facets asked for later
+            is completed by searching for only those facets.
+
+        Parameters:
+            - part_name: The part number to search for
+            - facets: The facets of part information needed, defaults to the converter's
+
+        Returns: The search result record of the part
+        """
+        facets = self._facets if facets is None else frozenset(facets)
+        search = self._searches.get(part_name)
+        # Searches that failed are removed, so finished searches always have a record
+        while search is not None and not (search.done() and
+                                          not facets <= record_facets(search.result())):
+            record = await asyncio.shield(search)
+            if facets <= record_facets(record):
+                return record
+            search = self._searches.get(part_name)
+
+        previous_search = search
+        previous = previous_search.result() if previous_search is not None else None
+        search = asyncio.get_running_loop().create_future()
+        self._searches[part_name] = search
+        try:
+            if previous is None:
+                record = await self.find_record_async(part_name, facets)
+            else:
+                record = merge_records(previous, await self.find_record_async(
+                    part_name, facets - record_facets(previous)))
+        except BaseException as error:
+            if previous_search is not None:
+                self._searches[part_name] = previous_search
+            else:
+                del self._searches[part_name]
+            if isinstance(error, asyncio.CancelledError):
+                search.cancel()
+            else:
+                search.set_exception(error)
+                # Marks the exception as retrieved when no other search is waiting on it
+                search.exception()
+            raise
+
+        record["parameters"] = {code: sys.intern(value) if isinstance(value, str) else value
+                                for code, value in record["parameters"].items()}
+        search.set_result(record)
+        return record
+
+    async def component_search_async(self, component, facets=None):
+        """ Searches for component information and if the component is found, updates the given
+            component with the search results.
+
+        Parameters:
+            - component: The component to update with the search results
+            - facets: The facets of part information to search for, defaults to the converter's
+
+        Returns: True if the part is found, otherwise False
+        """
+        if component is None:
+            return False
+        return self.apply_record(component,
+                                 await self.record_search_async(component._name, facets))
+
+    async def data_to_component_async(self, component_data):
+        """ Converts data retrieved from a CSV file to a component object.
+
+        Returns: The created component object, or its part name if the part wasn't found
+        """
+        component = self.create_component(component_data)
+        if not await self.component_search_async(component):
+            return component._name
+        return component
+
+    async def search_parts_async(self, part_names, facets=None):
+        """ Searches for each of the given parts once. The results are kept, so later searches
+            for the same parts don't search again.
+
+        Parameters:
+            - part_names: The part numbers to search for
+            - facets: The facets of part information to search for, defaults to the converter's
+        """
+        await gather_cancelling(self.record_search_async(part_name, facets)
+                                for part_name in part_names)
+
+    @timed("create_component_list")
+    async def create_component_list_async(self):
+        """ Creates a list of component models based on the given CSV file, searching the rows
+            concurrently while the resulting list keeps the order of the CSV rows. If a search
+            fails or the conversion is cancelled, the searches still running are cancelled.
+        """
+        self.reset_searches()
+        rows = self.resolve_alternatives(self._data)
+        self._components.extend(await gather_cancelling(
+            self.data_to_component_async(component_data) for component_data in rows))
+
+    async def save_component_list_async(self, filename):
+        """ Saves the current component list and CSV data to a component store snapshot in the
+            default executor.
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.save_component_list, filename)
+
+
+async def gather_cancelling(coroutines):
+    """ Runs the given coroutines concurrently, cancelling the others once one fails.
+
+    Parameters:
+        - coroutines: The coroutines to run
+
+    Returns: The list of their results, in the order given
+    """
+    tasks = [asyncio.ensure_future(coroutine) for coroutine in coroutines]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
@@ -0,0 +1,414 @@
+"""
+Module containing the part lookup backends used to search for component information
+"""
+import abc
+import json
+import time
+import random
+import threading
+
+from component_manager.src.component_stats import *
+from component_manager.src.components import *
+
+# HTTP status returned by the Digikey API when a request quota is exceeded
+HTTP_TOO_MANY_REQUESTS = 429
+
+# Fields of a search result record holding each facet of part information
+FACET_RECORD_FIELDS = {FACET_PARAMETERS: ("parameters",), FACET_PRICING: ("price", "price_breaks"),
+                       FACET_LEAD_TIME: ("lead_time",)}
+
+# Product fields of a Digikey search response needed for each facet. Lead time is only given for
+# parts out of stock and sold singly, so it also needs the price breaks.
+DIGIKEY_FACET_FIELDS = {FACET_PARAMETERS: ("Parameters",), FACET_PRICING: ("StandardPricing",),
+                        FACET_LEAD_TIME: ("StandardPricing", "QuantityAvailable",
+                                          "ManufacturerLeadWeeks")}
+
+def record_facets(record):
+    """ Finds the facets of part information a search result record holds.
+
+    Parameters:
+        - record: The search result record, records without a facet list holding every facet
+
+    Returns: The set of facets
+    """
+    return frozenset(record.get("facets", FACETS))
+
+
+def facet_record(record, facets):
+    """ Restricts a search result record to the given facets, giving the other facets their empty
+        values. Records of parts that weren't found are returned as they are.
+
+    Parameters:
+        - record: The search result record
+        - facets: The facets to keep
+
+    Returns: The restricted record
+    """
+    if not record["found"]:
+        return record
+    restricted = {"found": True, "parameters": {}, "price": [0, 0], "price_breaks": [],
+                  "lead_time": 0}
+    for facet in record_facets(record) & frozenset(facets):
+        for field in FACET_RECORD_FIELDS[facet]:
+            restricted[field] = record[field]
+    restricted["facets"] = sorted(record_facets(record) & frozenset(facets))
+    return restricted
+
+
+def merge_records(record, update):
+    """ Combines a search result record with a later record of the same part, taking the facets
+        the later record holds from it.
+
+    Parameters:
+        - record: The earlier search result record
+        - update: The later search result record
+
+    Returns: The combined record
+    """
+    merged = dict(record)
+    merged["found"] = update["found"]
+    for facet in record_facets(update):
+        for field in FACET_RECORD_FIELDS[facet]:
+            merged[field] = update[field]
+    merged["facets"] = sorted(record_facets(record) | record_facets(update))
+    return merged
+
+
+def digikey_includes(facets):
+    """ Selects the product fields a Digikey keyword search returns.
+
+    Parameters:
+        - facets: The facets of part information searched for
+
+    Returns: The value of the includes query parameter
+    """
+    fields = ["DigiKeyPartNumber"]
+    for facet in sorted(facets):
+        fields.extend(field for field in DIGIKEY_FACET_FIELDS[facet] if field not in fields)
+    return "Products(" + ",".join(fields) + ")"
+
+class BackendError(Exception):
+    """ Error raised when a lookup backend fails to complete a part search """
+
+
+class RateLimitError(BackendError):
+    """ Error raised when a part search is rejected for exceeding the distributor's request quota
+    """
+
+
+def keyword_search_record(response, record, facets=FACETS):
+    """ Extracts the given facets of a Digikey keyword search response into a record. Responses
+        are read in the JSON form of the search API, which the responses of the digikey-api
+        client are converted to, so searches made with and without the client give the same
+        records.
+
+    Parameters:
+        - response: The decoded JSON keyword search response
+        - record: The empty record to fill in
+        - facets: The facets of part information to extract
+
+    Returns: The search result record of the part
+    """
+    products = response.get("Products") or []
+    if products == []:
+        return record
+
+    # The search asks for a single product, so only the first is extracted
+    facets = frozenset(facets)
+    record["found"] = True
+    record["facets"] = sorted(facets)
+    product = products[0]
+    if FACET_PARAMETERS in facets:
+        for parameter in product.get("Parameters") or []:
+            record["parameters"][parameter["ParameterId"]] = parameter["Value"]
+
+    # Handles pricing breakpoints
+    pricing = product.get("StandardPricing") or []
+    if FACET_PRICING in facets:
+        price_breaks = {}
+        for price in pricing:
+            if (price["BreakQuantity"] not in price_breaks or
+                price["UnitPrice"] < price_breaks[price["BreakQuantity"]]):
+                price_breaks[price["BreakQuantity"]] = price["UnitPrice"]
+            if price["BreakQuantity"] == 1:
+                if record["price"][0] == 0 or price["TotalPrice"] < record["price"][0]:
+                    record["price"][0] = price["TotalPrice"]
+            if price["BreakQuantity"] == 100:
+                if record["price"][1] == 0 or price["TotalPrice"] < record["price"][1]:
+                    record["price"][1] = price["TotalPrice"]
+        record["price_breaks"] = [list(price_break) for price_break in
+                                  sorted(price_breaks.items())]
+
+    # Handles lead time
+    if FACET_LEAD_TIME in facets and product.get("QuantityAvailable") == 0 and any(
+            price["BreakQuantity"] == 1 for price in pricing):
+        record["lead_time"] = product.get("ManufacturerLeadWeeks")
+    return record
+
+
+class LookupBackend(metaclass=abc.ABCMeta):
+    """ Generic part lookup backend class. A backend searches a distributor for a part number and
+        extracts the result into a record, a dictionary of the form:
+        {"found": bool, "parameters": {search code: value}, "price": [1 of, 100 of],
+         "price_breaks": [[break quantity, unit price], ...], "lead_time": lead time,
+         "facets": [facet, ...]}
+        The facet list names the facets of part information the record holds, with the fields of
+        other facets left empty. Records without one hold every facet. Records answered without
+        searching the distributor are marked "offline": True and aren't written to the lookup
+        cache.
+    """
+    @abc.abstractmethod
+    def part_search(self, part_name, facets=FACETS):
+        """ Searches for the given part and extracts the search result into a record.
+
+        Parameters:
+            - part_name: The part number to search for
+            - facets: The facets of part information to search for, a backend may give more
+
+        Returns: The search result record of the part
+        """
+
+    def empty_record(self):
+        """ Creates the record of a part that could not be found.
+
+        Returns: A search result record with no part information
+        """
+        return {"found": False, "parameters": {}, "price": [0, 0], "price_breaks": [],
+                "lead_time": 0}
+
+    def requests_remaining(self):
+        """ Finds the number of requests left in the distributor's daily quota.
+
+        Returns: The number of requests remaining as last reported by the distributor, or None if
+                 it isn't known
+        """
+        return None
+
+
+class DigikeyBackend(LookupBackend):
+    """ Lookup backend that searches the Digikey API using the digikey-api client. The client is
+        imported by the first search, so runs that make no live searches never load it. Each
+        thread searching keeps its own client, holding the access token in memory and its
+        connections to Digikey open between searches.
+
+    Parameters:
+        - host: The base URL of the search API, defaults to the one chosen by the client
+
+    Attributes:
+        - remaining: The number of requests left in the daily quota, as reported by the last
+                     response, or None before the first response
+        - local: The search client of each thread
+    """
+    def __init__(self, host=None):
+        self._remaining = None
+        self._host = host
+        self._local = threading.local()
+
+    def client(self):
+        """ Finds the search client of the current thread. The client is created by the thread's
+            first search, and again once its access token has expired so the token is refreshed
+            before a search is rejected.
+
+        Returns: The search client of the current thread
+        """
+        import digikey.v3.api
+        import digikey.v3.productinformation
+
+        client = getattr(self._local, "client", None)
+        if client is None or client._digikeyApiToken.expired():
+            with RUN_STATS.phase("token_refresh"):
+                client = digikey.v3.api.DigikeyApiWrapper('keyword_search_with_http_info',
+                                                          digikey.v3.productinformation)
+            if self._host is not None:
+                client._api_instance.api_client.configuration.host = self._host
+            self._local.client = client
+        return client
+
+    @api_call
+    def part_search(self, part_name, facets=FACETS):
+        """ Searches Digikey for the given part and extracts the search result into a record. Only
+            the product fields of the given facets are requested and extracted.
+
+        Parameters:
+            - part_name: The part number to search for
+            - facets: The facets of part information to search for
+
+        Returns: The search result record of the part
+        """
+        from digikey.v3.productinformation import KeywordSearchRequest
+
+        search_request = KeywordSearchRequest(keywords=part_name, record_count=1)
+        api_limits = {}
+        status = {}
+        client = self.client()
+        result = client.call_api_function(body=search_request, api_limits=api_limits,
+                                          status=status, includes=digikey_includes(facets))
+        if api_limits.get('api_requests_remaining') is not None:
+            self._remaining = api_limits['api_requests_remaining']
+
+        # The client returns None instead of raising when a request fails
+        if result is None:
+            if status.get('code') == HTTP_TOO_MANY_REQUESTS:
+                raise RateLimitError("Search for " + part_name + " exceeded the request quota.")
+            raise BackendError("Search for " + part_name + " failed with status " +
+                               str(status.get('code')) + ".")
+        response = client._api_instance.api_client.sanitize_for_serialization(result)
+        return keyword_search_record(response, self.empty_record(), facets)
+
+    def requests_remaining(self):
+        """ Finds the number of requests left in the Digikey daily quota.
+
+        Returns: The number of requests remaining as last reported by Digikey, or None if no
+                 search has been made
+        """
+        return self._remaining
+
+
+class SessionBackend(LookupBackend):
+    """ Lookup backend that answers part searches from a lookup session shared between converters,
+        so a part searched for one BoM isn't searched again for another.
+
+    Parameters:
+        - session: The component converter whose search results are shared
+    """
+    def __init__(self, session):
+        self._session = session
+
+    def part_search(self, part_name, facets=FACETS):
+        """ Finds the search result record of the given part through the shared session.
+
+        Parameters:
+            - part_name: The part number to search for
+            - facets: The facets of part information to search for
+
+        Returns: The search result record of the part
+        """
+        return self._session.record_search(part_name, facets)
+
+    def requests_remaining(self):
+        """ Finds the number of requests left in the distributor's daily quota.
+
+        Returns: The number of requests remaining as known to the session's backend
+        """
+        return self._session._backend.requests_remaining()
+
+
+class RecordBackend(LookupBackend):
+    """ Lookup backend that answers part searches from search result records found elsewhere,
+        such as the records a component server answers a query with. Its answers are marked
+        offline, as the records were cached where they were searched.
+
+    Parameters:
+        - records: The search result records keyed by part number, parameter search codes may be
+                   given as strings as they are in JSON
+    """
+    def __init__(self, records):
+        self._records = {}
+        for part_name, record in records.items():
+            record = dict(record)
+            record["parameters"] = {int(code): value for code, value in
+                                    record["parameters"].items()}
+            self._records[part_name] = record
+
+    def part_search(self, part_name, facets=FACETS):
+        """ Answers a part search from the given records.
+
+        Parameters:
+            - part_name: The part number to search for
+            - facets: The facets of part information to search for
+
+        Returns: The search result record of the part, or an empty record if no record was given
+                 for it
+        """
+        record = self._records.get(part_name)
+        record = dict(record) if record is not None else self.empty_record()
+        record["offline"] = True
+        return record
+
+
+class FakeBackend(LookupBackend):
+    """ In-process lookup backend that answers part searches from recorded search results, used
+        to test and benchmark the application without the Digikey API.
+
+    Parameters:
+        - filename: The JSON file of recorded search result records keyed by part number
+        - latency: The number of seconds each part search takes
+        - error_rate: The probability of a part search raising a BackendError
+        - throttle_rate: The probability of a part search raising a RateLimitError
+        - seed: The seed of the random generator deciding which searches fail
+
+    Attributes:
+        - records: The recorded search result records keyed by part number
+        - search_count: The number of part searches made
+        - facet_counts: The number of part searches made for each facet
+    """
+    def __init__(self, filename=None, latency=0, error_rate=0, seed=None, throttle_rate=0):
+        self._records = {}
+        if filename is not None:
+            with open(filename, "r") as fixture_file:
+                self.add_records(json.load(fixture_file))
+        self._latency = latency
+        self._error_rate = error_rate
+        self._throttle_rate = throttle_rate
+        self._random = random.Random(seed)
+        self._search_count = 0
+        self._facet_counts = {facet: 0 for facet in FACETS}
+        self._lock = threading.Lock()
+
+    def add_records(self, records):
+        """ Adds recorded search results to the backend.
+
+        Parameters:
+            - records: The search result records keyed by part number, parameter search codes
+                       may be given as strings as they are in JSON
+        """
+        for part_name, record in records.items():
+            parameters = {int(code): value for code, value in record["parameters"].items()}
+            self._records[part_name] = {"found": record["found"], "parameters": parameters,
+                                        "price": list(record["price"]),
+                                        "price_breaks": [list(price_break) for price_break in
+                                                         record.get("price_breaks", [])],
+                                        "lead_time": record["lead_time"]}
+
+    @api_call
+    def part_search(self, part_name, facets=FACETS):
+        """ Answers a part search from the recorded search results, giving only the facets
+            searched for.
+
+        Parameters:
+            - part_name: The part number to search for
+            - facets: The facets of part information to search for
+
+        Returns: The search result record of the part
+        """
+        with self._lock:
+            self._search_count += 1
+            for facet in facets:
+                self._facet_counts[facet] += 1
+            failed = self._random.random() < self._error_rate
+            throttled = self._throttle_rate > 0 and self._random.random() < self._throttle_rate
+
+        if self._latency > 0:
+            time.sleep(self._latency)
+        if throttled:
+            raise RateLimitError("Search for " + part_name + " exceeded the request quota.")
+        if failed:
+            raise BackendError("Search for " + part_name + " failed.")
+        return facet_record(self.recorded_record(part_name), facets)
+
+    def recorded_record(self, part_name):
+        """ Copies the recorded search result of the given part.
+
+        Parameters:
+            - part_name: The part number to find
+
+        Returns: A copy of the recorded search result record, or an empty record if the part
+                 wasn't recorded
+        """
+        if part_name not in self._records:
+            return self.empty_record()
+        record = self._records[part_name]
+        return {"found": record["found"], "parameters": dict(record["parameters"]),
+                "price": list(record["price"]),
+                "price_breaks": [list(price_break) for price_break in record["price_breaks"]],
+                "lead_time": record["lead_time"]}
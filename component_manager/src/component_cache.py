@@ -0,0 +1,134 @@
+"""
+Module containing the persistent part lookup cache
+"""
+import os
+import json
+import time
+import sqlite3
+import threading
+
+from component_manager.src.component_stats import *
+from component_manager.src.components import *
+
+# Default name of the cache file stored under the Digikey storage path
+CACHE_FILENAME = "component_cache.db"
+
+# Default time to live of cached data in seconds
+DEFAULT_PRICE_TTL = 24 * 60 * 60
+DEFAULT_PARAMETER_TTL = 30 * 24 * 60 * 60
+
+class ComponentCache():
+    """ Persistent cache of part search results stored in an SQLite database and keyed by part
+        number. Each facet of part information is stored and expires separately, with pricing
+        and lead time data expiring sooner than parametric data.
+
+    Parameters:
+        - filename: The path of the database file, defaults to a file under DIGIKEY_STORAGE_PATH
+        - price_ttl: The number of seconds price, stock and lead time data stays valid
+        - parameter_ttl: The number of seconds parametric data stays valid
+
+    Attributes:
+        - hits: The number of reads answered by the cache
+        - misses: The number of reads the cache could not answer
+    """
+    def __init__(self, filename=None, price_ttl=DEFAULT_PRICE_TTL,
+                 parameter_ttl=DEFAULT_PARAMETER_TTL):
+        if filename is None:
+            filename = os.path.join(os.getenv('DIGIKEY_STORAGE_PATH', "."), CACHE_FILENAME)
+        self._filename = filename
+        self._price_ttl = price_ttl
+        self._parameter_ttl = parameter_ttl
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(filename, check_same_thread=False)
+        self._connection.execute("CREATE TABLE IF NOT EXISTS parts ("
+                                 "part_name TEXT PRIMARY KEY, found INTEGER, parameters TEXT, "
+                                 "parameter_time REAL, price TEXT, lead_time TEXT, price_time REAL, "
+                                 "price_breaks TEXT, lead_time_time REAL)")
+        self._connection.commit()
+
+    def read(self, part_name, facets=FACETS):
+        """ Reads the cached search result of the given part. Facets older than their time to
+            live are treated as missing.
+
+        Parameters:
+            - part_name: The part number to read
+            - facets: The facets of part information needed, counting a hit if all are valid
+
+        Returns: The search result record holding the facets still valid, or None if none are
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT found, parameters, parameter_time, price, lead_time, price_time, "
+                "price_breaks, lead_time_time FROM parts WHERE part_name = ?", (part_name,)).fetchone()
+
+            now = time.time()
+            valid = set()
+            if row is not None:
+                if row[1] is not None and now - row[2] <= self._parameter_ttl:
+                    valid.add(FACET_PARAMETERS)
+                if row[3] is not None and now - row[5] <= self._price_ttl:
+                    valid.add(FACET_PRICING)
+                if row[4] is not None and now - row[7] <= self._price_ttl:
+                    valid.add(FACET_LEAD_TIME)
+
+            if not frozenset(facets) <= valid:
+                self._misses += 1
+                RUN_STATS.count("cache_misses")
+            else:
+                self._hits += 1
+                RUN_STATS.count("cache_hits")
+            if not valid:
+                return None
+
+            record = {"found": bool(row[0]), "parameters": {}, "price": [0, 0],
+                      "price_breaks": [], "lead_time": 0}
+            if valid != FACETS:
+                record["facets"] = sorted(valid)
+            if FACET_PARAMETERS in valid:
+                record["parameters"] = {int(code): value for code, value in
+                                        json.loads(row[1]).items()}
+            if FACET_PRICING in valid:
+                record["price"] = json.loads(row[3])
+                record["price_breaks"] = json.loads(row[6])
+            if FACET_LEAD_TIME in valid:
+                record["lead_time"] = json.loads(row[4])
+            return record
+
+    def write(self, part_name, record):
+        """ Writes the search result of the given part to the cache. Only the facets the record
+            holds are written, keeping the cached data of the others.
+
+        Parameters:
+            - part_name: The part number to write
+            - record: The search result record to store
+        """
+        facets = frozenset(record.get("facets", FACETS))
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT parameters, parameter_time, price, lead_time, price_time, price_breaks, "
+                "lead_time_time FROM parts WHERE part_name = ?", (part_name,)).fetchone()
+            if row is None:
+                row = (None,) * 7
+            parameters, parameter_time, price, lead_time, price_time, price_breaks, \
+                lead_time_time = row
+
+            if FACET_PARAMETERS in facets:
+                parameters, parameter_time = json.dumps(record["parameters"]), now
+            if FACET_PRICING in facets:
+                price, price_breaks, price_time = (json.dumps(record["price"]),
+                                                   json.dumps(record["price_breaks"]), now)
+            if FACET_LEAD_TIME in facets:
+                lead_time, lead_time_time = json.dumps(record["lead_time"]), now
+            self._connection.execute(
+                "INSERT OR REPLACE INTO parts VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (part_name, int(record["found"]), parameters, parameter_time, price, lead_time,
+                 price_time, price_breaks, lead_time_time))
+            self._connection.commit()
+
+    def close(self):
+        """ Closes the underlying database connection. """
+        with self._lock:
+            self._connection.close()
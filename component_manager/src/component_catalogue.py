@@ -0,0 +1,316 @@
+"""
+Module containing the memory mapped parametric catalogue answering part searches offline
+"""
+import csv
+import json
+import mmap
+import zlib
+import array
+import struct
+import argparse
+
+from component_manager.src.component_backend import *
+
+CATALOGUE_MAGIC = b"CMCATLG\0"
+CATALOGUE_VERSION = 1
+
+# Magic, version, part count, string count, slot count, then the positions of the string
+# offsets, slots, rows, cells, string data and categories, and the length of the categories
+CATALOGUE_HEADER = struct.Struct("<8sIIII7Q")
+
+# Number of 32 bit fields of each row: part name, category, first cell, price breaks, lead time
+ROW_FIELDS = 5
+
+# Export columns holding pricing and lead time rather than a parameter value
+PRICE_BREAKS_COLUMN = "price_breaks"
+LEAD_TIME_COLUMN = "lead_time"
+
+class StringTable():
+    """ Table of the distinct strings of a catalogue being built, with id 0 meaning no value.
+
+    Attributes:
+        - ids: The id of each string keyed by string
+        - strings: The strings in order of id
+    """
+    def __init__(self):
+        self._ids = {"": 0}
+        self._strings = [""]
+
+    def add(self, string):
+        """ Finds the id of a string, adding it to the table if needed.
+
+        Parameters:
+            - string: The string to add
+
+        Returns: The id of the string
+        """
+        string_id = self._ids.get(string)
+        if string_id is None:
+            string_id = len(self._strings)
+            self._ids[string] = string_id
+            self._strings.append(string)
+        return string_id
+
+
+def catalogue_hash(part_name):
+    """ Hashes a part number for the catalogue index, the same in every process.
+
+    Parameters:
+        - part_name: The part number
+
+    Returns: The 32 bit hash of the part number
+    """
+    return zlib.crc32(part_name.encode("utf-8"))
+
+
+def import_catalogue(export_filename, catalogue_filename):
+    """ Builds a catalogue from a CSV catalogue export. The export's header names the part number
+        and category columns first, followed by parameter columns headed by their Digikey search
+        code. Optional "price_breaks" (a JSON list of [break quantity, unit price] pairs) and
+        "lead_time" columns give pricing and lead time, and other columns are ignored.
+
+    Parameters:
+        - export_filename: The CSV catalogue export
+        - catalogue_filename: The catalogue file to write
+
+    Returns: The number of parts in the catalogue
+    """
+    strings = StringTable()
+    categories = {}
+    rows = []
+    part_names = set()
+
+    with open(export_filename, "r", newline="") as export_file:
+        reader = csv.reader(export_file)
+        header = next(reader)
+        parameter_columns = [(i, int(name)) for i, name in enumerate(header)
+                             if i > 1 and name.strip().isdigit()]
+        price_breaks_column = header.index(PRICE_BREAKS_COLUMN) if PRICE_BREAKS_COLUMN in header \
+                              else None
+        lead_time_column = header.index(LEAD_TIME_COLUMN) if LEAD_TIME_COLUMN in header else None
+
+        for data in reader:
+            if len(data) < 2 or data[0] in part_names:
+                continue
+            part_names.add(data[0])
+            category = categories.setdefault(data[1], {"name": data[1], "codes": {}, "parts": []})
+            values = {}
+            for i, code in parameter_columns:
+                if i < len(data) and data[i] != "":
+                    values[code] = strings.add(data[i])
+                    category["codes"].setdefault(code, len(category["codes"]))
+            category["parts"].append((len(rows), values))
+
+            price_breaks = data[price_breaks_column] if price_breaks_column is not None and \
+                           price_breaks_column < len(data) else ""
+            lead_time = data[lead_time_column] if lead_time_column is not None and \
+                        lead_time_column < len(data) else ""
+            rows.append([strings.add(data[0]), 0, 0, strings.add(price_breaks),
+                         strings.add(lead_time)])
+
+    # Each category holds a block of cells, one row of parameter value ids per part
+    cells = array.array("I")
+    category_list = []
+    for category_index, category in enumerate(categories.values()):
+        codes = list(category["codes"])
+        category_list.append({"name": category["name"], "codes": codes})
+        for row_index, values in category["parts"]:
+            rows[row_index][1] = category_index
+            rows[row_index][2] = len(cells)
+            cells.extend(values.get(code, 0) for code in codes)
+
+    # Open addressing hash index of row numbers plus one, with 0 marking an empty slot
+    slot_count = 1
+    while slot_count < 2 * len(rows):
+        slot_count *= 2
+    slots = array.array("I", bytes(4 * slot_count))
+    for row_index, row in enumerate(rows):
+        slot = catalogue_hash(strings._strings[row[0]]) & (slot_count - 1)
+        while slots[slot]:
+            slot = (slot + 1) & (slot_count - 1)
+        slots[slot] = row_index + 1
+
+    encoded = [string.encode("utf-8") for string in strings._strings]
+    offsets = array.array("Q", [0])
+    for data in encoded:
+        offsets.append(offsets[-1] + len(data))
+    row_array = array.array("I", (field for row in rows for field in row))
+    category_data = json.dumps(category_list).encode("utf-8")
+
+    offsets_position = CATALOGUE_HEADER.size
+    slots_position = offsets_position + offsets.itemsize * len(offsets)
+    rows_position = slots_position + slots.itemsize * len(slots)
+    cells_position = rows_position + row_array.itemsize * len(row_array)
+    strings_position = cells_position + cells.itemsize * len(cells)
+    categories_position = strings_position + offsets[-1]
+
+    with open(catalogue_filename, "wb") as catalogue_file:
+        catalogue_file.write(CATALOGUE_HEADER.pack(
+            CATALOGUE_MAGIC, CATALOGUE_VERSION, len(rows), len(encoded), slot_count,
+            offsets_position, slots_position, rows_position, cells_position, strings_position,
+            categories_position, len(category_data)))
+        for block in (offsets, slots, row_array, cells):
+            catalogue_file.write(block.tobytes())
+        for data in encoded:
+            catalogue_file.write(data)
+        catalogue_file.write(category_data)
+    return len(rows)
+
+
+class ComponentCatalogue():
+    """ Read only catalogue of part search records, memory mapped so opening it reads only its
+        header and each search reads only the pages holding the part.
+
+    Parameters:
+        - filename: The catalogue file built by import_catalogue
+
+    Attributes:
+        - map: The memory map of the catalogue file
+        - view: The memory view of the map the arrays are read through
+        - offsets, slots, rows, cells: Views of the catalogue's arrays
+        - categories: The name and parameter search codes of each category
+    """
+    def __init__(self, filename):
+        with open(filename, "rb") as catalogue_file:
+            self._map = mmap.mmap(catalogue_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (magic, version, self._part_count, string_count, self._slot_count, offsets_position,
+         slots_position, rows_position, cells_position, self._strings_position,
+         categories_position, categories_length) = CATALOGUE_HEADER.unpack_from(self._map)
+        if magic != CATALOGUE_MAGIC or version != CATALOGUE_VERSION:
+            self._map.close()
+            raise ValueError(filename + " is not a component catalogue of version " +
+                             str(CATALOGUE_VERSION) + ".")
+
+        self._view = memoryview(self._map)
+        view = self._view
+        self._offsets = view[offsets_position:slots_position].cast("Q")
+        self._slots = view[slots_position:rows_position].cast("I")
+        self._rows = view[rows_position:cells_position].cast("I")
+        self._cells = view[cells_position:self._strings_position].cast("I")
+        self._categories = json.loads(bytes(
+            view[categories_position:categories_position + categories_length]))
+
+    def __len__(self):
+        return self._part_count
+
+    def string(self, string_id):
+        """ Reads a string of the catalogue.
+
+        Parameters:
+            - string_id: The id of the string
+
+        Returns: The string
+        """
+        start = self._strings_position + self._offsets[string_id]
+        end = self._strings_position + self._offsets[string_id + 1]
+        return self._map[start:end].decode("utf-8")
+
+    def find_row(self, part_name):
+        """ Finds the row of a part in the catalogue.
+
+        Parameters:
+            - part_name: The part number to find
+
+        Returns: The row number of the part, or None if it isn't in the catalogue
+        """
+        slot = catalogue_hash(part_name) & (self._slot_count - 1)
+        while self._slots[slot]:
+            row = self._slots[slot] - 1
+            if self.string(self._rows[row * ROW_FIELDS]) == part_name:
+                return row
+            slot = (slot + 1) & (self._slot_count - 1)
+        return None
+
+    def record(self, part_name):
+        """ Finds the search result record of a part in the catalogue.
+
+        Parameters:
+            - part_name: The part number to find
+
+        Returns: The search result record of the part, or None if it isn't in the catalogue
+        """
+        row = self.find_row(part_name)
+        if row is None:
+            return None
+
+        name_id, category_index, first_cell, price_breaks_id, lead_time_id = \
+            self._rows[row * ROW_FIELDS:(row + 1) * ROW_FIELDS]
+        parameters = {}
+        for i, code in enumerate(self._categories[category_index]["codes"]):
+            value_id = self._cells[first_cell + i]
+            if value_id:
+                parameters[code] = self.string(value_id)
+
+        price_breaks = json.loads(self.string(price_breaks_id)) if price_breaks_id else []
+        price = [0, 0]
+        for break_quantity, unit_price in price_breaks:
+            if break_quantity == 1:
+                price[0] = unit_price
+            elif break_quantity == 100:
+                price[1] = unit_price * 100
+        return {"found": True, "parameters": parameters, "price": price,
+                "price_breaks": [list(price_break) for price_break in price_breaks],
+                "lead_time": self.string(lead_time_id) if lead_time_id else 0}
+
+    def close(self):
+        """ Unmaps the catalogue file. """
+        self._offsets.release()
+        self._slots.release()
+        self._rows.release()
+        self._cells.release()
+        self._view.release()
+        self._map.close()
+
+
+class CatalogueBackend(LookupBackend):
+    """ Lookup backend that answers part searches from a catalogue, searching another backend
+        only for parts missing from it.
+
+    Parameters:
+        - catalogue: The catalogue answering searches
+        - backend: The backend searched for missing parts, if any
+    """
+    def __init__(self, catalogue, backend=None):
+        self._catalogue = catalogue
+        self._backend = backend
+
+    def part_search(self, part_name, facets=FACETS):
+        """ Finds the search result record of the given part in the catalogue, then the backend.
+            Catalogue records hold every facet, as reading them costs nothing, and are marked
+            offline so they aren't cached as search results.
+
+        Parameters:
+            - part_name: The part number to search for
+            - facets: The facets of part information to search for
+
+        Returns: The search result record of the part
+        """
+        record = self._catalogue.record(part_name)
+        if record is None and self._backend is not None:
+            return self._backend.part_search(part_name, facets)
+        if record is None:
+            record = self.empty_record()
+        record["offline"] = True
+        return record
+
+    def requests_remaining(self):
+        """ Finds the number of requests left in the distributor's daily quota.
+
+        Returns: The number of requests remaining as known to the backend, or None without one
+        """
+        return self._backend.requests_remaining() if self._backend is not None else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=("Builds a component catalogue from a CSV "
+                                                  "catalogue export."))
+    parser.add_argument('export', help="The CSV catalogue export")
+    parser.add_argument('catalogue', help="The catalogue file to write")
+    args = parser.parse_args()
+
+    part_count = import_catalogue(args.export, args.catalogue)
+    print("Imported " + str(part_count) + " parts into " + args.catalogue + ".")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Module containing the thin client that sends BoM queries to a running component server
+"""
+import json
+import urllib.error
+import urllib.request
+
+# Address the component server listens on by default
+DEFAULT_SERVER_HOST = "127.0.0.1"
+DEFAULT_SERVER_PORT = 8765
+DEFAULT_SERVER_URL = "http://" + DEFAULT_SERVER_HOST + ":" + str(DEFAULT_SERVER_PORT)
+
+# Seconds to wait for the server to answer a health check
+HEALTH_TIMEOUT = 0.2
+
+class ServerError(Exception):
+    """ Error raised when the component server fails to answer a query """
+
+
+def server_running(url=DEFAULT_SERVER_URL, timeout=HEALTH_TIMEOUT):
+    """ Determines if a component server is answering at the given address.
+
+    Parameters:
+        - url: The base URL of the server
+        - timeout: The number of seconds to wait for an answer
+
+    Returns: True if the server answered its health check, False otherwise
+    """
+    try:
+        with urllib.request.urlopen(url + "/health", timeout=timeout) as response:
+            return response.status == 200
+    except (OSError, ValueError):
+        return False
+
+
+def query_server(csv_text, alternative=False, lead_time=False, bom_cost=False, quantities=None,
+                 url=DEFAULT_SERVER_URL, records=False):
+    """ Sends a BoM to the component server and returns the results of the requested checks.
+
+    Parameters:
+        - csv_text: The contents of the BoM CSV file
+        - alternative: True to check each pair of components as alternatives
+        - lead_time: True to check each component for a lead time
+        - bom_cost: True to check the price of 1 of and 100 of the BoM
+        - quantities: The numbers of BoMs to price using every price break, if any
+        - url: The base URL of the server
+        - records: True to also return the search result records of the BoM's parts
+
+    Returns: The printed output of the checks, or if records are asked for, a tuple of the output
+             and the search result records keyed by part number
+    """
+    body = json.dumps({"csv": csv_text, "alternative": alternative, "lead_time": lead_time,
+                       "bom_cost": bom_cost, "quantities": quantities,
+                       "records": records}).encode("utf-8")
+    request = urllib.request.Request(url + "/check", data=body,
+                                     headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(request) as response:
+            answer = json.loads(response.read().decode("utf-8"))
+    except urllib.error.HTTPError as error:
+        raise ServerError("Server failed the query: " +
+                          json.loads(error.read().decode("utf-8"))["error"])
+    except OSError as error:
+        raise ServerError("Server could not be reached: " + str(error))
+
+    if records:
+        return answer["output"], answer["records"]
+    return answer["output"]
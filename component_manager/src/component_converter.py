@@ -3,33 +3,96 @@ Module containing all functionality to convert data into component models
 """
 import os
 import csv
+import sys
+import json
 import pickle
-import digikey
-from digikey.v3.productinformation import KeywordSearchRequest
+import hashlib
+import threading
+import collections
+import concurrent.futures
 
+from component_manager.src.component_stats import *
 from component_manager.src.components import *
+from component_manager.src.component_backend import *
+from component_manager.src.component_store import *
 
 # Indexes for CSV data in list format
 CSV_DESCRIPTION_INDEX = 0
 CSV_PART_NUMBER_INDEX = 1
+CSV_QUANTITY_INDEX = 2
 
 # Indexes for description data access
 DESCRIPTION_TYPE_INDEX = 0
 DESCRIPTION_VALUE_INDEX = 1
 
+# Number of part searches issued at once when creating a component list
+DEFAULT_WORKERS = 1
+
+# Number of rows each worker may have queued ahead of the row being emitted when streaming
+STREAM_WINDOW_PER_WORKER = 2
+
+# Number of part searches a stream keeps the records of, so rows repeating a recently read part
+# number share its record while memory stays bounded however many distinct parts are read
+STREAM_SEARCH_LIMIT = 1024
+
+def row_hash(component_data):
+    """ Hashes the content of a CSV row.
+
+    Parameters:
+        - component_data: The CSV row to hash
+
+    Returns: The hexadecimal digest of the row content
+    """
+    return hashlib.sha1(json.dumps(component_data).encode("utf-8")).hexdigest()
+
+
 class ComponentConverter():
     """ Utility class to handle all creation of component models from CSV data
 
+    Parameters:
+        - cache: The part lookup cache to read search results from, if any
+        - backend: The lookup backend used to search for parts, defaults to Digikey
+        - facets: The facets of part information components are created with, other facets are
+                  only searched once they are asked for
+
     Attributes:
         - components: The list of components converted from the given CSV data
         - data: The data stored in the CSV file, stored as a 2D list
         - current_row: The index of the row currently being manipulated
     """
-    def __init__(self):
+    def __init__(self, cache=None, backend=None, facets=FACETS):
+        if backend is None:
+            backend = DigikeyBackend()
+
         self._current_row = 0
         self._data = None
         self._components = []
+        self._cache = cache
+        self._backend = backend
+        self._facets = frozenset(facets)
+        self._searches = {}
+        self._search_limit = None
+        self._search_lock = threading.Lock()
+
+    def __getstate__(self):
+        """ Excludes the lookup cache, backend and in-run search state from the pickled converter.
+        """
+        state = self.__dict__.copy()
+        for attribute in ("_cache", "_backend", "_searches", "_search_limit", "_search_lock"):
+            state.pop(attribute, None)
+        return state
 
+    def __setstate__(self, state):
+        """ Restores a pickled converter, which searches Digikey without a lookup cache. """
+        self.__dict__.update(state)
+        self._cache = None
+        self._backend = DigikeyBackend()
+        self._facets = state.get("_facets", FACETS)
+        self._searches = {}
+        self._search_limit = None
+        self._search_lock = threading.Lock()
+
+    @timed("read_csv_file")
     def read_csv_file(self, filename):
         """ Reads the given file and stores the resulting data in a 2D list
 
@@ -42,47 +105,230 @@ class ComponentConverter():
             self._data = list(csv.reader(file))
             self._current_row = 0
 
-    def component_search(self, component):
+    def line_quantities(self):
+        """ Finds the number of each component used per BoM, given by the optional quantity
+            column of the CSV data.
+
+        Returns: A list of the quantity of each CSV row, 1 for rows without a quantity
+        """
+        quantities = []
+        for component_data in self._data:
+            if len(component_data) > CSV_QUANTITY_INDEX and component_data[CSV_QUANTITY_INDEX]:
+                quantities.append(int(component_data[CSV_QUANTITY_INDEX]))
+            else:
+                quantities.append(1)
+        return quantities
+
+    def part_search(self, part_name, facets=FACETS):
+        """ Searches the lookup backend for the given part.
+
+        Parameters:
+            - part_name: The part number to search for
+            - facets: The facets of part information to search for
+
+        Returns: The search result record of the part
+        """
+        return self._backend.part_search(part_name, facets)
+
+    def find_record(self, part_name, facets):
+        """ Finds the given facets of a part, reading the lookup cache first and searching the
+            lookup backend for the facets the cache doesn't hold.
+
+        Parameters:
+            - part_name: The part number to search for
+            - facets: The facets of part information to find
+
+        Returns: The search result record of the part
+        """
+        record = None
+        if self._cache is not None:
+            record = self._cache.read(part_name, facets)
+
+        if record is None or not facets <= record_facets(record):
+            missing = facets - record_facets(record) if record is not None else facets
+            update = self.part_search(part_name, missing)
+            if self._cache is not None and not update.get("offline"):
+                self._cache.write(part_name, update)
+            record = merge_records(record, update) if record is not None else update
+        return record
+
+    def reset_searches(self, limit=None):
+        """ Forgets the part searches made so far, starting the searches of a new component list.
+
+        Parameters:
+            - limit: The number of part searches to keep the records of, dropping the least
+                     recently used finished searches beyond it, or None to keep every search
+        """
+        with self._search_lock:
+            self._searches = {}
+            self._search_limit = limit
+
+    def record_search(self, part_name, facets=None):
+        """ Finds the search result record of the given part, reading the lookup cache first.
+            Each part number is searched once per component list, with rows that repeat a part
+            number (including rows searched concurrently) sharing the same record. A record
+            missing facets asked for later is completed by searching for only those facets. With
+            a search limit, parts whose records were dropped are searched again.
+
+        Parameters:
+            - part_name: The part number to search for
+            - facets: The facets of part information needed, defaults to the converter's
+
+        Returns: The search result record of the part
+        """
+        facets = self._facets if facets is None else frozenset(facets)
+        while True:
+            with self._search_lock:
+                search = self._searches.get(part_name)
+                if search is not None and self._search_limit is not None:
+                    # Reinserting the search keeps the searches in order of their last use
+                    self._searches[part_name] = self._searches.pop(part_name)
+                # Searches that failed are removed, so finished searches always have a record
+                if search is None or (search.done() and
+                                      not facets <= record_facets(search.result())):
+                    previous_search = search
+                    search = concurrent.futures.Future()
+                    self._searches[part_name] = search
+                    self.drop_searches()
+                    break
+
+            record = search.result()
+            if facets <= record_facets(record):
+                return record
+
+        previous = previous_search.result() if previous_search is not None else None
+        try:
+            if previous is None:
+                record = self.find_record(part_name, facets)
+            else:
+                record = merge_records(previous, self.find_record(
+                    part_name, facets - record_facets(previous)))
+        except Exception as error:
+            with self._search_lock:
+                if previous_search is not None:
+                    self._searches[part_name] = previous_search
+                else:
+                    del self._searches[part_name]
+            search.set_exception(error)
+            raise
+
+        # The record is kept for the session, so its repeated values are held once
+        record["parameters"] = {code: sys.intern(value) if isinstance(value, str) else value
+                                for code, value in record["parameters"].items()}
+        search.set_result(record)
+        return record
+
+    def drop_searches(self):
+        """ Drops the least recently used finished searches beyond the search limit. Searches in
+            progress are kept, as other rows may be waiting on them. The search lock must be held.
+        """
+        if self._search_limit is None or len(self._searches) <= self._search_limit:
+            return
+
+        for part_name in list(self._searches):
+            if len(self._searches) <= self._search_limit:
+                break
+            if self._searches[part_name].done():
+                del self._searches[part_name]
+
+    @timed("search_parts")
+    def search_parts(self, part_names, workers=DEFAULT_WORKERS, facets=None):
+        """ Searches for each of the given parts once across the given number of workers. The
+            results are kept, so later searches for the same parts don't search again.
+
+        Parameters:
+            - part_names: The part numbers to search for
+            - workers: The number of part searches to run at once
+            - facets: The facets of part information to search for, defaults to the converter's
+        """
+        if workers <= 1:
+            for part_name in part_names:
+                self.record_search(part_name, facets)
+            return
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(lambda part_name: self.record_search(part_name, facets),
+                              part_names))
+
+    def component_search(self, component, facets=None):
         """ Searches for component information and if the component is found, updates the given
-            component with the search results
+            component with the search results. The lookup cache is read first if one is attached.
 
         Parameters:
             - component: The component to update with the search results
+            - facets: The facets of part information to search for, defaults to the converter's
 
         Returns: True if the part is found, otherwise False
         """
         if component is None:
             return False
 
-        # Handles all component parameters
-        search_request = KeywordSearchRequest(keywords=component._name, record_count=1)
-        result = digikey.keyword_search(body=search_request) 
-        if result.products == []:
+        return self.apply_record(component, self.record_search(component._name, facets))
+
+    def apply_record(self, component, record):
+        """ Updates the given component with the facets of a search result record if the part was
+            found.
+
+        Parameters:
+            - component: The component to update
+            - record: The search result record of the component's part
+
+        Returns: True if the part is found, otherwise False
+        """
+        if not record["found"]:
             return False
-        else:
-            for parameter in result.products[0]._parameters:
-                if parameter.parameter_id in component._parameters:
-                    component._parameters[parameter.parameter_id] = parameter.value
-        
-            # Handles pricing breakpoints
-            for product in result.products:
-                for price in product.standard_pricing:
-                    if price.break_quantity == 1:
-                        if component._price[0] == 0 or price.total_price < component._price[0]:
-                            component._price[0] = price.total_price 
-                    
-                        # Handles lead time
-                        if product.quantity_available == 0:
-                            component._lead_time = result.products[0].manufacturer_lead_weeks
-                    
-                    if price.break_quantity == 100:
-                        if component._price[1] == 0 or price.total_price < component._price[1]:
-                            component._price[1] = price.total_price 
-            return True
+
+        facets = record_facets(record)
+        if FACET_PARAMETERS in facets:
+            for parameter_code in component._parameters:
+                if parameter_code in record["parameters"]:
+                    component._parameters[parameter_code] = record["parameters"][parameter_code]
+        if FACET_PRICING in facets:
+            component._price = list(record["price"])
+            component._price_breaks = [list(price_break) for price_break in
+                                       record["price_breaks"]] or None
+        if FACET_LEAD_TIME in facets:
+            component._lead_time = record["lead_time"]
+        component._facets = facet_set(component._facets | facets)
+        return True
+
+    def complete_components(self, facets, workers=DEFAULT_WORKERS):
+        """ Gives the components of the component list the facets they are missing, searching each
+            part once for only the missing facets.
+
+        Parameters:
+            - facets: The facets of part information the components need
+            - workers: The number of part searches to run at once
+
+        Returns: The number of components completed
+        """
+        facets = frozenset(facets)
+        incomplete = [component for component in self._components
+                      if not isinstance(component, str) and not facets <= component._facets]
+        if not incomplete:
+            return 0
+
+        self.search_parts(list(dict.fromkeys(component._name for component in incomplete)),
+                          workers, facets)
+        for component in incomplete:
+            self.component_search(component, facets)
+        return len(incomplete)
 
     def data_to_component(self, component_data):
         """ Converts data retrieved from a CSV file to a component object.
 
+        Returns: The created component object, or its part name if the part wasn't found
+        """
+        component = self.create_component(component_data)
+        status = self.component_search(component)
+        if not status:
+            return component._name
+        return component
+
+    def create_component(self, component_data):
+        """ Creates the component object described by data retrieved from a CSV file, without
+            searching for its information.
+
         Returns: The created component object
         """
         component = None
@@ -100,33 +346,174 @@ class ComponentConverter():
             component = Diode(component_data[CSV_PART_NUMBER_INDEX])
         else: 
             component = IC(component_data[CSV_PART_NUMBER_INDEX])
+        return component
 
-        status = self.component_search(component)
-        if not status:
-            return component._name
+    def stream_csv_file(self, filename):
+        """ Reads the given CSV file one row at a time, without storing the data.
+
+        Parameters:
+            - filename: The name of the CSV file to read
+
+        Returns: A generator of the CSV rows, with "Alternative" rows given the description of the
+                 row before them
+        """
+        with open(filename, "r") as file:
+            yield from self.resolve_alternatives(csv.reader(file))
+
+    def resolve_alternatives(self, rows):
+        """ Gives each "Alternative" row the description of the row before it.
+
+        Parameters:
+            - rows: The CSV rows to resolve, which are updated in place
+
+        Returns: A generator of the resolved CSV rows
+        """
+        previous_row = None
+        for component_data in rows:
+            if (component_data[DESCRIPTION_TYPE_INDEX] == "Alternative" and
+                previous_row is not None):
+                component_data[DESCRIPTION_TYPE_INDEX] = previous_row[DESCRIPTION_TYPE_INDEX]
+            previous_row = component_data
+            yield component_data
+
+    def stream_map(self, function, items, workers=DEFAULT_WORKERS):
+        """ Applies a function to items as they arrive. Calls are issued concurrently across the
+            given number of workers, with a bounded number of items in flight, while results are
+            emitted in the order of the items.
+
+        Parameters:
+            - function: The function to apply to each item
+            - items: The items to apply it to
+            - workers: The number of calls to run at once
+
+        Returns: A generator of the results
+        """
+        if workers <= 1:
+            for item in items:
+                yield function(item)
+            return
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = collections.deque()
+            for item in items:
+                pending.append(executor.submit(function, item))
+                if len(pending) >= workers * STREAM_WINDOW_PER_WORKER:
+                    yield pending.popleft().result()
+
+            while pending:
+                yield pending.popleft().result()
+
+    def stream_components(self, rows, workers=DEFAULT_WORKERS):
+        """ Converts CSV rows to components as they arrive, searching the parts concurrently
+            while components are emitted in the order of the rows.
+
+        Parameters:
+            - rows: The CSV rows to convert
+            - workers: The number of part searches to run at once
+
+        Returns: A generator of the created components
+        """
+        return self.stream_map(self.data_to_component, rows, workers)
+
+    def complete_component(self, component, facets):
+        """ Gives a component the facets it is missing, searching its part for only those facets.
+
+        Parameters:
+            - component: The component to complete, or its name if it wasn't found
+            - facets: The facets of part information the component needs
+
+        Returns: The component
+        """
+        if not isinstance(component, str) and not facets <= component._facets:
+            self.component_search(component, facets - component._facets)
         return component
 
-    def create_component_list(self):
-        """ Creates a list of component models based on the given CSV file. """
-        i = 0
-        while i < len(self._data):
-            if (self._data[i][DESCRIPTION_TYPE_INDEX] == "Alternative"):
-                self._data[i][DESCRIPTION_TYPE_INDEX] = self._data[i - 1][DESCRIPTION_TYPE_INDEX]
-            
-            component = self.data_to_component(self._data[i])
-            self._components.append(component)
-            i += 1
+    def stream_completed(self, components, facets, workers=DEFAULT_WORKERS):
+        """ Gives components the facets they are missing as they arrive, searching the parts
+            concurrently while components are emitted in the order given.
+
+        Parameters:
+            - components: The components to complete
+            - facets: The facets of part information the components need
+            - workers: The number of part searches to run at once
+
+        Returns: A generator of the completed components
+        """
+        facets = frozenset(facets)
+        return self.stream_map(lambda component: self.complete_component(component, facets),
+                               components, workers)
+
+    @timed("create_component_list")
+    def create_component_list(self, workers=DEFAULT_WORKERS):
+        """ Creates a list of component models based on the given CSV file. Part searches are
+            issued concurrently across the given number of workers, while the resulting list keeps
+            the order of the CSV rows.
+
+        Parameters:
+            - workers: The number of part searches to run at once
+        """
+        self.reset_searches()
+        rows = self.resolve_alternatives(self._data)
+        self._components.extend(self.stream_components(rows, workers))
+
+    @timed("update_component_list")
+    def update_component_list(self, previous_data, previous_components, workers=DEFAULT_WORKERS):
+        """ Creates the component list of the current CSV data from a previous component list,
+            matching rows by content hash. Components of unchanged rows are reused, so only added
+            or changed rows are searched, and components of removed rows are dropped.
+
+        Parameters:
+            - previous_data: The CSV rows of the previous component list
+            - previous_components: The previous component list
+            - workers: The number of part searches to run at once
+
+        Returns: A tuple of the number of reused, searched and removed components
+        """
+        previous = {}
+        for component_data, component in zip(previous_data, previous_components):
+            previous.setdefault(row_hash(component_data), collections.deque()).append(component)
+
+        rows = list(self.resolve_alternatives(self._data))
+        reused = []
+        changed_rows = []
+        for component_data in rows:
+            matches = previous.get(row_hash(component_data))
+            if matches:
+                reused.append(matches.popleft())
+            else:
+                reused.append(None)
+                changed_rows.append(component_data)
 
+        self.reset_searches()
+        searched = self.stream_components(changed_rows, workers)
+        self._components = [component if component is not None else next(searched)
+                            for component in reused]
+
+        removed_count = sum(len(matches) for matches in previous.values())
+        return (len(rows) - len(changed_rows), len(changed_rows), removed_count)
+
+    @timed("save_component_list")
     def save_component_list(self, filename):
-        """ Saves the current component converter using the pickel serialization module. """
-        with open(filename, 'wb') as component_file:
-            pickle.dump(self, component_file)
+        """ Saves the current component list and CSV data to a component store snapshot. """
+        store = ComponentStore(filename)
+        store.write(self._data, self._components)
+        store.close()
+        RUN_STATS.count("bytes_written", os.path.getsize(filename))
 
+    @timed("read_component_list")
     def read_component_list(self, filename):
-        """ Reads the component converter information using the pickel serialization module from the
-            given file. 
+        """ Reads the component converter information from the given component store snapshot.
+            Snapshots saved by older versions using the pickle serialization module are also
+            supported.
 
             Returns: The component converter information stored in the given file
         """
-        with open(filename, 'rb') as component_file:
-            return pickle.load(component_file)
+        if not is_component_store(filename):
+            with open(filename, 'rb') as component_file:
+                return pickle.load(component_file)
+
+        converter = ComponentConverter(self._cache, self._backend, self._facets)
+        store = ComponentStore(filename)
+        converter._data, converter._components = store.read()
+        store.close()
+        return converter
@@ -0,0 +1,100 @@
+"""
+Module containing the vectorised costing of component lists across build quantities
+"""
+# NumPy is imported by the functions using it, so importing the package to read a snapshot
+# doesn't load it
+
+# Numbers of BoMs costed when no build quantities are given
+DEFAULT_BUILD_QUANTITIES = (1, 10, 100, 250, 1000, 5000)
+
+def component_price_breaks(component):
+    """ Finds the price breaks of a component. Components saved before every price break was
+        stored fall back to their 1 of and 100 of prices.
+
+    Parameters:
+        - component: The component to find the price breaks of
+
+    Returns: A list of [break quantity, unit price] pairs in order of quantity
+    """
+    if component._price_breaks:
+        return component._price_breaks
+
+    price_breaks = []
+    if component._price[0]:
+        price_breaks.append([1, component._price[0]])
+    if component._price[1]:
+        price_breaks.append([100, component._price[1] / 100])
+    return price_breaks
+
+
+class PriceBreakTable():
+    """ Price breaks of a list of parts stored as padded arrays, one row per part, so the cost of
+        every part at every quantity is found in one pass.
+
+    Parameters:
+        - price_break_lists: The price breaks of each part as [break quantity, unit price] pairs
+                             in order of quantity, empty for parts without a price
+
+    Attributes:
+        - quantities: The break quantities of each part, padded with infinity
+        - unit_prices: The unit prices of each break, padded with zero
+        - priced: Whether each part has any price break
+    """
+    def __init__(self, price_break_lists):
+        import numpy
+
+        count = len(price_break_lists)
+        width = max([len(price_breaks) for price_breaks in price_break_lists] + [1])
+
+        self._quantities = numpy.full((count, width), numpy.inf)
+        self._unit_prices = numpy.zeros((count, width))
+        self._priced = numpy.zeros(count, dtype=bool)
+        for i, price_breaks in enumerate(price_break_lists):
+            for j, (quantity, unit_price) in enumerate(price_breaks):
+                self._quantities[i, j] = quantity
+                self._unit_prices[i, j] = unit_price
+            self._priced[i] = len(price_breaks) > 0
+
+    def costs(self, line_quantities, build_quantities):
+        """ Finds the cost of each part at each build quantity. Each part is bought at the largest
+            break quantity it reaches, and at least its smallest break quantity is bought.
+
+        Parameters:
+            - line_quantities: The number of each part used per BoM
+            - build_quantities: The numbers of BoMs to cost
+
+        Returns: A parts by build quantities array of costs, zero for parts without a price
+        """
+        import numpy
+
+        required = numpy.outer(numpy.asarray(line_quantities, dtype=float),
+                               numpy.asarray(build_quantities, dtype=float))
+        ordered = numpy.where((required > 0) & self._priced[:, None],
+                              numpy.maximum(required, self._quantities[:, :1]), 0)
+
+        # Breaks are ordered by quantity, so the number a part reaches gives the applicable break
+        reached = (self._quantities[:, None, :] <= ordered[:, :, None]).sum(axis=2)
+        unit_prices = numpy.take_along_axis(self._unit_prices, numpy.maximum(reached - 1, 0),
+                                            axis=1)
+        return ordered * unit_prices
+
+
+def cost_curve(components, line_quantities, build_quantities):
+    """ Finds the total cost of building a component list at each build quantity.
+
+    Parameters:
+        - components: The list of components, with parts that weren't found given as strings
+        - line_quantities: The number of each component used per BoM, by position
+        - build_quantities: The numbers of BoMs to cost
+
+    Returns: An array of the total cost at each build quantity
+    """
+    price_break_lists = []
+    quantities = []
+    for component, line_quantity in zip(components, line_quantities):
+        if not isinstance(component, str):
+            price_break_lists.append(component_price_breaks(component))
+            quantities.append(line_quantity)
+
+    table = PriceBreakTable(price_break_lists)
+    return table.costs(quantities, build_quantities).sum(axis=0)
@@ -0,0 +1,93 @@
+"""
+Module containing the parametric index used to discover alternative components
+"""
+from component_manager.src.components import *
+from component_manager.src.component_validator import *
+
+def functionality_key(component):
+    """ Finds the index key of a component, made of its class and the values of the parameters an
+        alternative must match exactly.
+
+    Parameters:
+        - component: The component to find the key of
+
+    Returns: The key as a tuple, or None if the component can't be indexed because its
+             alternatives can't be verified or a parameter it must match is unknown
+    """
+    component_class = type(component)
+    if not component_class.ALTERNATIVES_VERIFIABLE:
+        return None
+
+    values = tuple(component.parameter(code) for code in component_class.FUNCTIONALITY_SEARCH_CODES)
+    if None in values:
+        return None
+    return (component_class,) + values
+
+
+class ComponentIndex():
+    """ Index of enriched components bucketed by their functionality key, so the candidates for an
+        alternative are found without scanning every indexed component. Each part number is
+        indexed once.
+
+    Parameters:
+        - components: The components to index, with parts that weren't found given as strings
+
+    Attributes:
+        - buckets: Lists of the indexed components keyed by functionality key
+        - part_names: The part numbers of the indexed components
+    """
+    def __init__(self, components=()):
+        self._buckets = {}
+        self._part_names = set()
+        self.add_components(components)
+
+    def add_components(self, components):
+        """ Adds components to the index, skipping parts that weren't found, can't be indexed or
+            are already indexed.
+
+        Parameters:
+            - components: The components to add
+        """
+        for component in components:
+            if isinstance(component, str) or component._name in self._part_names:
+                continue
+
+            key = functionality_key(component)
+            if key is not None:
+                self._buckets.setdefault(key, []).append(component)
+                self._part_names.add(component._name)
+
+    def candidates(self, component):
+        """ Finds the indexed components matching the functionality of the given component.
+
+        Parameters:
+            - component: The component to find candidates for
+
+        Returns: The list of indexed components with the same functionality key, including the
+                 component itself if it is indexed
+        """
+        key = functionality_key(component)
+        if key is None:
+            return []
+        return self._buckets.get(key, [])
+
+    def find_alternatives(self, component):
+        """ Finds the indexed components that are valid alternatives for the given component. The
+            temperature range and minimum ratings are only checked against its candidates.
+
+        Parameters:
+            - component: The component to find alternatives for, or its name if it wasn't found
+
+        Returns: The list of valid alternatives in the order they were indexed
+        """
+        if isinstance(component, str):
+            return []
+
+        candidates = [candidate for candidate in self.candidates(component)
+                      if candidate._name != component._name]
+        if not candidates:
+            return []
+
+        reasons = validate_matrix([component], candidates)[0]
+        return [candidate for candidate, reason in zip(candidates, reasons.tolist())
+                if reason == REASON_VALID]
@@ -0,0 +1,141 @@
+"""
+Module containing the structured results of the checks and the buffered renderers writing them
+"""
+import io
+import abc
+import csv
+import sys
+import json
+
+# Verdicts of a check result
+VERDICT_VALID = "valid"
+VERDICT_INVALID = "invalid"
+VERDICT_NOT_FOUND = "not_found"
+VERDICT_UNVERIFIABLE = "unverifiable"
+VERDICT_LEAD_TIME = "lead_time"
+VERDICT_UNAVAILABLE = "unavailable"
+VERDICT_PRICE = "price"
+VERDICT_ALTERNATIVES = "alternatives"
+VERDICT_SUMMARY = "summary"
+
+# Number of results a renderer holds before writing them
+DEFAULT_BUFFER_SIZE = 1000
+
+# Fields of a result, in the order of the CSV columns
+RESULT_FIELDS = ("check", "part", "alternative", "verdict", "parameter", "values", "message")
+
+class CheckResult():
+    """ Result of a check on a part, a pair of parts or a whole BoM.
+
+    Parameters:
+        - check: The name of the check, such as "alternative", "lead_time" or "bom_cost"
+        - part: The part number checked, or None for results about a whole BoM
+        - verdict: The outcome of the check, one of the VERDICT constants
+        - alternative: The part number checked as an alternative, if any
+        - parameter: The search code of the parameter failing the check, if any
+        - values: A dictionary of the values the verdict was reached on
+        - message: The line describing the result, or None for results only given in machine
+                   readable output
+    """
+    __slots__ = RESULT_FIELDS
+
+    def __init__(self, check, part, verdict, alternative=None, parameter=None, values=None,
+                 message=None):
+        self.check = check
+        self.part = part
+        self.verdict = verdict
+        self.alternative = alternative
+        self.parameter = parameter
+        self.values = values if values is not None else {}
+        self.message = message
+
+    def as_dict(self):
+        """ Returns the result as a JSON serialisable dictionary. """
+        return {field: getattr(self, field) for field in RESULT_FIELDS}
+
+    def __repr__(self):
+        return "CheckResult(" + repr(self.as_dict()) + ")"
+
+
+class ReportRenderer(metaclass=abc.ABCMeta):
+    """ Generic renderer writing check results to a stream. Results are formatted as they are
+        given and written in blocks, so long reports don't make a write call per line.
+
+    Parameters:
+        - stream: The stream to write to, defaults to the standard output at the time of writing
+        - buffer_size: The number of results held before they are written
+    """
+    def __init__(self, stream=None, buffer_size=DEFAULT_BUFFER_SIZE):
+        self._stream = stream
+        self._buffer_size = buffer_size
+        self._buffer = []
+
+    @abc.abstractmethod
+    def format(self, result):
+        """ Formats a result.
+
+        Parameters:
+            - result: The check result to format
+
+        Returns: The text written for the result, which may be empty
+        """
+
+    def write(self, result):
+        """ Adds a result to the report.
+
+        Parameters:
+            - result: The check result to add
+        """
+        self._buffer.append(self.format(result))
+        if len(self._buffer) >= self._buffer_size:
+            self.flush()
+
+    def write_all(self, results):
+        """ Adds several results to the report.
+
+        Parameters:
+            - results: The check results to add
+        """
+        for result in results:
+            self.write(result)
+
+    def flush(self):
+        """ Writes the held results to the stream. """
+        if not self._buffer:
+            return
+        stream = self._stream if self._stream is not None else sys.stdout
+        stream.write("".join(self._buffer))
+        self._buffer = []
+
+
+class TextRenderer(ReportRenderer):
+    """ Renderer writing the message of each result as a line, leaving out results without one.
+    """
+    def format(self, result):
+        return result.message + "\n" if result.message is not None else ""
+
+
+class JsonLinesRenderer(ReportRenderer):
+    """ Renderer writing each result as a JSON object on its own line. """
+    def format(self, result):
+        return json.dumps(result.as_dict()) + "\n"
+
+
+class CsvRenderer(ReportRenderer):
+    """ Renderer writing each result as a CSV row, with the values given as JSON, after a header
+        row.
+    """
+    def __init__(self, stream=None, buffer_size=DEFAULT_BUFFER_SIZE):
+        super().__init__(stream, buffer_size)
+        self._buffer.append(",".join(RESULT_FIELDS) + "\r\n")
+
+    def format(self, result):
+        row = result.as_dict()
+        row["values"] = json.dumps(row["values"])
+        line = io.StringIO()
+        csv.writer(line).writerow([row[field] for field in RESULT_FIELDS])
+        return line.getvalue()
+
+
+# Renderers selectable from the command line, keyed by format name
+RENDERERS = {"text": TextRenderer, "jsonl": JsonLinesRenderer, "csv": CsvRenderer}
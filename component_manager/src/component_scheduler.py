@@ -0,0 +1,210 @@
+"""
+Module containing the scheduler that paces part searches to the distributor's request quotas
+"""
+import time
+import random
+import threading
+
+from component_manager.src.component_backend import *
+
+# Digikey product information API quotas
+DEFAULT_REQUESTS_PER_MINUTE = 120
+DEFAULT_DAILY_BUDGET = 1000
+
+# Number of attempts made at a part search before its error is raised
+DEFAULT_ATTEMPTS = 5
+
+# Bounds in seconds of the jittered delay between attempts at a part search
+BACKOFF_BASE = 0.5
+BACKOFF_MAXIMUM = 30
+
+# Search latency in seconds above which the concurrency limit is reduced
+DEFAULT_LATENCY_TARGET = 2
+
+class TokenBucket():
+    """ Token bucket that paces requests to a rate while allowing short bursts.
+
+    Parameters:
+        - rate: The number of tokens added per second
+        - capacity: The largest number of tokens the bucket holds
+        - clock: The function giving the current time in seconds
+        - sleep: The function used to wait for a token
+
+    Attributes:
+        - tokens: The number of tokens available at the last update, negative while tokens
+                  are borrowed
+        - updated: The time of the last update
+    """
+    def __init__(self, rate, capacity, clock=time.monotonic, sleep=time.sleep):
+        self._rate = rate
+        self._capacity = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """ Takes a token from the bucket, waiting until it is available. A token taken from an
+            empty bucket is borrowed from the tokens still to be added, so concurrent callers
+            queue up in order.
+        """
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self._rate
+
+        if wait > 0:
+            self._sleep(wait)
+
+
+class AdaptiveLimiter():
+    """ Concurrency limit adjusted by additive increase and multiplicative decrease. The limit
+        grows by one for each limit's worth of fast searches, and halves when a search is
+        throttled or slower than the latency target.
+
+    Parameters:
+        - maximum: The largest number of searches allowed at once
+        - minimum: The smallest number of searches allowed at once
+        - latency_target: The search latency in seconds above which the limit is reduced
+
+    Attributes:
+        - limit: The current number of searches allowed at once, as a float
+        - active: The number of searches in progress
+    """
+    def __init__(self, maximum, minimum=1, latency_target=DEFAULT_LATENCY_TARGET):
+        self._maximum = maximum
+        self._minimum = minimum
+        self._latency_target = latency_target
+        self._limit = float(maximum)
+        self._active = 0
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        """ Starts a search, waiting until the concurrency limit allows it. """
+        with self._condition:
+            while self._active >= int(self._limit):
+                self._condition.wait()
+            self._active += 1
+
+    def release(self, latency, throttled=False):
+        """ Finishes a search and adjusts the concurrency limit from its outcome.
+
+        Parameters:
+            - latency: The number of seconds the search took
+            - throttled: True if the search was rejected for exceeding the request quota
+        """
+        with self._condition:
+            self._active -= 1
+            if throttled or latency > self._latency_target:
+                self._limit = max(self._minimum, self._limit / 2)
+            else:
+                self._limit = min(self._maximum, self._limit + 1 / self._limit)
+            self._condition.notify_all()
+
+
+class ScheduledBackend(LookupBackend):
+    """ Lookup backend that schedules the part searches of another backend within the
+        distributor's request quotas. Searches are paced by a token bucket, run with an adaptive
+        concurrency limit and retried with jittered exponential backoff.
+
+    Parameters:
+        - backend: The lookup backend making the part searches
+        - requests_per_minute: The per minute request quota
+        - daily_budget: The daily request quota
+        - workers: The largest number of searches run at once
+        - attempts: The number of attempts made at a part search before its error is raised
+        - seed: The seed of the random generator jittering the backoff
+        - clock: The function giving the current time in seconds
+        - sleep: The function used to wait between requests
+
+    Attributes:
+        - requests: The number of requests made to the backend, including retries
+        - throttled: The number of requests rejected for exceeding the request quota
+    """
+    def __init__(self, backend, requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE,
+                 daily_budget=DEFAULT_DAILY_BUDGET, workers=1, attempts=DEFAULT_ATTEMPTS,
+                 seed=None, clock=time.monotonic, sleep=time.sleep):
+        self._backend = backend
+        self._daily_budget = daily_budget
+        self._attempts = attempts
+        self._clock = clock
+        self._sleep = sleep
+        self._bucket = TokenBucket(requests_per_minute / 60, max(1, workers), clock, sleep)
+        self._limiter = AdaptiveLimiter(max(1, workers))
+        self._random = random.Random(seed)
+        self._requests = 0
+        self._throttled = 0
+        self._lock = threading.Lock()
+
+    def backoff(self, attempt):
+        """ Finds the delay before retrying a part search, drawn uniformly up to an exponentially
+            growing bound so concurrent retries don't arrive together.
+
+        Parameters:
+            - attempt: The number of attempts already made
+
+        Returns: The delay in seconds
+        """
+        with self._lock:
+            return self._random.uniform(0, min(BACKOFF_MAXIMUM, BACKOFF_BASE * 2 ** attempt))
+
+    def part_search(self, part_name, facets=FACETS):
+        """ Searches for the given part through the wrapped backend, retrying failed requests.
+
+        Parameters:
+            - part_name: The part number to search for
+            - facets: The facets of part information to search for
+
+        Returns: The search result record of the part
+        """
+        for attempt in range(self._attempts):
+            with self._lock:
+                if self._requests >= self._daily_budget:
+                    raise BackendError("Daily request budget of " + str(self._daily_budget) +
+                                       " exhausted before searching " + part_name + ".")
+                self._requests += 1
+
+            self._limiter.acquire()
+            self._bucket.acquire()
+            start = self._clock()
+            throttled = False
+            try:
+                return self._backend.part_search(part_name, facets)
+            except RateLimitError:
+                throttled = True
+                with self._lock:
+                    self._throttled += 1
+                RUN_STATS.count("throttled")
+                if attempt == self._attempts - 1:
+                    raise
+            except BackendError:
+                if attempt == self._attempts - 1:
+                    raise
+            finally:
+                self._limiter.release(self._clock() - start, throttled)
+            RUN_STATS.count("retries")
+            self._sleep(self.backoff(attempt))
+
+    def requests_remaining(self):
+        """ Finds the number of requests left in the daily quota.
+
+        Returns: The number reported by the wrapped backend if known, otherwise the number left in
+                 this run's daily budget
+        """
+        remaining = self._backend.requests_remaining()
+        if remaining is None:
+            remaining = self._daily_budget - self._requests
+        return remaining
+
+    def budget_report(self):
+        """ Describes how much of the daily request budget has been used.
+
+        Returns: The budget report as a string
+        """
+        return ("Requests used: " + str(self._requests) + " of " + str(self._daily_budget) +
+                " daily (" + str(round(100 * self._requests / self._daily_budget, 1)) +
+                "%), throttled: " + str(self._throttled) + ", remaining: " +
+                str(self.requests_remaining()) + ".")
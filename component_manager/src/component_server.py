@@ -0,0 +1,183 @@
+"""
+Module containing the long running server that answers BoM queries from a warm lookup session
+"""
+import io
+import csv
+import json
+import time
+import argparse
+import threading
+import http.server
+
+from component_manager.src import *
+from component_manager.src.component_client import *
+
+# Seconds a search result is shared between queries before it is searched again
+DEFAULT_SESSION_TTL = 60 * 60
+
+# Name given to posted BoMs, which aren't read from a file
+POSTED_BOM_NAME = "posted.csv"
+
+class ComponentServer(http.server.ThreadingHTTPServer):
+    """ HTTP server answering BoM queries. Queries share a lookup session, so concurrent queries
+        for the same part are searched once and later queries are answered without searching
+        until the session expires.
+
+    Parameters:
+        - address: The (host, port) to listen on
+        - workers: The number of part searches run at once for each query
+        - cache: The part lookup cache, if any
+        - backend: The lookup backend, defaults to Digikey
+        - session_ttl: The number of seconds a lookup session is kept
+
+    Attributes:
+        - session: The converter whose search results are shared between queries
+        - session_started: The time the session was created
+    """
+    daemon_threads = True
+
+    def __init__(self, address, workers=DEFAULT_WORKERS, cache=None, backend=None,
+                 session_ttl=DEFAULT_SESSION_TTL):
+        super().__init__(address, ComponentRequestHandler)
+        self._workers = workers
+        self._cache = cache
+        self._backend = backend if backend is not None else DigikeyBackend()
+        self._session_ttl = session_ttl
+        self._session = None
+        self._session_started = 0
+        self._session_lock = threading.Lock()
+
+    def session(self):
+        """ Finds the current lookup session, starting a new one once it has expired.
+
+        Returns: The converter of the current session
+        """
+        with self._session_lock:
+            now = time.monotonic()
+            if self._session is None or now - self._session_started > self._session_ttl:
+                self._session = ComponentConverter(self._cache, self._backend)
+                self._session_started = now
+            return self._session
+
+    def check(self, query):
+        """ Runs the checks of a BoM query.
+
+        Parameters:
+            - query: The decoded query, holding the BoM CSV text and the checks to run
+
+        Returns: The answer to the query, holding the output of the checks and, if the query asks
+                 for them, the search result records of the BoM's parts
+        """
+        if not isinstance(query["csv"], str):
+            raise TypeError("The BoM must be given as CSV text.")
+
+        # The manager is created without reading a file, then given the posted rows. Each query
+        # writes its results to its own buffer, so concurrent queries don't mix their output
+        output = io.StringIO()
+        facets = check_facets(query.get("alternative"), query.get("lead_time"),
+                              query.get("bom_cost") or query.get("quantities") is not None)
+        manager = ComponentManager(POSTED_BOM_NAME, self._workers,
+                                   backend=SessionBackend(self.session()),
+                                   renderer=TextRenderer(output), facets=facets, read_file=False)
+        converter = manager._component_converter
+        converter._data = [row for row in csv.reader(io.StringIO(query["csv"])) if row]
+        converter.create_component_list(self._workers)
+
+        if query.get("alternative"):
+            manager.check_alternative()
+        if query.get("lead_time"):
+            manager.check_lead_time()
+        if query.get("bom_cost"):
+            manager.check_bom_cost()
+        if query.get("quantities") is not None:
+            manager.check_cost_curve(query["quantities"] or DEFAULT_BUILD_QUANTITIES)
+
+        answer = {"output": output.getvalue()}
+        if query.get("records"):
+            answer["records"] = {part_name: search.result()
+                                 for part_name, search in converter._searches.items()}
+        return answer
+
+
+class ComponentRequestHandler(http.server.BaseHTTPRequestHandler):
+    """ Handler of the requests made to a component server:
+        - GET /health: Answers while the server is running
+        - GET /stats: The measurements of the server's run
+        - POST /check: Runs the checks of a BoM query
+    """
+    def send_json(self, status, body):
+        """ Sends a JSON response.
+
+        Parameters:
+            - status: The HTTP status code
+            - body: The JSON serialisable response body
+        """
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self.send_json(200, {"status": "ok"})
+        elif self.path == "/stats":
+            self.send_json(200, RUN_STATS.report())
+        else:
+            self.send_json(404, {"error": "Unknown path " + self.path + "."})
+
+    def do_POST(self):
+        if self.path != "/check":
+            self.send_json(404, {"error": "Unknown path " + self.path + "."})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            query = json.loads(self.rfile.read(length).decode("utf-8"))
+            answer = self.server.check(query)
+        except (ValueError, KeyError, TypeError) as error:
+            self.send_json(400, {"error": "Invalid query: " + str(error)})
+        except BackendError as error:
+            self.send_json(502, {"error": str(error)})
+        else:
+            self.send_json(200, answer)
+
+    def log_message(self, format, *args):
+        """ Leaves requests unlogged, keeping the server output to its results. """
+
+
+def main():
+    parser = argparse.ArgumentParser(description=("Serves BoM queries from a warm lookup session "
+                                                  "for the component manager client."))
+    parser.add_argument('--host', default=DEFAULT_SERVER_HOST, help="Address to listen on")
+    parser.add_argument('--port', type=int, default=DEFAULT_SERVER_PORT, help="Port to listen on")
+    parser.add_argument('-w', type=int, default=DEFAULT_WORKERS,
+                        help="Number of concurrent part searches for each query")
+    parser.add_argument('-n', action='store_true', help="Don't use the part lookup cache")
+    parser.add_argument('--session-ttl', type=float, default=DEFAULT_SESSION_TTL / 3600,
+                        help="Hours search results are shared between queries")
+    parser.add_argument('-f', metavar="FIXTURES",
+                        help="Answer part searches from a JSON file of recorded search results")
+    args = parser.parse_args()
+
+    cache = None
+    if not args.n:
+        cache = ComponentCache()
+    if args.f is not None:
+        backend = FakeBackend(args.f)
+    else:
+        backend = ScheduledBackend(DigikeyBackend(), workers=args.w)
+
+    server = ComponentServer((args.host, args.port), args.w, cache, backend,
+                             args.session_ttl * 3600)
+    print("Serving on http://" + args.host + ":" + str(server.server_address[1]) + ".")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+Module containing the instrumentation of a run: phase timings, API calls, cache use and bytes
+written
+"""
+import time
+import functools
+import threading
+import contextlib
+import collections
+
+# Latency percentiles included in the run report
+LATENCY_PERCENTILES = (50, 90, 99)
+
+# Number of most recent API calls the latency percentiles are taken over, so a long running
+# server holds a bounded number of latencies and reports its recent calls
+LATENCY_WINDOW = 10000
+
+# Code flag of functions defined with async def, checked directly so inspect isn't loaded
+CO_COROUTINE = 0x80
+
+class RunStats():
+    """ Thread safe collector of the measurements of a run. Phases are timed by name, with nested
+        and concurrent phases each counting their own wall time.
+
+    Attributes:
+        - started: The time the collector was last reset
+        - phases: The number of calls and total seconds of each phase keyed by name
+        - counters: Event counts keyed by name
+        - latencies: The latency in seconds of each of the most recent API calls
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """ Clears every measurement, starting a new run. """
+        with self._lock:
+            self._started = time.perf_counter()
+            self._phases = {}
+            self._counters = {}
+            self._latencies = collections.deque(maxlen=LATENCY_WINDOW)
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """ Times the code run inside the context as a phase.
+
+        Parameters:
+            - name: The name of the phase
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                calls, seconds = self._phases.get(name, (0, 0))
+                self._phases[name] = (calls + 1, seconds + elapsed)
+
+    def count(self, name, amount=1):
+        """ Adds to an event counter.
+
+        Parameters:
+            - name: The name of the counter
+            - amount: The amount to add
+        """
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def record_call(self, latency, failed=False):
+        """ Records an API call.
+
+        Parameters:
+            - latency: The number of seconds the call took
+            - failed: True if the call raised an error
+        """
+        with self._lock:
+            self._latencies.append(latency)
+            self._counters["api_calls"] = self._counters.get("api_calls", 0) + 1
+            if failed:
+                self._counters["api_errors"] = self._counters.get("api_errors", 0) + 1
+
+    def report(self):
+        """ Summarises the measurements so far. Safe to call while the run is in progress.
+
+        Returns: A JSON serialisable dictionary of the run measurements
+        """
+        with self._lock:
+            phases = dict(self._phases)
+            counters = dict(self._counters)
+            latencies = sorted(self._latencies)
+            wall_time = time.perf_counter() - self._started
+
+        latency = {}
+        if latencies:
+            for percentile in LATENCY_PERCENTILES:
+                # Nearest rank percentile
+                rank = max(1, -(-percentile * len(latencies) // 100))
+                latency["p" + str(percentile)] = latencies[rank - 1]
+            latency["max"] = latencies[-1]
+            latency["mean"] = sum(latencies) / len(latencies)
+
+        hits = counters.get("cache_hits", 0)
+        misses = counters.get("cache_misses", 0)
+        return {"wall_time": wall_time,
+                "phases": {name: {"calls": calls, "seconds": seconds}
+                           for name, (calls, seconds) in sorted(phases.items())},
+                "api_calls": counters.get("api_calls", 0),
+                "api_errors": counters.get("api_errors", 0),
+                "latency": latency,
+                "retries": counters.get("retries", 0),
+                "throttled": counters.get("throttled", 0),
+                "cache": {"hits": hits, "misses": misses,
+                          "hit_rate": hits / (hits + misses) if hits + misses else None},
+                "bytes_written": counters.get("bytes_written", 0)}
+
+
+# Collector of the current run, which monitoring can read at any time through RUN_STATS.report()
+RUN_STATS = RunStats()
+
+def timed(name):
+    """ Decorates a function so each call is timed as a phase of the current run.
+
+    Parameters:
+        - name: The name of the phase
+
+    Returns: The decorator
+    """
+    def decorator(function):
+        if function.__code__.co_flags & CO_COROUTINE:
+            @functools.wraps(function)
+            async def coroutine_wrapper(*args, **kwargs):
+                with RUN_STATS.phase(name):
+                    return await function(*args, **kwargs)
+            return coroutine_wrapper
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with RUN_STATS.phase(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def api_call(function):
+    """ Decorates a part search so each call is recorded as an API call of the current run.
+
+    Parameters:
+        - function: The part search to record
+
+    Returns: The decorated part search
+    """
+    if function.__code__.co_flags & CO_COROUTINE:
+        @functools.wraps(function)
+        async def coroutine_wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            failed = True
+            try:
+                result = await function(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                RUN_STATS.record_call(time.perf_counter() - start, failed)
+        return coroutine_wrapper
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        failed = True
+        try:
+            result = function(*args, **kwargs)
+            failed = False
+            return result
+        finally:
+            RUN_STATS.record_call(time.perf_counter() - start, failed)
+    return wrapper
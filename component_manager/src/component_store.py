@@ -0,0 +1,270 @@
+"""
+Module containing the versioned on-disk store for component list snapshots
+"""
+import os
+import sys
+import json
+import sqlite3
+import tempfile
+import contextlib
+
+from component_manager.src.components import *
+
+# Version of the snapshot format written and read by the component store
+STORE_VERSION = 1
+
+# Header at the start of every SQLite database file
+SQLITE_HEADER = b"SQLite format 3\x00"
+
+# Component classes that can be restored from a snapshot, keyed by class name
+COMPONENT_CLASSES = {component_class.__name__: component_class for component_class in
+                     (Resistor, Capacitor, Inductor, Ferrite, Choke, Diode, IC)}
+
+# Columns of the components table that can be read on their own
+STORE_COLUMNS = ("price", "lead_time", "price_breaks")
+
+class StoreError(Exception):
+    """ Error raised when a snapshot can't be read by this version of the component store """
+
+
+def is_component_store(filename):
+    """ Determines if the given file is a component store snapshot rather than a pickled
+        component converter.
+
+    Parameters:
+        - filename: The name of the snapshot file
+
+    Returns: True if the file is a component store snapshot, False otherwise
+    """
+    with open(filename, "rb") as snapshot_file:
+        return snapshot_file.read(len(SQLITE_HEADER)) == SQLITE_HEADER
+
+
+class ComponentStore():
+    """ Snapshot of a component list stored in an SQLite database. Components are stored one row
+        per CSV row and indexed by part name, so single parts or single columns can be read
+        without restoring the whole list.
+
+    Parameters:
+        - filename: The name of the snapshot file
+
+    Attributes:
+        - values: The distinct parameter values of the snapshot in order of code
+    """
+    def __init__(self, filename):
+        self._filename = filename
+        self._connection = None
+        self._values = None
+
+    def connect(self):
+        """ Opens the snapshot for reading if it isn't already open, checking its format version.
+        """
+        if self._connection is not None:
+            return
+
+        if not is_component_store(self._filename):
+            raise StoreError(self._filename + " is not a component store snapshot.")
+        self._connection = sqlite3.connect(self._filename)
+        row = self._connection.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        if row is None or int(row[0]) != STORE_VERSION:
+            self.close()
+            raise StoreError(self._filename + " uses an unsupported snapshot version.")
+        self._values = [sys.intern(value) for (value,) in self._connection.execute(
+            "SELECT value FROM parameter_values ORDER BY id")]
+
+    def decode_value(self, value):
+        """ Finds the parameter value stored in the parameters table.
+
+        Parameters:
+            - value: The code of the value in the values table, or None for no value
+
+        Returns: The parameter value
+        """
+        if value is None:
+            return value
+        return self._values[value]
+
+    @contextlib.contextmanager
+    def replacement(self):
+        """ Opens a temporary file in the directory of the snapshot for a new snapshot to be
+            written to. The new snapshot replaces the snapshot once it is written, while a failed
+            write removes it and leaves the previous snapshot in place.
+        """
+        self.close()
+        directory, basename = os.path.split(os.path.abspath(self._filename))
+        descriptor, temporary_filename = tempfile.mkstemp(prefix=basename + ".", suffix=".tmp",
+                                                          dir=directory)
+        os.close(descriptor)
+        try:
+            self._connection = sqlite3.connect(temporary_filename)
+            yield
+            self.close()
+            os.replace(temporary_filename, self._filename)
+        except BaseException:
+            self.close()
+            os.remove(temporary_filename)
+            raise
+
+    def write(self, data, components):
+        """ Writes the given component list to the snapshot, replacing its previous contents.
+
+        Parameters:
+            - data: The CSV rows the components were created from
+            - components: The list of components, with parts that weren't found stored as their
+                          part name
+        """
+        with self.replacement(), self._connection:
+            self._connection.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+            self._connection.execute("CREATE TABLE components (row INTEGER PRIMARY KEY, "
+                                     "part_name TEXT, class TEXT, data TEXT, price_one REAL, "
+                                     "price_hundred REAL, lead_time TEXT, price_breaks TEXT, "
+                                     "facets TEXT)")
+            self._connection.execute("CREATE TABLE parameter_values (id INTEGER PRIMARY KEY, "
+                                     "value TEXT)")
+            self._connection.execute("CREATE TABLE parameters (row INTEGER, code INTEGER, "
+                                     "value_id INTEGER, PRIMARY KEY (row, code))")
+            self._connection.execute("CREATE INDEX part_index ON components (part_name)")
+            self._connection.execute("INSERT INTO meta VALUES ('version', ?)",
+                                     (str(STORE_VERSION),))
+
+            component_rows = []
+            parameter_rows = []
+            value_codes = {}
+            for row, component in enumerate(components):
+                row_data = json.dumps(data[row]) if data is not None else None
+                if isinstance(component, str):
+                    component_rows.append((row, component, None, row_data, 0, 0, "0", "[]",
+                                           None))
+                    continue
+
+                component_rows.append((row, component._name, type(component).__name__, row_data,
+                                       component._price[0], component._price[1],
+                                       json.dumps(component._lead_time),
+                                       json.dumps(component._price_breaks or []),
+                                       ",".join(sorted(component._facets))))
+                for code, value in component._parameters.items():
+                    if value is not None:
+                        value = value_codes.setdefault(value, len(value_codes))
+                    parameter_rows.append((row, code, value))
+
+            self._connection.executemany("INSERT INTO components VALUES "
+                                         "(?, ?, ?, ?, ?, ?, ?, ?, ?)", component_rows)
+            self._connection.executemany("INSERT INTO parameter_values VALUES (?, ?)",
+                                         ((code, value) for value, code in value_codes.items()))
+            self._connection.executemany("INSERT INTO parameters VALUES (?, ?, ?)",
+                                         parameter_rows)
+        self._values = list(value_codes)
+
+    def restore_component(self, component_row, parameters):
+        """ Creates a component from its stored row and parameters.
+
+        Parameters:
+            - component_row: The stored (part name, class, price 1 of, price 100 of, lead time,
+                             price breaks, facets)
+            - parameters: The stored parameters of the component keyed by search code
+
+        Returns: The restored component, or its part name if the part wasn't found
+        """
+        part_name, class_name, price_one, price_hundred, lead_time, price_breaks, facets = \
+            component_row
+        if class_name is None:
+            return part_name
+
+        component = COMPONENT_CLASSES[class_name](part_name)
+        for code in component._parameters:
+            if code in parameters:
+                component._parameters[code] = parameters[code]
+        component._price = [price_one, price_hundred]
+        component._lead_time = json.loads(lead_time)
+        component._price_breaks = json.loads(price_breaks) or None
+        component._facets = facet_set(facets.split(",")) if facets else NO_FACETS
+        return component
+
+    def iterate(self):
+        """ Reads the component list from the snapshot one row at a time, so only one component is
+            held in memory by the store.
+
+        Returns: A generator of (CSV row, component) tuples in row order
+        """
+        self.connect()
+        # Walks the components and parameters tables side by side, both ordered by row
+        parameter_rows = self._connection.execute("SELECT row, code, value_id FROM parameters "
+                                                  "ORDER BY row")
+        parameter_row = next(parameter_rows, None)
+        for row in self._connection.execute("SELECT row, data, part_name, class, price_one, "
+                                            "price_hundred, lead_time, price_breaks, facets "
+                                            "FROM components ORDER BY row"):
+            parameters = {}
+            while parameter_row is not None and parameter_row[0] == row[0]:
+                parameters[parameter_row[1]] = self.decode_value(parameter_row[2])
+                parameter_row = next(parameter_rows, None)
+
+            yield (json.loads(row[1]) if row[1] is not None else None,
+                   self.restore_component(row[2:], parameters))
+
+    def read(self):
+        """ Reads the whole component list from the snapshot.
+
+        Returns: A tuple of the CSV rows and the list of components in row order
+        """
+        data = []
+        components = []
+        for row_data, component in self.iterate():
+            data.append(row_data)
+            components.append(component)
+        return data, components
+
+    def read_part(self, part_name):
+        """ Reads a single part from the snapshot using the part name index.
+
+        Parameters:
+            - part_name: The part number to read
+
+        Returns: The component of the first row with the given part number, or None if the
+                 snapshot doesn't contain it
+        """
+        self.connect()
+        row = self._connection.execute("SELECT row, part_name, class, price_one, price_hundred, "
+                                       "lead_time, price_breaks, facets FROM components "
+                                       "WHERE part_name = ? ORDER BY row LIMIT 1",
+                                       (part_name,)).fetchone()
+        if row is None:
+            return None
+
+        parameters = {code: self.decode_value(value) for code, value in self._connection.execute(
+            "SELECT code, value_id FROM parameters WHERE row = ?", (row[0],))}
+        return self.restore_component(row[1:], parameters)
+
+    def read_column(self, column):
+        """ Reads a single column of every part in the snapshot without restoring components.
+
+        Parameters:
+            - column: The column to read, either "price", "lead_time" or "price_breaks"
+
+        Returns: A list of (part name, value) tuples in row order, where prices are given as
+                 [1 of, 100 of] lists and price breaks as lists of [break quantity, unit price]
+                 pairs. Parts that weren't found are excluded.
+        """
+        if column not in STORE_COLUMNS:
+            raise StoreError("Unknown snapshot column " + column + ".")
+        self.connect()
+
+        if column == "price":
+            return [(part_name, [price_one, price_hundred]) for part_name, price_one, price_hundred
+                    in self._connection.execute("SELECT part_name, price_one, price_hundred "
+                                                "FROM components WHERE class IS NOT NULL "
+                                                "ORDER BY row")]
+        if column == "price_breaks":
+            return [(part_name, json.loads(price_breaks)) for part_name, price_breaks in
+                    self._connection.execute("SELECT part_name, price_breaks FROM components "
+                                             "WHERE class IS NOT NULL ORDER BY row")]
+        return [(part_name, json.loads(lead_time)) for part_name, lead_time in
+                self._connection.execute("SELECT part_name, lead_time FROM components "
+                                         "WHERE class IS NOT NULL ORDER BY row")]
+
+    def close(self):
+        """ Closes the underlying database connection. """
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+            self._values = None
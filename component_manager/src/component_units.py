@@ -0,0 +1,53 @@
+"""
+Module containing the parsers that normalise component parameter strings into numeric values
+"""
+import re
+import functools
+
+# Multipliers of the SI prefixes used in parameter values
+SI_PREFIXES = {"p": 1e-12, "n": 1e-9, "u": 1e-6, "µ": 1e-6, "μ": 1e-6, "m": 1e-3, "": 1,
+               "k": 1e3, "K": 1e3, "M": 1e6, "G": 1e9}
+
+# Matches the leading quantity of a parameter value, such as "10 kOhms", "0.125W, 1/8W",
+# "200mA (DC)" or "0.1 µF"
+QUANTITY_PATTERN = re.compile(r"\s*([-+]?\d+(?:\.\d+)?)\s*([pnuµμmkKMG]?)(Ohms?|Ω|F|H|A|V|W)")
+
+# Matches each temperature of a temperature range, such as "-55°C ~ 155°C"
+TEMPERATURE_PATTERN = re.compile(r"([-+]?\d+(?:\.\d+)?)\s*°C")
+
+@functools.lru_cache(maxsize=None)
+def parse_quantity(value):
+    """ Parses the leading quantity of a parameter value into its base SI unit, so "10 kOhms" is
+        10000 ohms, "500mA" is 0.5 amps and "0.1 µF" is 1e-7 farads.
+
+    Parameters:
+        - value: The parameter value to parse
+
+    Returns: The quantity in its base unit as a float, or None if the value has no quantity
+    """
+    if not isinstance(value, str):
+        return None
+
+    match = QUANTITY_PATTERN.match(value)
+    if match is None:
+        return None
+    return float(match.group(1)) * SI_PREFIXES[match.group(2)]
+
+
+@functools.lru_cache(maxsize=None)
+def parse_temperature_range(value):
+    """ Parses a temperature range parameter value, such as "-55°C ~ 155°C".
+
+    Parameters:
+        - value: The parameter value to parse
+
+    Returns: A tuple of the minimum and maximum temperature in °C as floats, or None if the value
+             isn't a temperature range
+    """
+    if not isinstance(value, str):
+        return None
+
+    temperatures = TEMPERATURE_PATTERN.findall(value)
+    if len(temperatures) < 2:
+        return None
+    return (float(temperatures[0]), float(temperatures[1]))
@@ -0,0 +1,283 @@
+"""
+Module containing the vectorised validation of alternative components
+"""
+# NumPy is imported by the functions using it, so importing the package to read a snapshot
+# doesn't load it
+import concurrent.futures
+
+from component_manager.src.components import *
+
+# Number of pairs sent to a validation process at a time
+DEFAULT_CHUNK_SIZE = 5000
+
+# Reasons an alternative fails validation, indexed by the reason codes of a validation result
+REASON_VALID = 0
+REASON_NOT_FOUND = 1
+REASON_TYPE = 2
+REASON_UNVERIFIABLE = 3
+REASON_FUNCTIONALITY = 4
+REASON_TEMPERATURE = 5
+REASON_POWER = 6
+REASON_VOLTAGE = 7
+REASON_CURRENT = 8
+REASON_REVERSE_VOLTAGE = 9
+REASONS = ("", "Part wasn't found.", "Component types don't match.",
+           "Alternatives can't be verified.", "Part specfications don't match.",
+           "Temperature specfications aren't sufficient.", "Power specfications aren't sufficient.",
+           "Voltage specfications aren't sufficient.", "Current specfications aren't sufficient.",
+           "Reverse voltage specfications aren't sufficient.")
+
+# Reason codes of the minimum ratings of the component classes, keyed by rating name. Codes are
+# fixed so they mean the same in every validation process.
+RATING_REASONS = {"Power": REASON_POWER, "Voltage": REASON_VOLTAGE, "Current": REASON_CURRENT,
+                  "Reverse voltage": REASON_REVERSE_VOLTAGE}
+
+def rating_reason(rating):
+    """ Finds the reason code of a failed minimum rating.
+
+    Parameters:
+        - rating: The name of the rating
+
+    Returns: The reason code of the rating
+    """
+    return RATING_REASONS[rating]
+
+
+class ComponentColumns():
+    """ Columnar arrays of the parameters an alternative is validated on, for a group of
+        components of the same class.
+
+    Parameters:
+        - component_class: The class of the components
+        - components: The components to build columns from
+        - value_codes: The dictionary encoding raw parameter values as integers, shared between
+                       the columns being compared
+
+    Attributes:
+        - functionality: Integer codes of the exact match parameters, one column per parameter
+        - temperature: The minimum and maximum temperature, NaN when unknown
+        - ratings: The numeric minimum ratings, one column per rating, NaN when unknown
+    """
+    def __init__(self, component_class, components, value_codes):
+        import numpy
+
+        count = len(components)
+        functionality_codes = component_class.FUNCTIONALITY_SEARCH_CODES
+        rating_codes = list(component_class.MINIMUM_RATINGS)
+
+        self._functionality = numpy.empty((count, len(functionality_codes)), dtype=numpy.int64)
+        self._temperature = numpy.full((count, 2), numpy.nan)
+        self._ratings = numpy.full((count, len(rating_codes)), numpy.nan)
+
+        for i, component in enumerate(components):
+            for j, code in enumerate(functionality_codes):
+                value = component.parameter(code)
+                self._functionality[i, j] = value_codes.setdefault(value, len(value_codes))
+
+            temperature = component.numeric(component_class.TEMPERATURE_SEARCH_CODE)
+            if temperature is not None:
+                self._temperature[i] = temperature
+
+            for j, code in enumerate(rating_codes):
+                rating = component.numeric(code)
+                if rating is not None:
+                    self._ratings[i, j] = rating
+
+
+def align(original_column, candidate_column, pairwise):
+    """ Aligns an original and a candidate column so comparing them gives a result per pair, or a
+        matrix of every original against every candidate.
+
+    Parameters:
+        - original_column: The column of the original components
+        - candidate_column: The column of the candidate components
+        - pairwise: True to compare the columns element by element
+
+    Returns: A tuple of the aligned original and candidate columns
+    """
+    if pairwise:
+        return original_column, candidate_column
+    return original_column[:, None], candidate_column[None, :]
+
+
+def class_reasons(component_class, originals, candidates, pairwise):
+    """ Evaluates the alternative rules of a component class as array operations.
+
+    Parameters:
+        - component_class: The class of every given component
+        - originals: The original components
+        - candidates: The candidate alternative components
+        - pairwise: True to compare originals[i] with candidates[i], False to compare every
+                    original with every candidate
+
+    Returns: An array of reason codes, either one per pair or an originals by candidates matrix
+    """
+    import numpy
+
+    if not component_class.ALTERNATIVES_VERIFIABLE:
+        shape = (len(originals),) if pairwise else (len(originals), len(candidates))
+        return numpy.full(shape, REASON_UNVERIFIABLE, dtype=numpy.int16)
+
+    value_codes = {}
+    original = ComponentColumns(component_class, originals, value_codes)
+    candidate = ComponentColumns(component_class, candidates, value_codes)
+
+    # Checks run from last to first so the first failing check gives the reason
+    shape = (len(originals),) if pairwise else (len(originals), len(candidates))
+    reasons = numpy.full(shape, REASON_VALID, dtype=numpy.int16)
+    for j, rating in reversed(list(enumerate(component_class.MINIMUM_RATINGS.values()))):
+        original_rating, candidate_rating = align(original._ratings[:, j],
+                                                  candidate._ratings[:, j], pairwise)
+        reasons[~(candidate_rating >= original_rating)] = rating_reason(rating)
+
+    original_minimum, candidate_minimum = align(original._temperature[:, 0],
+                                                candidate._temperature[:, 0], pairwise)
+    original_maximum, candidate_maximum = align(original._temperature[:, 1],
+                                                candidate._temperature[:, 1], pairwise)
+    reasons[~((candidate_minimum <= original_minimum) &
+              (candidate_maximum >= original_maximum))] = REASON_TEMPERATURE
+
+    for j in range(original._functionality.shape[1]):
+        original_values, candidate_values = align(original._functionality[:, j],
+                                                  candidate._functionality[:, j], pairwise)
+        reasons[original_values != candidate_values] = REASON_FUNCTIONALITY
+    return reasons
+
+
+def group_by_class(components):
+    """ Groups the positions of components by component class.
+
+    Parameters:
+        - components: The list of components, with parts that weren't found given as strings
+
+    Returns: A dictionary of position lists keyed by component class, excluding strings
+    """
+    groups = {}
+    for i, component in enumerate(components):
+        if not isinstance(component, str):
+            groups.setdefault(type(component), []).append(i)
+    return groups
+
+
+def validate_matrix(originals, candidates):
+    """ Validates every candidate as an alternative for every original component.
+
+    Parameters:
+        - originals: The original components
+        - candidates: The candidate alternative components
+
+    Returns: An originals by candidates matrix of reason codes indexing REASONS, where
+             REASON_VALID marks a valid alternative
+    """
+    import numpy
+
+    reasons = numpy.full((len(originals), len(candidates)), REASON_TYPE, dtype=numpy.int16)
+    reasons[[isinstance(component, str) for component in originals], :] = REASON_NOT_FOUND
+    reasons[:, [isinstance(component, str) for component in candidates]] = REASON_NOT_FOUND
+
+    candidate_groups = group_by_class(candidates)
+    for component_class, original_rows in group_by_class(originals).items():
+        if component_class not in candidate_groups:
+            continue
+        candidate_columns = candidate_groups[component_class]
+        reasons[numpy.ix_(original_rows, candidate_columns)] = class_reasons(
+            component_class, [originals[i] for i in original_rows],
+            [candidates[j] for j in candidate_columns], False)
+    return reasons
+
+
+def validate_pairs(originals, alternatives):
+    """ Validates each alternative against the original component it is paired with.
+
+    Parameters:
+        - originals: The original components
+        - alternatives: The alternative components, paired by position with the originals
+
+    Returns: A list of (valid, reason) tuples, one per pair, where reason is None for valid
+             alternatives
+    """
+    import numpy
+
+    reasons = numpy.full(len(originals), REASON_TYPE, dtype=numpy.int16)
+    groups = {}
+    for i, (original, alternative) in enumerate(zip(originals, alternatives)):
+        if isinstance(original, str) or isinstance(alternative, str):
+            reasons[i] = REASON_NOT_FOUND
+        elif type(original) is type(alternative):
+            groups.setdefault(type(original), []).append(i)
+
+    for component_class, rows in groups.items():
+        reasons[rows] = class_reasons(component_class, [originals[i] for i in rows],
+                                      [alternatives[i] for i in rows], True)
+    return [(reason == REASON_VALID, REASONS[reason] if reason != REASON_VALID else None)
+            for reason in reasons.tolist()]
+
+
+def compact_component(component):
+    """ Reduces a component to the form sent to validation processes, leaving out its pricing and
+        lead time.
+
+    Parameters:
+        - component: The component, or its name if it wasn't found
+
+    Returns: A tuple of the component class, name, parameter values and numeric values in the
+             layout of the class, or the name of a part that wasn't found
+    """
+    if isinstance(component, str):
+        return component
+    return (type(component), component._name, component._values, component._numeric)
+
+
+def restore_component(compact):
+    """ Rebuilds a component from its compact form.
+
+    Parameters:
+        - compact: The compact form made by compact_component
+
+    Returns: The component, or the name of a part that wasn't found
+    """
+    if isinstance(compact, str):
+        return compact
+    component_class, name, values, numeric = compact
+    component = component_class(name)
+    # The values were parsed by the sending process, so are restored without parsing them again
+    component._values = values
+    component._numeric = numeric
+    return component
+
+
+def validate_chunk(chunk):
+    """ Validates a chunk of pairs in compact form, run by a validation process.
+
+    Parameters:
+        - chunk: A tuple of the compact original and alternative components
+
+    Returns: A list of (valid, reason) tuples, one per pair
+    """
+    originals, alternatives = chunk
+    return validate_pairs([restore_component(compact) for compact in originals],
+                          [restore_component(compact) for compact in alternatives])
+
+
+def validate_pairs_parallel(originals, alternatives, processes=None,
+                            chunk_size=DEFAULT_CHUNK_SIZE):
+    """ Validates each alternative against the original component it is paired with, sharding the
+        pairs across a pool of processes. Results are given in the order of the pairs as soon as
+        the chunk holding them is validated.
+
+    Parameters:
+        - originals: The original components
+        - alternatives: The alternative components, paired by position with the originals
+        - processes: The number of validation processes, defaults to the number of CPUs
+        - chunk_size: The number of pairs sent to a process at a time
+
+    Returns: A generator of (valid, reason) tuples, one per pair, where reason is None for valid
+             alternatives
+    """
+    chunks = ([[compact_component(component) for component in originals[start:start + chunk_size]],
+               [compact_component(component) for component in
+                alternatives[start:start + chunk_size]]]
+              for start in range(0, len(originals), chunk_size))
+    with concurrent.futures.ProcessPoolExecutor(processes) as executor:
+        for results in executor.map(validate_chunk, chunks):
+            yield from results
@@ -2,6 +2,72 @@
 Module that contains all of the supported component models
 """
 import abc
+import sys
+import itertools
+import collections.abc
+
+from component_manager.src.component_units import *
+from component_manager.src.component_report import *
+
+# Facets of part information, each searched and stored on its own: the parametric data, the
+# price breaks, and the stock and lead time
+FACET_PARAMETERS = "parameters"
+FACET_PRICING = "pricing"
+FACET_LEAD_TIME = "lead_time"
+FACETS = frozenset((FACET_PARAMETERS, FACET_PRICING, FACET_LEAD_TIME))
+
+# Every combination of facets, so components share one set per combination rather than each
+# holding its own
+FACET_SETS = {facets: facets for facets in
+              (frozenset(combination) for size in range(len(FACETS) + 1)
+               for combination in itertools.combinations(sorted(FACETS), size))}
+FACET_SETS[FACETS] = FACETS
+NO_FACETS = FACET_SETS[frozenset()]
+
+def facet_set(facets):
+    """ Finds the shared set of the given facets.
+
+    Parameters:
+        - facets: The facets of part information
+
+    Returns: The shared frozenset of the facets
+    """
+    return FACET_SETS[frozenset(facets)]
+
+
+class ParameterView(collections.abc.MutableMapping):
+    """ Dictionary view relating search codes to the parameter values of a component, which are
+        stored positionally in the layout of the component class.
+
+    Parameters:
+        - component: The component whose parameters are viewed
+    """
+    __slots__ = ("_component",)
+
+    def __init__(self, component):
+        self._component = component
+
+    def __getitem__(self, parameter_code):
+        return self._component._values[self._component._parameter_positions[parameter_code]]
+
+    def __setitem__(self, parameter_code, value):
+        self._component.set_parameter(parameter_code, value)
+
+    def __delitem__(self, parameter_code):
+        raise TypeError("Component parameters can't be removed.")
+
+    def __contains__(self, parameter_code):
+        return parameter_code in self._component._parameter_positions
+
+    def __iter__(self):
+        return iter(self._component._parameter_codes)
+
+    def __len__(self):
+        return len(self._component._parameter_codes)
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
 
 class Component(metaclass=abc.ABCMeta):
     # Search codes for shared componenet attributes
@@ -19,18 +85,119 @@ class Component(metaclass=abc.ABCMeta):
 
     Attributes:
         - name: The name of the component
-        - parameters: The parameters describing the component in the format:
-                      [Value, Package, Power, Tolerance, Size, Height, Temperature, Status]
+        - values: The parameter values of the component, ordered by the parameter layout of its
+                  class: [Tolerance, Package, Size, Temperature, Height, Status] followed by the
+                  class specific parameters
+        - parameters: Dictionary view relating search codes to parameter values
+        - numeric: The normalised numeric values of the parameters that have a parser, ordered by
+                   the numeric layout of its class, or None until one of them has a value
         - price: The price of the component for 1 of and 100 of as a tuple
+        - price_breaks: Every price break of the component as [break quantity, unit price]
+                        pairs in order of quantity, or None if it has none
+        - facets: The facets of part information the component has been given
     """
+    # Search codes of the parameters specific to a component class
+    PARAMETER_SEARCH_CODES = ()
+    # Parsers normalising the class specific parameters into numeric values
+    NUMERIC_PARSERS = {}
+    # Search codes of the parameters an alternative must match exactly
+    FUNCTIONALITY_SEARCH_CODES = ()
+    # Names of the ratings an alternative must meet or exceed, keyed by search code
+    MINIMUM_RATINGS = {}
+    # Whether alternatives for the component class can be verified
+    ALTERNATIVES_VERIFIABLE = True
+
+    __slots__ = ("_name", "_values", "_numeric", "_price", "_price_breaks", "_lead_time",
+                 "_facets")
+
+    def __init_subclass__(cls, **kwargs):
+        """ Builds the parameter layout shared by every instance of a component class, relating
+            each search code to the position of its value.
+        """
+        super().__init_subclass__(**kwargs)
+        cls._parameter_codes = (cls.TOLERANCE_SEARCH_CODE, cls.PACKAGE_SEARCH_CODE,
+                                cls.SIZE_SEARCH_CODE, cls.TEMPERATURE_SEARCH_CODE,
+                                cls.HEIGHT_SEARCH_CODE, cls.STATUS_SEARCH_CODE) + \
+                               cls.PARAMETER_SEARCH_CODES
+        cls._parameter_positions = {code: i for i, code in enumerate(cls._parameter_codes)}
+
+        cls._numeric_parsers = {cls.TEMPERATURE_SEARCH_CODE: parse_temperature_range}
+        cls._numeric_parsers.update(cls.NUMERIC_PARSERS)
+        cls._numeric_codes = tuple(code for code in cls._parameter_codes
+                                   if code in cls._numeric_parsers)
+        cls._numeric_positions = {code: i for i, code in enumerate(cls._numeric_codes)}
+
     def __init__(self, part_name):
         self._name = part_name
-        # Dictionary to relate search codes to parameter values
-        self._parameters = {self.TOLERANCE_SEARCH_CODE: None, self.PACKAGE_SEARCH_CODE: None,
-                            self.SIZE_SEARCH_CODE: None, self.TEMPERATURE_SEARCH_CODE: None,
-                            self.HEIGHT_SEARCH_CODE: None, self.STATUS_SEARCH_CODE: None}
+        # Parameter values in the order of the class parameter layout
+        self._values = [None] * len(self._parameter_codes)
+        # Numeric values and price breaks are only given a list once the component has some
+        self._numeric = None
         self._price = [0, 0]
+        self._price_breaks = None
         self._lead_time = 0
+        self._facets = NO_FACETS
+
+    @property
+    def _parameters(self):
+        """ Dictionary view relating search codes to parameter values """
+        return ParameterView(self)
+
+    @_parameters.setter
+    def _parameters(self, parameters):
+        self._values = [None] * len(self._parameter_codes)
+        self._numeric = None
+        for code in self._parameter_codes:
+            self.set_parameter(code, parameters.get(code))
+
+    def __getstate__(self):
+        """ Returns the pickled state of the component, keeping the dictionary format used before
+            components were given a fixed parameter layout.
+        """
+        return {"_name": self._name, "_parameters": dict(self._parameters.items()),
+                "_price": self._price, "_price_breaks": self._price_breaks,
+                "_lead_time": self._lead_time, "_facets": sorted(self._facets)}
+
+    def __setstate__(self, state):
+        """ Restores a pickled component. """
+        self._name = state["_name"]
+        self._parameters = state["_parameters"]
+        self._price = state["_price"]
+        self._price_breaks = state.get("_price_breaks") or None
+        self._lead_time = state["_lead_time"]
+        # Components pickled before facets were searched separately hold every facet
+        self._facets = facet_set(state.get("_facets", FACETS))
+
+    def parameter(self, parameter_code):
+        """ Returns the value of the parameter with the given search code. """
+        return self._values[self._parameter_positions[parameter_code]]
+
+    def numeric(self, parameter_code):
+        """ Returns the normalised numeric value of the parameter with the given search code. """
+        if self._numeric is None:
+            return None
+        return self._numeric[self._numeric_positions[parameter_code]]
+
+    def set_parameter(self, parameter_code, value):
+        """ Sets the value of the parameter with the given search code. Parameters with a parser
+            also have their normalised numeric value stored, so it is only parsed once.
+
+        Parameters:
+            - parameter_code: The search code of the parameter
+            - value: The raw value of the parameter
+        """
+        # Values repeat across components, so each distinct value is held once. Comparing
+        # interned values is then an identity check.
+        if isinstance(value, str):
+            value = sys.intern(value)
+        self._values[self._parameter_positions[parameter_code]] = value
+        if parameter_code in self._numeric_positions:
+            numeric = self._numeric_parsers[parameter_code](value)
+            if self._numeric is None:
+                if numeric is None:
+                    return
+                self._numeric = [None] * len(self._numeric_codes)
+            self._numeric[self._numeric_positions[parameter_code]] = numeric
 
     def __eq__(self, component):
         """ Compares this component with the given component. Returns True if their parameters are
@@ -41,14 +208,17 @@ class Component(metaclass=abc.ABCMeta):
 
             Returns: True if all parameters are equal, false otherwise
         """ 
-        if len(self._parameters) != len(component._parameters):
+        if len(self._values) != len(component._values):
             return False
 
         if self._name != component._name:
             return False 
 
-        for key in self._parameters:
-            if (self._parameters[key] != component._parameters[key]):
+        if self._parameter_codes == component._parameter_codes:
+            return self._values == component._values
+
+        for code, value in zip(self._parameter_codes, self._values):
+            if (value != component.parameter(code)):
                 return False
         return True
 
@@ -60,13 +230,14 @@ class Component(metaclass=abc.ABCMeta):
             - component: The component to compare to the current componenet
             - parameters: The list of parameter codes to be compared to determine functionality
 
-        Returns: True if all functionality is equal, False otherwise
+        Returns: The invalid result of the first parameter that differs, or None if all
+                 functionality is equal
         """
         for parameter_code in parameters:
-            if (self._parameters[parameter_code] != component._parameters[parameter_code]):
-                print(self._name + " and " + component._name + ": Part specfications don't match.")
-                return False
-        return True
+            if (self.parameter(parameter_code) != component.parameter(parameter_code)):
+                return self.failed_result(component, parameter_code,
+                                          "Part specfications don't match.")
+        return None
 
     def compare_temperature(self, component):
         """ Compares the temperature range of this component and the given component.
@@ -74,42 +245,123 @@ class Component(metaclass=abc.ABCMeta):
         Parameters:
             - component: The componenet to compare to the current component
 
-        Returns: True if the temperature of the alternative fufills the original range, false otherwise
+        Returns: The invalid result if the temperature of the alternative doesn't fufill the
+                 original range, None otherwise
         """
-        original_temperatures = []
-        alternative_temperatures = []
-        for word in self._parameters[self.TEMPERATURE_SEARCH_CODE].split():
-            if word[-2:] == "°C":
-                word = word[0:-2]
+        original_temperatures = self.numeric(self.TEMPERATURE_SEARCH_CODE)
+        alternative_temperatures = component.numeric(self.TEMPERATURE_SEARCH_CODE)
 
-            if word.isdigit() or word[1:].isdigit():    
-                original_temperatures.append(int(word))
+        if (original_temperatures is None or alternative_temperatures is None or
+            alternative_temperatures[0] > original_temperatures[0] or
+            alternative_temperatures[1] < original_temperatures[1]):
+            return self.failed_result(component, self.TEMPERATURE_SEARCH_CODE,
+                                      "Temperature specfications aren't sufficient.")
+        return None
 
-        for word in component._parameters[self.TEMPERATURE_SEARCH_CODE].split():
-            if word[-2:] == "°C":
-                word = word[0:-2]
+    def compare_rating(self, component, parameter_code, rating):
+        """ Compares a rating of this component and the given component, such as power or voltage.
 
-            if word.isdigit() or word[1:].isdigit():
-                alternative_temperatures.append(int(word))
+        Parameters:
+            - component: The componenet to compare to the current component
+            - parameter_code: The search code of the rating parameter
+            - rating: The name of the rating used when the comparison fails
 
-        if (alternative_temperatures[0] > original_temperatures[0] or
-            alternative_temperatures[1] < original_temperatures[1]):
-            print(self._name + " and " + component._name + ": Temperature specfications aren't sufficient.")
-            return False
-        return True
+        Returns: The invalid result if the rating of the alternative is less than the original
+                 rating, None otherwise
+        """
+        original_rating = self.numeric(parameter_code)
+        alternative_rating = component.numeric(parameter_code)
+
+        if (original_rating is None or alternative_rating is None or
+            alternative_rating < original_rating):
+            return self.failed_result(component, parameter_code,
+                                      rating + " specfications aren't sufficient.")
+        return None
+
+    def compare_ratings(self, component):
+        """ Compares every minimum rating of the component class between this component and the
+            given component.
+
+        Parameters:
+            - component: The componenet to compare to the current component
+
+        Returns: The invalid result of the first rating the alternative doesn't meet, or None if
+                 it meets every rating
+        """
+        for parameter_code, rating in self.MINIMUM_RATINGS.items():
+            result = self.compare_rating(component, parameter_code, rating)
+            if result is not None:
+                return result
+        return None
+
+    def failed_result(self, component, parameter_code, reason):
+        """ Creates the result of an alternative failing on a parameter.
+
+        Parameters:
+            - component: The alternative component
+            - parameter_code: The search code of the failing parameter
+            - reason: The reason the alternative failed
+
+        Returns: The invalid result, holding both components' values of the parameter
+        """
+        return CheckResult("alternative", self._name, VERDICT_INVALID, component._name,
+                           parameter_code, {"original": self.parameter(parameter_code),
+                                            "alternative": component.parameter(parameter_code)},
+                           self._name + " and " + component._name + ": " + reason)
+
+    def alternative_result(self, component):
+        """ Checks if the given component can be substituted as an alternative for this component.
+        It can be used as an alternative if it is the same kind of component with the same
+        functionality, a temperature range covering this component's and at least its ratings.
+
+        Parameters:
+            - component: The component to check with this component
+
+        Returns: The result of the check, giving the first parameter that fails
+        """
+        if type(self) is not type(component):
+            return CheckResult("alternative", self._name, VERDICT_INVALID, component._name,
+                               values={"original": type(self).__name__,
+                                       "alternative": type(component).__name__},
+                               message=(self._name + " and " + component._name +
+                                        ": Component types don't match."))
+        if not self.ALTERNATIVES_VERIFIABLE:
+            return CheckResult("alternative", self._name, VERDICT_UNVERIFIABLE, component._name,
+                               message=("Can't compare parts " + self._name + " and " +
+                                        component._name + "."))
+
+        result = self.compare_functionality(component, self.FUNCTIONALITY_SEARCH_CODES)
+        if result is None:
+            result = self.compare_temperature(component)
+        if result is None:
+            result = self.compare_ratings(component)
+        if result is None:
+            result = CheckResult("alternative", self._name, VERDICT_VALID, component._name)
+        return result
 
-    @abc.abstractmethod
     def is_alternative(self, component):
         """ Determines if the given component can be substituted as an alternative
         for this component
+
+        Parameters:
+            - component: The component to check with this component
+
+        Returns: True if it is a valid alternative, false otherwise
         """
-        
+        return self.alternative_result(component).verdict == VERDICT_VALID
+
 
 class Resistor(Component):
     # Search code for power and resistance values
     POWER_SEARCH_CODE = 2
     RESISTANCE_SEARCH_CODE = 2085
-    
+    PARAMETER_SEARCH_CODES = (POWER_SEARCH_CODE, RESISTANCE_SEARCH_CODE)
+    NUMERIC_PARSERS = {POWER_SEARCH_CODE: parse_quantity,
+                       RESISTANCE_SEARCH_CODE: parse_quantity}
+    FUNCTIONALITY_SEARCH_CODES = (RESISTANCE_SEARCH_CODE, Component.PACKAGE_SEARCH_CODE)
+    MINIMUM_RATINGS = {POWER_SEARCH_CODE: "Power"}
+    __slots__ = ()
+
     """ Resistor model class, inherits from generic component class
     
     Parameters:
@@ -117,43 +369,19 @@ class Resistor(Component):
     """
     def __init__(self, part_name):
         Component.__init__(self, part_name)
-        self._parameters[self.POWER_SEARCH_CODE] = None
-        self._parameters[self.RESISTANCE_SEARCH_CODE] = None
-
-    def is_alternative(self, component):
-        """ Determines if the given component can be used as an alternative for this resistor.
-        It can be used as an alternative if all parameters are the same except the part name. 
-        
-        Parameters:
-            - component: The component to check with this resistor
-
-        Returns: True if it is a valid alternative, false otherwise
-        """
-        if len(self._parameters) != len(component._parameters):
-            return False
-
-        functionality_parameters = [self.RESISTANCE_SEARCH_CODE, self.PACKAGE_SEARCH_CODE]
-        status = self.compare_functionality(component, functionality_parameters)
-        if not status:
-            return False
-
-        status = self.compare_temperature(component)
-        if not status:
-            return False
-
-        # Compares power rating
-        if (float(component._parameters[self.POWER_SEARCH_CODE][0:5]) <
-            float(self._parameters[self.POWER_SEARCH_CODE][0:5])):
-                print(self._name + " and " + component._name + ": Power specfications aren't sufficient.")
-                return False
-        return True
 
 
 class Capacitor(Component):
     # Indexes to access data fields within search results array
     VOLTAGE_SEARCH_CODE = 14
     CAPACITANCE_SEARCH_CODE = 2049
-    
+    PARAMETER_SEARCH_CODES = (VOLTAGE_SEARCH_CODE, CAPACITANCE_SEARCH_CODE)
+    NUMERIC_PARSERS = {VOLTAGE_SEARCH_CODE: parse_quantity,
+                       CAPACITANCE_SEARCH_CODE: parse_quantity}
+    FUNCTIONALITY_SEARCH_CODES = (CAPACITANCE_SEARCH_CODE, Component.PACKAGE_SEARCH_CODE)
+    MINIMUM_RATINGS = {VOLTAGE_SEARCH_CODE: "Voltage"}
+    __slots__ = ()
+
     """ Capacitor model class, inherits from generic component class
     
     Parameters:
@@ -161,36 +389,6 @@ class Capacitor(Component):
     """
     def __init__(self, part_name):
         Component.__init__(self, part_name)
-        self._parameters[self.VOLTAGE_SEARCH_CODE] = None
-        self._parameters[self.CAPACITANCE_SEARCH_CODE] = None
-
-    def is_alternative(self, component):
-        """ Determines if the given component can be used as an alternative for this capacitor.
-        It can be used as a alternative if all parameters are the same except the part name. 
-            
-        Parameters:
-            - component: The component to check with this capacitor
-
-        Returns: True if it is a valid alternative, false otherwise
-        """
-        if len(self._parameters) != len(component._parameters):
-            return False
-
-        functionality_parameters = [self.CAPACITANCE_SEARCH_CODE, self.PACKAGE_SEARCH_CODE]
-        status = self.compare_functionality(component, functionality_parameters)
-        if not status:
-            return False
-
-        status = self.compare_temperature(component)
-        if not status:
-            return False
-
-        # Compares voltage rating
-        if (int(component._parameters[self.VOLTAGE_SEARCH_CODE][0:-1]) <
-            int(self._parameters[self.VOLTAGE_SEARCH_CODE][0:-1])):
-                print(self._name + " and " + component._name + ": Voltage specfications aren't sufficient.")
-                return False
-        return True
     
 
 class Inductor(Component):
@@ -198,6 +396,13 @@ class Inductor(Component):
     SATURATION_SEARCH_CODE = 1219
     INDUCTANCE_SEARCH_CODE = 2087
     CURRENT_SEARCH_CODE = 2088
+    PARAMETER_SEARCH_CODES = (SATURATION_SEARCH_CODE, INDUCTANCE_SEARCH_CODE, CURRENT_SEARCH_CODE)
+    NUMERIC_PARSERS = {SATURATION_SEARCH_CODE: parse_quantity,
+                       INDUCTANCE_SEARCH_CODE: parse_quantity, CURRENT_SEARCH_CODE: parse_quantity}
+    FUNCTIONALITY_SEARCH_CODES = (INDUCTANCE_SEARCH_CODE, SATURATION_SEARCH_CODE,
+                                  Component.PACKAGE_SEARCH_CODE)
+    MINIMUM_RATINGS = {CURRENT_SEARCH_CODE: "Current"}
+    __slots__ = ()
 
     """ Inductor model class, inherits from generic component class
     
@@ -206,55 +411,17 @@ class Inductor(Component):
     """
     def __init__(self, part_name):
         Component.__init__(self, part_name)
-        self._parameters[self.SATURATION_SEARCH_CODE] = None
-        self._parameters[self.INDUCTANCE_SEARCH_CODE] = None
-        self._parameters[self.CURRENT_SEARCH_CODE] = None
-
-    def is_alternative(self, component):
-        """ Determines if the given component can be used as an alternative for this inductor.
-        It can be used as a alternative if all parameters are the same except the part name. 
-            
-        Parameters
-            - component: The component to check with this inductor
-
-        Returns: True if it is a valid alternative, false otherwise
-        """
-        if len(self._parameters) != len(component._parameters):
-            return False
-
-        functionality_parameters = [self.INDUCTANCE_SEARCH_CODE, self.SATURATION_SEARCH_CODE, self.PACKAGE_SEARCH_CODE]
-        status = self.compare_functionality(component, functionality_parameters)
-        if not status:
-            return False
-
-        status = self.compare_temperature(component)
-        if not status:
-            return False
-
-        # Compares current rating
-        original_current = 0
-        words = self._parameters[self.CURRENT_SEARCH_CODE].split()
-        original_current = words[0]
-        if (words[1] == 'A'):
-            original_current = original_current * 1000
-
-        alternate_current = 0
-        words = component._parameters[self.CURRENT_SEARCH_CODE].split()
-        alternate_current = words[0]
-        if (words[1] == 'A'):
-            alternate_current = alternate_current * 1000
-
-        if (alternate_current < original_current):
-            print(self._name + " and " + component._name + ": Current specfications aren't sufficient.")
-            return False
-            
-        return True
 
 
 class Ferrite(Component):
     # Indexes to access data fields within search results array
     FILTER_SEARCH_CODE = 21
     RATING_SEARCH_CODE = 1923
+    PARAMETER_SEARCH_CODES = (FILTER_SEARCH_CODE, RATING_SEARCH_CODE)
+    NUMERIC_PARSERS = {RATING_SEARCH_CODE: parse_quantity}
+    FUNCTIONALITY_SEARCH_CODES = (FILTER_SEARCH_CODE, Component.PACKAGE_SEARCH_CODE)
+    MINIMUM_RATINGS = {RATING_SEARCH_CODE: "Current"}
+    __slots__ = ()
 
     """ Ferrite model class, inherits from generic component class
     
@@ -263,42 +430,14 @@ class Ferrite(Component):
     """
     def __init__(self, part_name):
         Component.__init__(self, part_name)
-        self._parameters[self.FILTER_SEARCH_CODE] = None
-        self._parameters[self.RATING_SEARCH_CODE] = None
-
-    def is_alternative(self, component):
-        """ Determines if the given component can be used as an alternative for this ferrite.
-        It can be used as a alternative if all parameters are the same except the part name. 
-            
-        Parameters
-            - component: The component to check with this ferrite
-
-        Returns: True if it is a valid alternative, false otherwise
-        """
-        if len(self._parameters) != len(component._parameters):
-            return False
-
-        functionality_parameters = [self.FILTER_SEARCH_CODE, self.PACKAGE_SEARCH_CODE]
-        status = self.compare_functionality(component, functionality_parameters)
-        if not status:
-            return False
-
-        status = self.compare_temperature(component)
-        if not status:
-            return False
-
-        # Compares current rating
-        original_rating = float(''.join(n for n in self._parameters[self.RATING_SEARCH_CODE] if n.isdigit()))
-        alternate_rating = float(''.join(n for n in component._parameters[self.RATING_SEARCH_CODE] if n.isdigit()))
-
-        if alternate_rating < original_rating:
-            print(self._name + " and " + component._name + ": Current specfications aren't sufficient.")
-            return False
-        return True
 
 class Choke(Component):
     # Indexes to access data fields within search results array
     RATING_SEARCH_CODE = 1923
+    PARAMETER_SEARCH_CODES = (RATING_SEARCH_CODE,)
+    NUMERIC_PARSERS = {RATING_SEARCH_CODE: parse_quantity}
+    MINIMUM_RATINGS = {RATING_SEARCH_CODE: "Current"}
+    __slots__ = ()
 
     """ Choke model class, inherits from generic component class
     
@@ -307,32 +446,6 @@ class Choke(Component):
     """
     def __init__(self, part_name):
         Component.__init__(self, part_name)
-        self._parameters[self.RATING_SEARCH_CODE] = None
-
-    def is_alternative(self, component):
-        """ Determines if the given component can be used as an alternative for this ferrite.
-        It can be used as a alternative if all parameters are the same except the part name. 
-            
-        Parameters
-            - component: The component to check with this ferrite
-
-        Returns: True if it is a valid alternative, false otherwise
-        """
-        if len(self._parameters) != len(component._parameters):
-            return False
-
-        status = self.compare_temperature(component)
-        if not status:
-            return False
-
-        # Compares current rating
-        original_rating = float(''.join(n for n in self._parameters[self.RATING_SEARCH_CODE] if n.isdigit()))
-        alternate_rating = float(''.join(n for n in component._parameters[self.RATING_SEARCH_CODE] if n.isdigit()))
-
-        if alternate_rating < original_rating:
-            print(self._name + " and " + component._name + ": Current specfications aren't sufficient.")
-            return False
-        return True
 
 class Diode(Component):
     # Indexes to access data fields within search results array
@@ -341,6 +454,14 @@ class Diode(Component):
     CURRENT_SEARCH_CODE = 914
     VOLTAGE_REVERSE_SEARCH_CODE = 2071
     VOLTAGE_FORWARD_SEARCH_CODE = 2261
+    PARAMETER_SEARCH_CODES = (TYPE_SEARCH_CODE, CURRENT_SEARCH_CODE, VOLTAGE_REVERSE_SEARCH_CODE,
+                              VOLTAGE_FORWARD_SEARCH_CODE)
+    NUMERIC_PARSERS = {CURRENT_SEARCH_CODE: parse_quantity,
+                       VOLTAGE_REVERSE_SEARCH_CODE: parse_quantity}
+    FUNCTIONALITY_SEARCH_CODES = (TYPE_SEARCH_CODE, CURRENT_SEARCH_CODE, VOLTAGE_FORWARD_SEARCH_CODE,
+                                  Component.PACKAGE_SEARCH_CODE)
+    MINIMUM_RATINGS = {VOLTAGE_REVERSE_SEARCH_CODE: "Reverse voltage"}
+    __slots__ = ()
 
     """ Diode model class, inherits from generic component class
     
@@ -349,52 +470,11 @@ class Diode(Component):
     """
     def __init__(self, part_name):
         Component.__init__(self, part_name)
-        self._parameters[self.TYPE_SEARCH_CODE] = None
-        self._parameters[self.CURRENT_SEARCH_CODE] = None
-        self._parameters[self.VOLTAGE_REVERSE_SEARCH_CODE] = None
-        self._parameters[self.VOLTAGE_FORWARD_SEARCH_CODE] = None
-
-    def is_alternative(self, component):
-        """ Determines if the given component can be used as an alternative for this diode.
-        It can be used as an alternative if all parameters are the same except the part name. 
-        
-        Parameters:
-            - component: The component to check with this resistor
-
-        Returns: True if it is a valid alternative, false otherwise
-        """
-        if len(self._parameters) != len(component._parameters):
-            return False
-
-        functionality_parameters = [self.TYPE_SEARCH_CODE, self.CURRENT_SEARCH_CODE,
-                                    self.VOLTAGE_FORWARD_SEARCH_CODE, self.PACKAGE_SEARCH_CODE]
-        status = self.compare_functionality(component, functionality_parameters)
-        if not status:
-            return False
-
-        status = self.compare_temperature(component)
-        if not status:
-            return False
-
-        # Compares max reverse voltage
-        words = self._parameters[self.VOLTAGE_REVERSE_SEARCH_CODE].split()     
-        original_voltage = words[0]
-        if (words[1] == 'V'):
-            original_current = original_voltage * 1000
-
-        alternate_voltage = 0
-        words = component._parameters[self.VOLTAGE_REVERSE_SEARCH_CODE].split()
-        alternate_voltage = words[0]
-        if (words[1] == 'V'):
-            alternate_voltage = alternate_voltage * 1000
-
-        if (alternate_voltage < original_current):
-            print(self._name + " and " + component._name + ": Reverse voltage specfications aren't sufficient.")
-            return False
-
-        return True
 
 class IC(Component):
+    ALTERNATIVES_VERIFIABLE = False
+    __slots__ = ()
+
     """ IC model class, inherits from generic component class
     
     Parameters:
@@ -402,14 +482,3 @@ class IC(Component):
     """
     def __init__(self, part_name):
         Component.__init__(self, part_name)
-
-    def is_alternative(self, component):
-        """ Determines if the given component can be used as an alternative for this diode.
-        It can be used as an alternative if all parameters are the same except the part name. 
-        
-        Parameters:
-            - component: The component to check with this resistor
-
-        Returns: True if it is a valid alternative, false otherwise
-        """
-        return False
@@ -1,2 +1,16 @@
 from component_manager.test.test_components import *
-from component_manager.test.test_converter import *
\ No newline at end of file
+from component_manager.test.test_converter import *
+from component_manager.test.test_cache import *
+from component_manager.test.test_backend import *
+from component_manager.test.test_store import *
+from component_manager.test.test_units import *
+from component_manager.test.test_validator import *
+from component_manager.test.test_scheduler import *
+from component_manager.test.test_costing import *
+from component_manager.test.test_index import *
+from component_manager.test.test_benchmark import *
+from component_manager.test.test_stats import *
+from component_manager.test.test_server import *
+from component_manager.test.test_catalogue import *
+from component_manager.test.test_report import *
+from component_manager.test.test_async import *
\ No newline at end of file
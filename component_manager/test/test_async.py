@@ -0,0 +1,166 @@
+#-*- coding: utf-8 -*-
+
+import unittest
+import os
+import asyncio
+from component_manager.src import *
+from component_manager.src.component_async import *
+from component_manager.benchmark.benchmark_async import *
+
+class CountingBackend(AsyncLookupBackend):
+    """ Backend taking the given number of seconds per search and recording the most searches in
+        flight at once and the searches cancelled.
+    """
+    def __init__(self, latency):
+        self._latency = latency
+        self._in_flight = 0
+        self._most_in_flight = 0
+        self._cancelled = 0
+
+    async def part_search_async(self, part_name, facets=FACETS):
+        self._in_flight += 1
+        self._most_in_flight = max(self._most_in_flight, self._in_flight)
+        try:
+            await asyncio.sleep(self._latency)
+        except asyncio.CancelledError:
+            self._cancelled += 1
+            raise
+        finally:
+            self._in_flight -= 1
+        return self.empty_record()
+
+
+class AsyncTesting(unittest.TestCase):
+    PATH_TO_TESTS = os.getcwd() + "/component_manager/test"
+    FIXTURES = PATH_TO_TESTS + "/fixtures.json"
+
+    def test_fake_digikey_search(self):
+        """ Tests that searching the fake Digikey API from an event loop creates the same
+            components as the fake backend, reusing one connection per search in flight.
+        """
+        expected_converter = ComponentConverter(backend=FakeBackend(self.FIXTURES))
+        expected_converter.read_csv_file(self.PATH_TO_TESTS + "/toplevel_test.csv")
+        expected_converter.create_component_list()
+
+        server = FakeDigikeyServer(FakeBackend(self.FIXTURES), latency=0.001)
+        server.start()
+        async def convert():
+            backend = AsyncDigikeyBackend(server.url())
+            converter = AsyncComponentConverter(backend=backend, concurrency=4)
+            await converter.read_csv_file_async(self.PATH_TO_TESTS + "/toplevel_test.csv")
+            try:
+                await converter.create_component_list_async()
+            finally:
+                await backend.close()
+            return converter, backend
+        try:
+            with stored_token():
+                converter, backend = asyncio.run(convert())
+        finally:
+            server.stop()
+
+        self.assertEqual(len(converter._components), len(expected_converter._components))
+        for component, expected_component in zip(converter._components,
+                                                 expected_converter._components):
+            if isinstance(expected_component, str):
+                self.assertEqual(component, expected_component)
+                continue
+            self.assertEqual(component._parameters, expected_component._parameters)
+            self.assertEqual(component._price, expected_component._price)
+            self.assertEqual(component._lead_time, expected_component._lead_time)
+        self.assertEqual(server._searches, len(set(component_data[CSV_PART_NUMBER_INDEX] for
+                                                   component_data in converter._data)))
+        self.assertLessEqual(server._connections, 4)
+        self.assertEqual(backend.requests_remaining(), 1000)
+
+    def test_digikey_timeout(self):
+        """ Tests that a Digikey search taking longer than the timeout is cancelled at once,
+            closing its connection rather than leaving the search running.
+        """
+        server = FakeDigikeyServer(FakeBackend(self.FIXTURES), latency=1)
+        server.start()
+        async def search():
+            backend = AsyncDigikeyBackend(server.url())
+            converter = AsyncComponentConverter(backend=backend, timeout=0.05)
+            start = asyncio.get_running_loop().time()
+            try:
+                with self.assertRaises(BackendError):
+                    await converter.record_search_async("CRCW080510K0FKEA")
+            finally:
+                await backend.close()
+            return asyncio.get_running_loop().time() - start, backend
+        try:
+            with stored_token():
+                elapsed, backend = asyncio.run(search())
+        finally:
+            server.stop()
+
+        self.assertLess(elapsed, 0.5)
+        self.assertEqual(backend._transport._idle, [])
+
+    def test_concurrency_bound(self):
+        """ Tests that no more searches than the concurrency are in flight at once.
+        """
+        backend = CountingBackend(0.01)
+        converter = AsyncComponentConverter(backend=backend, concurrency=3)
+        asyncio.run(converter.search_parts_async(["PART" + str(i) for i in range(20)]))
+        self.assertEqual(backend._most_in_flight, 3)
+
+    def test_timeout(self):
+        """ Tests that a search taking longer than the timeout fails and is cancelled.
+        """
+        backend = CountingBackend(1)
+        converter = AsyncComponentConverter(backend=backend, timeout=0.01)
+        with self.assertRaises(BackendError):
+            asyncio.run(converter.record_search_async("PART"))
+        self.assertEqual(backend._cancelled, 1)
+        self.assertEqual(converter._searches, {})
+
+    def test_cancellation(self):
+        """ Tests that cancelling a conversion cancels the searches in flight.
+        """
+        backend = CountingBackend(1)
+        converter = AsyncComponentConverter(backend=backend, concurrency=4)
+        converter._data = [["Resistor, 10k", "PART" + str(i)] for i in range(10)]
+        async def cancel_conversion():
+            conversion = asyncio.ensure_future(converter.create_component_list_async())
+            await asyncio.sleep(0.05)
+            conversion.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await conversion
+        asyncio.run(cancel_conversion())
+        self.assertEqual(backend._cancelled, 4)
+        self.assertEqual(backend._in_flight, 0)
+        self.assertEqual(converter._components, [])
+
+    def test_fake_latency(self):
+        """ Tests that the asyncio fake backend searches concurrently without blocking the loop.
+        """
+        backend = AsyncFakeBackend(self.FIXTURES, latency=0.05)
+        converter = AsyncComponentConverter(backend=backend)
+        async def search():
+            start = asyncio.get_running_loop().time()
+            await converter.search_parts_async(["CRCW080510K0FKEA", "CL05A104KA5NNNC",
+                                                "MISSING"] * 2)
+            return asyncio.get_running_loop().time() - start
+        self.assertLess(asyncio.run(search()), 0.1)
+        self.assertEqual(backend._fake._search_count, 3)
+        self.assertFalse(converter._searches["MISSING"].result()["found"])
+
+    def test_blocking_methods(self):
+        """ Tests that the converter's blocking methods still search outside an event loop.
+        """
+        converter = AsyncComponentConverter(backend=AsyncFakeBackend(self.FIXTURES),
+                                            facets=(FACET_PARAMETERS,))
+        converter.read_csv_file(self.PATH_TO_TESTS + "/toplevel_test.csv")
+        converter.create_component_list()
+        self.assertGreater(converter.complete_components(FACETS), 0)
+
+        expected_converter = ComponentConverter(backend=FakeBackend(self.FIXTURES))
+        expected_converter.read_csv_file(self.PATH_TO_TESTS + "/toplevel_test.csv")
+        expected_converter.create_component_list()
+        self.assertEqual(converter._components, expected_converter._components)
+
+
+if __name__ == '__main__':
+    unittest.main()
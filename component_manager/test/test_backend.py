@@ -0,0 +1,132 @@
+#-*- coding: utf-8 -*-
+
+import unittest
+import os
+import time
+import json
+import tempfile
+import threading
+import http.server
+from unittest.mock import patch
+from component_manager.src import *
+
+class StandInSearchHandler(http.server.BaseHTTPRequestHandler):
+    """ Stand in for the Digikey keyword search, answering every search with one resistor and
+        counting the connections made to it.
+    """
+    protocol_version = "HTTP/1.1"
+    connections = 0
+
+    def setup(self):
+        super().setup()
+        StandInSearchHandler.connections += 1
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        body = json.dumps({"Products": [{
+            "Parameters": [{"ParameterId": Resistor.RESISTANCE_SEARCH_CODE, "Value": "10 kOhms"}],
+            "StandardPricing": [{"BreakQuantity": 1, "UnitPrice": 0.1, "TotalPrice": 0.1},
+                                {"BreakQuantity": 100, "UnitPrice": 0.02, "TotalPrice": 2}],
+            "QuantityAvailable": 10, "ManufacturerLeadWeeks": "12"}]}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("X-RateLimit-Limit", "1000")
+        self.send_header("X-RateLimit-Remaining", "990")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class BackendTesting(unittest.TestCase):
+    FIXTURES = os.getcwd() + "/component_manager/test/fixtures.json"
+
+    def test_fake_search(self):
+        """ Tests that the fake backend answers searches from its recorded results.
+        """
+        test_backend = FakeBackend(self.FIXTURES)
+        record = test_backend.part_search("CL05A104KA5NNNC")
+        self.assertTrue(record["found"])
+        self.assertEqual(record["parameters"][Capacitor.CAPACITANCE_SEARCH_CODE], "0.1 µF")
+        self.assertFalse(test_backend.part_search("STE1206M1W0R016F")["found"])
+        self.assertFalse(test_backend.part_search("NOT-A-PART")["found"])
+        self.assertEqual(test_backend._search_count, 3)
+
+    def test_fake_latency(self):
+        """ Tests that the fake backend delays searches by its configured latency.
+        """
+        test_backend = FakeBackend(self.FIXTURES, latency=0.02)
+        start = time.perf_counter()
+        test_backend.part_search("CL05A104KA5NNNC")
+        self.assertGreaterEqual(time.perf_counter() - start, 0.02)
+
+    def test_fake_error_rate(self):
+        """ Tests that the fake backend fails searches at its configured error rate.
+        """
+        test_backend = FakeBackend(self.FIXTURES, error_rate=1)
+        with self.assertRaises(BackendError):
+            test_backend.part_search("CL05A104KA5NNNC")
+
+        test_backend = FakeBackend(self.FIXTURES, error_rate=0.5, seed=1)
+        failures = 0
+        for i in range(200):
+            try:
+                test_backend.part_search("CL05A104KA5NNNC")
+            except BackendError:
+                failures += 1
+        self.assertTrue(50 < failures < 150)
+
+    def test_fake_component_search(self):
+        """ Tests searching a component through the fake backend.
+        """
+        test_converter = ComponentConverter(backend=FakeBackend(self.FIXTURES))
+        test_resistor = Resistor("CRCW080510K0FKEA")
+        self.assertTrue(test_converter.component_search(test_resistor))
+        self.assertEqual(test_resistor._parameters[test_resistor.RESISTANCE_SEARCH_CODE], "10 kOhms")
+        self.assertFalse(test_converter.component_search(Resistor("STE1206M1W0R016F")))
+
+    def test_digikey_session_reuse(self):
+        """ Tests that Digikey searches reuse one connection and read the access token once, timing
+            the token read as a phase.
+        """
+        import digikey.oauth.oauth2
+
+        server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), StandInSearchHandler)
+        server.daemon_threads = True
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        StandInSearchHandler.connections = 0
+        RUN_STATS.reset()
+        try:
+            with tempfile.TemporaryDirectory() as directory:
+                with open(os.path.join(directory, "token_storage.json"), "w") as token_file:
+                    json.dump({"access_token": "token", "refresh_token": "refresh",
+                               "expires": time.time() + 3600, "token_type": "Bearer"},
+                              token_file)
+                environment = {"DIGIKEY_CLIENT_ID": "id", "DIGIKEY_CLIENT_SECRET": "secret",
+                               "DIGIKEY_STORAGE_PATH": directory}
+                with patch.dict(os.environ, environment), \
+                     patch.object(digikey.oauth.oauth2.TokenHandler, "get_access_token",
+                                  autospec=True,
+                                  side_effect=digikey.oauth.oauth2.TokenHandler.get_access_token
+                                  ) as get_access_token:
+                    test_backend = DigikeyBackend("http://127.0.0.1:" +
+                                                  str(server.server_address[1]))
+                    records = [test_backend.part_search("CRCW080510K0FKEA") for i in range(5)]
+        finally:
+            server.shutdown()
+            server.server_close()
+            thread.join()
+
+        self.assertEqual(get_access_token.call_count, 1)
+        self.assertEqual(RUN_STATS.report()["phases"]["token_refresh"]["calls"], 1)
+        self.assertEqual(StandInSearchHandler.connections, 1)
+        self.assertEqual(records[0]["parameters"][Resistor.RESISTANCE_SEARCH_CODE], "10 kOhms")
+        self.assertEqual(records[0]["price_breaks"], [[1, 0.1], [100, 0.02]])
+        self.assertEqual(test_backend.requests_remaining(), 990)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+#-*- coding: utf-8 -*-
+
+import unittest
+import tempfile
+from component_manager.src import *
+from component_manager.benchmark.benchmark_suite import *
+from component_manager.benchmark import benchmark_startup
+from component_manager.benchmark import benchmark_async
+from component_manager.benchmark import benchmark_memory
+
+class BenchmarkTesting(unittest.TestCase):
+    def test_generate_bom(self):
+        """ Tests that synthetic BoMs pair each original row with an alternative row.
+        """
+        data, records = generate_bom(1000, seed=1)
+        self.assertEqual(len(data), 1000)
+        self.assertTrue(all(component_data[0] == "Alternative" for component_data in data[1::2]))
+        self.assertFalse(any(component_data[0] == "Alternative" for component_data in data[::2]))
+        self.assertTrue(any(component_data[0].startswith("IC") for component_data in data))
+        for component_data in data:
+            self.assertEqual(component_data[1] in records, not component_data[1].startswith("IC"))
+        self.assertEqual(generate_bom(1000, seed=1), (data, records))
+
+    def test_run_size(self):
+        """ Tests that every stage is timed on a small BoM.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            results = run_size(40, directory, workers=2)
+        self.assertEqual(sorted(results), sorted(STAGES))
+        self.assertTrue(all(seconds >= 0 for seconds in results.values()))
+
+        previous = {"sizes": {"40": dict(results, check_bom_cost=0)}}
+        lines = compare(previous, {"sizes": {"40": results}})
+        self.assertEqual(len(lines), len(STAGES))
+        self.assertTrue(lines[0].startswith("40 rows read_csv_file: "))
+
+    def test_async_benchmark(self):
+        """ Tests that threaded and asyncio searches are both timed against the fake search API.
+        """
+        results = benchmark_async.run_benchmark(rows=40, latency=0, concurrencies=(2,))
+        self.assertEqual(sorted(results["concurrency"]["2"]), ["asyncio", "threads"])
+        self.assertTrue(all(timing["searches_per_second"] > 0 for timing in
+                            results["concurrency"]["2"].values()))
+
+    def test_component_memory(self):
+        """ Tests that slotted components use less memory than the dictionary layout, holding no
+            containers for numeric values or price breaks they don't have.
+        """
+        self.assertLess(benchmark_memory.measure(Resistor, 1000),
+                        benchmark_memory.measure(benchmark_memory.DictResistor, 1000))
+        test_resistor = Resistor("RC0402FR-07715KL")
+        self.assertIsNone(test_resistor._numeric)
+        self.assertIsNone(test_resistor._price_breaks)
+        self.assertIs(test_resistor._facets, NO_FACETS)
+
+    def test_snapshot_startup(self):
+        """ Tests that pricing a snapshot loads neither the Digikey client nor NumPy.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            snapshot_filename = benchmark_startup.create_snapshot(directory)
+            self.assertEqual(benchmark_startup.loaded_modules(snapshot_filename), [])
+
+    def test_package_imports(self):
+        """ Tests that importing the package leaves the server, client and asyncio modules
+            unloaded.
+        """
+        modules = ("http.server", "urllib.request", "asyncio", "ssl")
+        elapsed, output = benchmark_startup.run_python([
+            "-c", "import sys, component_manager.src\n"
+                  "print([module for module in " + repr(modules) + " if module in sys.modules])"])
+        self.assertEqual(output.strip(), "[]")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+#-*- coding: utf-8 -*-
+
+import unittest
+from unittest.mock import patch
+import os
+import tempfile
+from component_manager.src import *
+
+class CacheTesting(unittest.TestCase):
+    RECORD = {"found": True, "parameters": {2: "0.125W, 1/8W", 2085: "10 kOhms",
+                                            16: "0805 (2012 Metric)"},
+              "price": [0.1, 2.3], "price_breaks": [[1, 0.1], [10, 0.05], [100, 0.023]],
+              "lead_time": "20 week(s)"}
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self._filename = os.path.join(self._directory.name, "cache.db")
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def test_read_write(self):
+        """ Tests that a written search result is read back unchanged.
+        """
+        test_cache = ComponentCache(self._filename)
+        self.assertIsNone(test_cache.read("CRCW080510K0FKEA"))
+        test_cache.write("CRCW080510K0FKEA", self.RECORD)
+        test_cache.close()
+
+        test_cache = ComponentCache(self._filename)
+        self.assertEqual(test_cache.read("CRCW080510K0FKEA"), self.RECORD)
+        self.assertEqual(test_cache._hits, 1)
+        self.assertEqual(test_cache._misses, 0)
+
+    def test_expiry(self):
+        """ Tests that price and parametric data expire separately.
+        """
+        test_cache = ComponentCache(self._filename, price_ttl=0)
+        test_cache.write("CRCW080510K0FKEA", self.RECORD)
+        record = test_cache.read("CRCW080510K0FKEA")
+        self.assertEqual(record["facets"], [FACET_PARAMETERS])
+        self.assertEqual(record["parameters"], self.RECORD["parameters"])
+        self.assertEqual(record["price"], [0, 0])
+        self.assertEqual(test_cache._misses, 1)
+        test_cache.read("CRCW080510K0FKEA", [FACET_PARAMETERS])
+        self.assertEqual(test_cache._hits, 1)
+
+        test_cache = ComponentCache(self._filename, parameter_ttl=0)
+        record = test_cache.read("CRCW080510K0FKEA")
+        self.assertEqual(record["facets"], [FACET_LEAD_TIME, FACET_PRICING])
+        self.assertEqual(record["parameters"], {})
+        self.assertEqual(test_cache._misses, 1)
+
+        test_cache = ComponentCache(self._filename, price_ttl=0, parameter_ttl=0)
+        self.assertIsNone(test_cache.read("CRCW080510K0FKEA"))
+
+    def test_facet_write(self):
+        """ Tests that writing some facets of a search result keeps the cached data of the others.
+        """
+        test_cache = ComponentCache(self._filename)
+        test_cache.write("CRCW080510K0FKEA", facet_record(self.RECORD, [FACET_PRICING]))
+        record = test_cache.read("CRCW080510K0FKEA")
+        self.assertEqual(record["facets"], [FACET_PRICING])
+        self.assertEqual(record["price_breaks"], self.RECORD["price_breaks"])
+
+        test_cache.write("CRCW080510K0FKEA", facet_record(self.RECORD,
+                                                          [FACET_PARAMETERS, FACET_LEAD_TIME]))
+        self.assertEqual(test_cache.read("CRCW080510K0FKEA"), self.RECORD)
+
+    def test_component_search(self):
+        """ Tests that component searches are answered by the cache once a part is stored.
+        """
+        test_cache = ComponentCache(self._filename)
+        with patch.object(ComponentConverter, 'part_search', return_value=self.RECORD) as search:
+            resistor_one = Resistor("CRCW080510K0FKEA")
+            resistor_two = Resistor("CRCW080510K0FKEA")
+            self.assertTrue(ComponentConverter(test_cache).component_search(resistor_one))
+            self.assertTrue(ComponentConverter(test_cache).component_search(resistor_two))
+            self.assertEqual(search.call_count, 1)
+
+        self.assertEqual(resistor_two._parameters[resistor_two.RESISTANCE_SEARCH_CODE], "10 kOhms")
+        self.assertEqual(resistor_two._price, [0.1, 2.3])
+        self.assertEqual(resistor_two._lead_time, "20 week(s)")
+        self.assertEqual((test_cache._hits, test_cache._misses), (1, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+#-*- coding: utf-8 -*-
+
+import unittest
+import os
+import csv
+import json
+import tempfile
+from component_manager.src import *
+
+class CatalogueTesting(unittest.TestCase):
+    PATH_TO_TESTS = os.getcwd() + "/component_manager/test"
+    FIXTURES = PATH_TO_TESTS + "/fixtures.json"
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        with open(self.FIXTURES, "r") as fixture_file:
+            self._records = {part_name: record for part_name, record in
+                             json.load(fixture_file).items() if record["found"]}
+
+        # Exports the recorded parts, categorised by whether they have a resistance
+        codes = sorted(set(int(code) for record in self._records.values()
+                           for code in record["parameters"]))
+        self._export = os.path.join(self._directory.name, "export.csv")
+        with open(self._export, "w", newline="") as export_file:
+            writer = csv.writer(export_file)
+            writer.writerow(["part_number", "category"] + [str(code) for code in codes] +
+                            ["price_breaks", "lead_time"])
+            for part_name, record in self._records.items():
+                category = ("Resistors" if str(Resistor.RESISTANCE_SEARCH_CODE) in
+                            record["parameters"] else "Other")
+                writer.writerow([part_name, category] +
+                                [record["parameters"].get(str(code), "") for code in codes] +
+                                [json.dumps(record.get("price_breaks", [])),
+                                 record["lead_time"] or ""])
+
+        self._catalogue_filename = os.path.join(self._directory.name, "catalogue")
+        self._part_count = import_catalogue(self._export, self._catalogue_filename)
+        self._catalogue = ComponentCatalogue(self._catalogue_filename)
+
+    def tearDown(self):
+        self._catalogue.close()
+        self._directory.cleanup()
+
+    def test_catalogue_records(self):
+        """ Tests that the catalogue answers with the parameters, price breaks and lead time of
+            each exported part, and nothing for parts it doesn't hold.
+        """
+        self.assertEqual(self._part_count, len(self._records))
+        self.assertEqual(len(self._catalogue), len(self._records))
+        for part_name, record in self._records.items():
+            catalogue_record = self._catalogue.record(part_name)
+            self.assertTrue(catalogue_record["found"])
+            self.assertEqual(catalogue_record["parameters"],
+                             {int(code): value for code, value in record["parameters"].items()})
+            self.assertEqual(catalogue_record["price_breaks"], record.get("price_breaks", []))
+            self.assertEqual(catalogue_record["lead_time"], record["lead_time"])
+        self.assertIsNone(self._catalogue.record("NOT-A-PART"))
+
+    def test_catalogue_backend(self):
+        """ Tests that the catalogue backend only searches its backend for missing parts.
+        """
+        test_backend = FakeBackend(self.FIXTURES)
+        catalogue_backend = CatalogueBackend(self._catalogue, test_backend)
+        test_converter = ComponentConverter(backend=catalogue_backend)
+        test_converter.read_csv_file(self.PATH_TO_TESTS + "/toplevel_test.csv")
+        test_converter.create_component_list()
+
+        searched = set(component_data[CSV_PART_NUMBER_INDEX] for component_data in
+                       test_converter._data) - set(self._records)
+        self.assertEqual(test_backend._search_count, len(searched))
+
+        fixture_converter = ComponentConverter(backend=FakeBackend(self.FIXTURES))
+        fixture_converter.read_csv_file(self.PATH_TO_TESTS + "/toplevel_test.csv")
+        fixture_converter.create_component_list()
+        self.assertEqual(test_converter._components, fixture_converter._components)
+
+    def test_catalogue_uncached(self):
+        """ Tests that only parts searched for are written to the lookup cache, not parts
+            answered by the catalogue.
+        """
+        cache = ComponentCache(os.path.join(self._directory.name, "cache.db"))
+        test_converter = ComponentConverter(cache, CatalogueBackend(self._catalogue,
+                                                                    FakeBackend(self.FIXTURES)))
+        test_converter.read_csv_file(self.PATH_TO_TESTS + "/toplevel_test.csv")
+        test_converter.create_component_list()
+
+        for component_data in test_converter._data:
+            part_name = component_data[CSV_PART_NUMBER_INDEX]
+            self.assertEqual(cache.read(part_name) is None, part_name in self._records)
+        cache.close()
+
+    def test_invalid_catalogue(self):
+        """ Tests that files which aren't catalogues are refused.
+        """
+        with self.assertRaises(ValueError):
+            ComponentCatalogue(self._export)
+
+
+if __name__ == '__main__':
+    unittest.main()
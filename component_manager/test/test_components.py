@@ -1,17 +1,21 @@
 #-*- coding: utf-8 -*-
 
 import unittest
+import os
+import pickle
 
 from component_manager.src import *
 
 class ComponentTesting(unittest.TestCase):
+    FIXTURES = os.getcwd() + "/component_manager/test/fixtures.json"
+
     def test_resistor_equality(self):
         """ Tests the resistor equality functionality.
         """
         resistor_one = Resistor("RC0402FR-0747KL")
         resistor_two = Resistor("CRCW040256K2FKED")
         resistor_three = Resistor("RC0402FR-0747KL")
-        test_converter = ComponentConverter()
+        test_converter = ComponentConverter(backend=FakeBackend(self.FIXTURES))
 
         test_converter.component_search(resistor_one)
         test_converter.component_search(resistor_two)
@@ -23,7 +27,7 @@ class ComponentTesting(unittest.TestCase):
     def test_resistor_search(self):
         """ Tests resistor search functionality.
         """
-        test_converter = ComponentConverter()
+        test_converter = ComponentConverter(backend=FakeBackend(self.FIXTURES))
         test_resistor = Resistor('CRCW080510K0FKEA')
         test_converter.component_search(test_resistor)
         
@@ -42,7 +46,7 @@ class ComponentTesting(unittest.TestCase):
         resistor_one = Resistor("CRCW040256K2FKED")
         resistor_two = Resistor("WR04X5622FTL")
         resistor_three = Resistor("RC0402JR-0739KL")
-        test_converter = ComponentConverter()
+        test_converter = ComponentConverter(backend=FakeBackend(self.FIXTURES))
 
         test_converter.component_search(resistor_one)
         test_converter.component_search(resistor_two)
@@ -57,7 +61,7 @@ class ComponentTesting(unittest.TestCase):
         capacitor_one = Capacitor("C1608X5R1H105K080AB")
         capacitor_two = Capacitor("CL31A476MPHNNNE")
         capacitor_three = Capacitor("C1608X5R1H105K080AB")
-        test_converter = ComponentConverter()
+        test_converter = ComponentConverter(backend=FakeBackend(self.FIXTURES))
 
         test_converter.component_search(capacitor_one)
         test_converter.component_search(capacitor_two)
@@ -69,7 +73,7 @@ class ComponentTesting(unittest.TestCase):
     def test_capacitor_search(self):
         """ Tests capacitor search functionality.
         """
-        test_converter = ComponentConverter()
+        test_converter = ComponentConverter(backend=FakeBackend(self.FIXTURES))
         test_capacitor = Capacitor('CL05A104KA5NNNC')
         test_converter.component_search(test_capacitor)
         
@@ -88,7 +92,7 @@ class ComponentTesting(unittest.TestCase):
         capacitor_one = Capacitor('C3225X5R1C226M250AA')
         capacitor_two = Capacitor('GRM32ER61C226KE20L')
         capacitor_three = Capacitor('UMK325B7475KMHP')
-        test_converter = ComponentConverter()
+        test_converter = ComponentConverter(backend=FakeBackend(self.FIXTURES))
 
         test_converter.component_search(capacitor_one)
         test_converter.component_search(capacitor_two)
@@ -103,7 +107,7 @@ class ComponentTesting(unittest.TestCase):
         inductor_one = Inductor("B82464G4682M00")
         inductor_two = Inductor("VLC5045T-100M")
         inductor_three = Inductor("B82464G4682M00")
-        test_converter = ComponentConverter()
+        test_converter = ComponentConverter(backend=FakeBackend(self.FIXTURES))
 
         test_converter.component_search(inductor_one)
         test_converter.component_search(inductor_two)
@@ -115,7 +119,7 @@ class ComponentTesting(unittest.TestCase):
     def test_inductor_search(self):
         """ Tests inductor search functionality.
         """
-        test_converter = ComponentConverter()
+        test_converter = ComponentConverter(backend=FakeBackend(self.FIXTURES))
         test_inductor = Inductor('74437368047')
         test_converter.component_search(test_inductor)
 
@@ -135,7 +139,7 @@ class ComponentTesting(unittest.TestCase):
         inductor_one = Inductor('74476410')
         inductor_two = Inductor('NLV32T-100J-PF')
         inductor_three = Inductor('LQM2HPN2R2MG0L')
-        test_converter = ComponentConverter()
+        test_converter = ComponentConverter(backend=FakeBackend(self.FIXTURES))
 
         test_converter.component_search(inductor_one)
         test_converter.component_search(inductor_two)
@@ -150,7 +154,7 @@ class ComponentTesting(unittest.TestCase):
         ferrite_one = Ferrite("QT1608RL120HC-2A")
         ferrite_two = Ferrite("BLM15AX601SN1D")
         ferrite_three = Ferrite("QT1608RL120HC-2A")
-        test_converter = ComponentConverter()
+        test_converter = ComponentConverter(backend=FakeBackend(self.FIXTURES))
 
         test_converter.component_search(ferrite_one)
         test_converter.component_search(ferrite_two)
@@ -162,7 +166,7 @@ class ComponentTesting(unittest.TestCase):
     def test_ferrite_search(self):
         """ Tests ferrite search functionality.
         """
-        test_converter = ComponentConverter()
+        test_converter = ComponentConverter(backend=FakeBackend(self.FIXTURES))
         test_ferrite = Ferrite('BLM15AX601SN1D')
         test_converter.component_search(test_ferrite)
 
@@ -179,7 +183,7 @@ class ComponentTesting(unittest.TestCase):
         ferrite_one = Ferrite("BLM15AX601SN1D")
         ferrite_two = Ferrite("BLM18PG121SN1")
         ferrite_three = Ferrite('BLM15AX601SN1D')
-        test_converter = ComponentConverter()
+        test_converter = ComponentConverter(backend=FakeBackend(self.FIXTURES))
 
         test_converter.component_search(ferrite_one)
         test_converter.component_search(ferrite_two)
@@ -194,7 +198,7 @@ class ComponentTesting(unittest.TestCase):
         choke_one = Choke("DLP11TB800UL2L")
         choke_two = Choke("DLW21HN900SQ2L")
         choke_three = Choke("DLP11TB800UL2L")
-        test_converter = ComponentConverter()
+        test_converter = ComponentConverter(backend=FakeBackend(self.FIXTURES))
 
         test_converter.component_search(choke_one)
         test_converter.component_search(choke_two)
@@ -206,7 +210,7 @@ class ComponentTesting(unittest.TestCase):
     def test_choke_search(self):
         """ Tests choke search functionality.
         """
-        test_converter = ComponentConverter()
+        test_converter = ComponentConverter(backend=FakeBackend(self.FIXTURES))
         test_choke = Choke("DLP11TB800UL2L")
         test_converter.component_search(test_choke)
 
@@ -222,7 +226,7 @@ class ComponentTesting(unittest.TestCase):
         choke_one = Choke("DLW21HN900SQ2L")
         choke_two = Choke("ACM2012-900-2P-T002")
         choke_three = Choke('DLP11TB800UL2L')
-        test_converter = ComponentConverter()
+        test_converter = ComponentConverter(backend=FakeBackend(self.FIXTURES))
 
         test_converter.component_search(choke_one)
         test_converter.component_search(choke_two)
@@ -239,7 +243,7 @@ class ComponentTesting(unittest.TestCase):
         diode_two = Diode("BAT54-7-F")
         diode_three = Diode("1N4934-T")
 
-        test_converter = ComponentConverter()
+        test_converter = ComponentConverter(backend=FakeBackend(self.FIXTURES))
 
         test_converter.component_search(diode_one)
         test_converter.component_search(diode_two)
@@ -251,7 +255,7 @@ class ComponentTesting(unittest.TestCase):
     def test_diode_search(self):
         """ Tests diode search functionality.
         """
-        test_converter = ComponentConverter()
+        test_converter = ComponentConverter(backend=FakeBackend(self.FIXTURES))
         test_diode = Diode("BAT54-7-F")
         test_converter.component_search(test_diode)
 
@@ -269,7 +273,7 @@ class ComponentTesting(unittest.TestCase):
         diode_one = Diode("1N4934-T")
         diode_two = Diode("BAT54-7-F")
         diode_three = Diode('1N4937-T')
-        test_converter = ComponentConverter()
+        test_converter = ComponentConverter(backend=FakeBackend(self.FIXTURES))
 
         test_converter.component_search(diode_one)
         test_converter.component_search(diode_two)
@@ -278,6 +282,38 @@ class ComponentTesting(unittest.TestCase):
         self.assertFalse(diode_one.is_alternative(diode_two))
         self.assertTrue(diode_one.is_alternative(diode_three))
 
+    def test_type_alternative(self):
+        """ Tests that components of different types are never alternatives.
+        """
+        test_resistor = Resistor("RC0402FR-0747KL")
+        test_capacitor = Capacitor("CL10A475KO8NNNC")
+
+        result = test_resistor.alternative_result(test_capacitor)
+        self.assertEqual(result.verdict, VERDICT_INVALID)
+        self.assertEqual(result.values, {"original": "Resistor", "alternative": "Capacitor"})
+        self.assertEqual(result.message,
+                         "RC0402FR-0747KL and CL10A475KO8NNNC: Component types don't match.")
+        self.assertEqual(IC("U1").alternative_result(test_resistor).message,
+                         "U1 and RC0402FR-0747KL: Component types don't match.")
+
+    def test_parameter_layout(self):
+        """ Tests the fixed parameter layout of components.
+        """
+        test_diode = Diode("BAT54-7-F")
+        test_diode._parameters[test_diode.TYPE_SEARCH_CODE] = "Schottky"
+        test_diode._parameters[test_diode.TEMPERATURE_SEARCH_CODE] = "-65°C ~ 150°C"
+
+        self.assertFalse(hasattr(test_diode, "__dict__"))
+        self.assertEqual(len(test_diode._parameters), 10)
+        self.assertIn(Diode.TEMPERATURE_SEARCH_CODE, test_diode._parameters)
+        self.assertNotIn(Component.TEMPERATURE_SEARCH_CODE, test_diode._parameters)
+        self.assertEqual(test_diode.parameter(test_diode.TYPE_SEARCH_CODE), "Schottky")
+
+        read_diode = pickle.loads(pickle.dumps(test_diode))
+        self.assertEqual(read_diode, test_diode)
+        self.assertEqual(dict(read_diode._parameters), dict(test_diode._parameters))
+        self.assertFalse(test_diode.__eq__(Diode("1N4934-T")))
+
 if __name__ == '__main__':
     digikey_logger = logging.getLogger('digikey')
     digikey_logger.setLevel(logging.NOTSET)
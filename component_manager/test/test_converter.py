@@ -4,11 +4,14 @@ import unittest
 from unittest.mock import patch
 import logging
 import os
+import shutil
+import tempfile
 from io import StringIO
 from component_manager.src import *
 
 class ConverterTesting(unittest.TestCase):
     PATH_TO_TESTS = os.getcwd() + "/component_manager/test"
+    FIXTURES = PATH_TO_TESTS + "/fixtures.json"
     def test_read_csv_file(self):
         """ Tests reading of CSV files.
         """
@@ -21,7 +24,7 @@ class ConverterTesting(unittest.TestCase):
     def test_data_to_component(self):
         """ Tests of conversion between CSV to component model.
         """
-        test_converter = ComponentConverter()
+        test_converter = ComponentConverter(backend=FakeBackend(self.FIXTURES))
         test_converter.read_csv_file(self.PATH_TO_TESTS + "/test.csv")
         test_component = test_converter.data_to_component(test_converter._data[0])
 
@@ -41,7 +44,7 @@ class ConverterTesting(unittest.TestCase):
     def test_component_list(self):
         """ Tests the creation of a component list from a CSV file.
         """
-        test_converter = ComponentConverter()
+        test_converter = ComponentConverter(backend=FakeBackend(self.FIXTURES))
         test_converter.read_csv_file(self.PATH_TO_TESTS + "/test.csv")
         test_converter.create_component_list()
 
@@ -97,15 +100,75 @@ class ConverterTesting(unittest.TestCase):
         self.assertEqual(test_converter._components[2]._parameters[test_converter._components[2].
                          STATUS_SEARCH_CODE], "Active")
 
+    def test_concurrent_component_list(self):
+        """ Tests that a concurrently created component list keeps the order of the CSV rows.
+        """
+        serial_converter = ComponentConverter(backend=FakeBackend(self.FIXTURES))
+        serial_converter.read_csv_file(self.PATH_TO_TESTS + "/toplevel_test.csv")
+        serial_converter.create_component_list()
+
+        concurrent_converter = ComponentConverter(backend=FakeBackend(self.FIXTURES, latency=0.001))
+        concurrent_converter.read_csv_file(self.PATH_TO_TESTS + "/toplevel_test.csv")
+        concurrent_converter.create_component_list(workers=8)
+
+        serial_names = [component if isinstance(component, str) else component._name
+                        for component in serial_converter._components]
+        concurrent_names = [component if isinstance(component, str) else component._name
+                            for component in concurrent_converter._components]
+        self.assertEqual(serial_names, concurrent_names)
+        self.assertEqual(concurrent_converter._components[21], "STE1206M1W0R016F")
+
+    def test_repeated_part_search(self):
+        """ Tests that repeated part numbers are searched once and still get separate components.
+        """
+        test_backend = FakeBackend(self.FIXTURES, latency=0.001)
+        test_converter = ComponentConverter(backend=test_backend)
+        test_converter.read_csv_file(self.PATH_TO_TESTS + "/toplevel_test.csv")
+        test_converter._data.append(list(test_converter._data[0]))
+        test_converter._data.append(list(test_converter._data[0]))
+        test_converter.create_component_list(workers=8)
+
+        part_names = set(component_data[CSV_PART_NUMBER_INDEX]
+                         for component_data in test_converter._data)
+        self.assertEqual(test_backend._search_count, len(part_names))
+        self.assertEqual(len(test_converter._components), len(test_converter._data))
+        self.assertEqual(test_converter._components[0], test_converter._components[-1])
+        self.assertIsNot(test_converter._components[0], test_converter._components[-1])
+        self.assertIsNot(test_converter._components[0]._price,
+                         test_converter._components[-1]._price)
+
+    def test_update_component_list(self):
+        """ Tests that only changed rows are searched when updating a previous component list.
+        """
+        previous_converter = ComponentConverter(backend=FakeBackend(self.FIXTURES))
+        previous_converter.read_csv_file(self.PATH_TO_TESTS + "/toplevel_test.csv")
+        previous_converter.create_component_list()
+
+        test_backend = FakeBackend(self.FIXTURES)
+        test_converter = ComponentConverter(backend=test_backend)
+        test_converter.read_csv_file(self.PATH_TO_TESTS + "/toplevel_test.csv")
+        test_converter._data[0][CSV_PART_NUMBER_INDEX] = "C3225X5R1C226K250AC"
+        test_converter._data.append(["Capacitor", "CL05A104KA5NNNC"])
+        del test_converter._data[5]
+        counts = test_converter.update_component_list(previous_converter._data,
+                                                      previous_converter._components)
+
+        self.assertEqual(counts, (len(test_converter._data) - 2, 2, 2))
+        self.assertEqual(test_backend._search_count, 2)
+        self.assertEqual(test_converter._components[0], "C3225X5R1C226K250AC")
+        self.assertIsInstance(test_converter._components[-1], Capacitor)
+        self.assertIs(test_converter._components[1], previous_converter._components[1])
+        self.assertIs(test_converter._components[5], previous_converter._components[6])
+
     def test_read_write_list(self):
         """ Tests read and write functionality of component list to file.
         """
-        test_converter = ComponentConverter()
+        test_converter = ComponentConverter(backend=FakeBackend(self.FIXTURES))
         test_converter.read_csv_file(self.PATH_TO_TESTS + "/test.csv")
         test_converter.create_component_list()
-        test_converter.save_component_list(self.PATH_TO_TESTS + "/test")
-
-        read_converter = test_converter.read_component_list(self.PATH_TO_TESTS + "/test")
+        with tempfile.TemporaryDirectory() as directory:
+            test_converter.save_component_list(directory + "/test")
+            read_converter = test_converter.read_component_list(directory + "/test")
         self.assertEqual(test_converter._components, read_converter._components)
 
     @patch('sys.stdout', new_callable = StringIO)
@@ -125,6 +188,11 @@ class ConverterTesting(unittest.TestCase):
                            "Can't compare parts APT1608CGCK and KP1608CGCK.\n")
         self.assertEqual(stdout.getvalue(), expected_output)
 
+        stdout.truncate(0)
+        stdout.seek(0)
+        test_manager.check_alternative(processes=2)
+        self.assertEqual(stdout.getvalue(), expected_output)
+
     @patch('sys.stdout', new_callable = StringIO)
     def test_check_bom_cost(self, stdout):
         """ Tests bom cost checking for a given component list.
@@ -149,6 +217,206 @@ class ConverterTesting(unittest.TestCase):
                            "Leads time of RC0402FR-07715KL is 20 week(s).\n")
         self.assertEqual(stdout.getvalue(), expected_output)
 
+    @patch('sys.stdout', new_callable = StringIO)
+    def test_stream_checks(self, stdout):
+        """ Tests that streamed checks give the same results as checks on the component list.
+        """
+        test_manager = ComponentManager(self.PATH_TO_TESTS + "/toplevel_test", stream=True)
+        test_manager.stream_checks(True, False, False)
+        streamed_output = stdout.getvalue()
+
+        stdout.seek(0)
+        stdout.truncate()
+        test_manager = ComponentManager(self.PATH_TO_TESTS + "/toplevel_test")
+        test_manager.check_alternative()
+        self.assertEqual(streamed_output, stdout.getvalue())
+
+        stdout.seek(0)
+        stdout.truncate()
+        with open(self.PATH_TO_TESTS + "/toplevel_test", "rb") as snapshot_file:
+            snapshot = snapshot_file.read()
+        snapshot_time = os.path.getmtime(self.PATH_TO_TESTS + "/toplevel_test")
+        test_manager = ComponentManager(self.PATH_TO_TESTS + "/toplevel_test.csv", workers=4,
+                                        backend=FakeBackend(self.FIXTURES), stream=True)
+        test_manager.stream_checks(False, True, True)
+        with open(self.PATH_TO_TESTS + "/toplevel_test", "rb") as snapshot_file:
+            self.assertEqual(snapshot_file.read(), snapshot)
+        self.assertEqual(os.path.getmtime(self.PATH_TO_TESTS + "/toplevel_test"), snapshot_time)
+        self.assertEqual(stdout.getvalue(), ("Leads time of C2012X5R1C226K125AC is 28 week(s).\n"
+                                             "Leads time of 0805X225K250CT is 33 week(s).\n"
+                                             "Leads time of C1608X5R1C475K080AC is 20 week(s).\n"
+                                             "Leads time of CL31A476MPHNNNE is 28 week(s).\n"
+                                             "Leads time of WR04X4702FTL is 29 week(s).\n"
+                                             "Leads time of RC0402FR-07715KL is 20 week(s).\n"
+                                             "Price of 1 BoM: 9.36 $AUD per BoM.\n"
+                                             "Price of 100 BoMs: 3.81 $AUD per BoM.\n"))
+
+    def test_search_limit(self):
+        """ Tests that a search limit keeps the records of the most recently used parts only.
+        """
+        test_backend = FakeBackend(self.FIXTURES)
+        test_converter = ComponentConverter(backend=test_backend)
+        test_converter.reset_searches(2)
+        test_converter.record_search("CRCW080510K0FKEA")
+        test_converter.record_search("CL31A476MPHNNNE")
+        test_converter.record_search("CRCW080510K0FKEA")
+        test_converter.record_search("RC0402FR-07715KL")
+        self.assertEqual(list(test_converter._searches), ["CRCW080510K0FKEA", "RC0402FR-07715KL"])
+        self.assertEqual(test_backend._search_count, 3)
+
+        test_converter.record_search("CL31A476MPHNNNE")
+        self.assertEqual(test_backend._search_count, 4)
+        self.assertEqual(len(test_converter._searches), 2)
+
+    @patch('sys.stdout', new_callable = StringIO)
+    def test_batch_checks(self, stdout):
+        """ Tests that a batch of BoMs searches each part once and reports each BoM.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            shutil.copy(self.PATH_TO_TESTS + "/toplevel_test.csv", directory + "/board_a.csv")
+            shutil.copy(self.PATH_TO_TESTS + "/toplevel_test.csv", directory + "/board_b.csv")
+            with open(directory + "/board_c.csv", "w") as file:
+                file.write("Resistor,CRCW080510K0FKEA\nCapacitor,C2012X5R1C226K125AC\n")
+
+            filenames = find_bom_files([directory])
+            self.assertEqual([os.path.basename(filename) for filename in filenames],
+                             ["board_a.csv", "board_b.csv", "board_c.csv"])
+
+            test_backend = FakeBackend(self.FIXTURES, latency=0.001)
+            test_batch = BatchManager(filenames, workers=4, backend=test_backend)
+            test_batch.check_boms(False, False, True)
+
+            single_manager = ComponentManager(directory + "/board_a.csv",
+                                              backend=FakeBackend(self.FIXTURES))
+            self.assertTrue(os.path.exists(directory + "/board_b"))
+            self.assertEqual(find_bom_files([directory + "/*.csv"]), filenames)
+
+        part_names = set(component_data[CSV_PART_NUMBER_INDEX] for component_data in
+                         single_manager._component_converter._data)
+        self.assertEqual(test_backend._search_count, len(part_names) + 1)
+        self.assertEqual(stdout.getvalue().split("\n")[:3],
+                         ["BoM " + filenames[0] + ":", "Price of 1 BoM: 9.36 $AUD per BoM.",
+                          "Price of 100 BoMs: 3.81 $AUD per BoM."])
+        missing_count = len(set(component for component in
+                                single_manager._component_converter._components
+                                if isinstance(component, str)))
+        self.assertIn("Batch of 3 BoMs: " + str(len(part_names) + 1) + " unique parts, " +
+                      str(missing_count) + " not found.\nPrice of 1 of each BoM: 19.42 $AUD.\n",
+                      stdout.getvalue())
+
+    @patch('sys.stdout', new_callable = StringIO)
+    def test_facet_checks(self, stdout):
+        """ Tests that only the facets of part information the checks need are searched, with
+            later checks searching the facets they are missing.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            shutil.copy(self.PATH_TO_TESTS + "/toplevel_test.csv", directory + "/full.csv")
+            shutil.copy(self.PATH_TO_TESTS + "/toplevel_test.csv", directory + "/pricing.csv")
+            full_manager = ComponentManager(directory + "/full.csv",
+                                            backend=FakeBackend(self.FIXTURES))
+            full_manager.check_bom_cost()
+            full_manager.check_alternative()
+            expected_output = stdout.getvalue()
+            stdout.truncate(0)
+            stdout.seek(0)
+
+            test_backend = FakeBackend(self.FIXTURES)
+            test_manager = ComponentManager(directory + "/pricing.csv", workers=4,
+                                            backend=test_backend,
+                                            facets=check_facets(pricing=True))
+            search_count = test_backend._search_count
+            self.assertEqual(test_backend._facet_counts, {FACET_PARAMETERS: 0,
+                                                          FACET_PRICING: search_count,
+                                                          FACET_LEAD_TIME: 0})
+            test_manager.check_bom_cost()
+            test_manager.check_alternative()
+            self.assertEqual(stdout.getvalue(), expected_output)
+
+            found_count = len(set(component._name for component in
+                                  test_manager._component_converter._components
+                                  if not isinstance(component, str)))
+            self.assertEqual(test_backend._search_count, search_count + found_count)
+            self.assertEqual(test_backend._facet_counts[FACET_PRICING], search_count)
+            test_manager.check_alternative()
+            self.assertEqual(test_backend._search_count, search_count + found_count)
+
+            read_converter = ComponentConverter().read_component_list(directory + "/pricing")
+            for component in read_converter._components:
+                if not isinstance(component, str):
+                    self.assertIs(component._facets, facet_set((FACET_PARAMETERS, FACET_PRICING)))
+
+    @patch('sys.stdout', new_callable = StringIO)
+    def test_stream_facets(self, stdout):
+        """ Tests that streaming the checks of a snapshot searches the facets the checks need but
+            the snapshot is missing.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            shutil.copy(self.PATH_TO_TESTS + "/toplevel_test.csv", directory + "/full.csv")
+            shutil.copy(self.PATH_TO_TESTS + "/toplevel_test.csv", directory + "/pricing.csv")
+            ComponentManager(directory + "/full.csv", backend=FakeBackend(self.FIXTURES))
+            ComponentManager(directory + "/pricing.csv", backend=FakeBackend(self.FIXTURES),
+                             facets=check_facets(pricing=True))
+
+            full_manager = ComponentManager(directory + "/full", stream=True)
+            full_manager.stream_checks(True, True, False)
+            expected_output = stdout.getvalue()
+            stdout.truncate(0)
+            stdout.seek(0)
+
+            test_backend = FakeBackend(self.FIXTURES)
+            test_manager = ComponentManager(directory + "/pricing", workers=4,
+                                            backend=test_backend, stream=True)
+            test_manager.stream_checks(True, True, False)
+
+        self.assertIn("Leads time of", expected_output)
+        self.assertEqual(stdout.getvalue(), expected_output)
+        self.assertEqual(test_backend._facet_counts[FACET_PRICING], 0)
+        self.assertGreater(test_backend._facet_counts[FACET_LEAD_TIME], 0)
+
+    @patch('sys.stdout', new_callable = StringIO)
+    def test_batch_options(self, stdout):
+        """ Tests that parallel alternative checks, discovery and cost curves run on each BoM of a
+            batch as they do on a single BoM.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            shutil.copy(self.PATH_TO_TESTS + "/toplevel_test.csv", directory + "/board_a.csv")
+            single_manager = ComponentManager(directory + "/board_a.csv",
+                                              backend=FakeBackend(self.FIXTURES))
+            single_manager.check_alternative(processes=2)
+            single_manager.check_discovery()
+            single_manager.check_cost_curve([1, 1000])
+            expected_output = stdout.getvalue()
+            stdout.truncate(0)
+            stdout.seek(0)
+
+            test_batch = BatchManager([directory + "/board_a.csv"],
+                                      backend=FakeBackend(self.FIXTURES))
+            test_batch.check_boms(True, False, False, processes=2, discovery=True,
+                                  build_quantities=[1, 1000])
+        self.assertTrue(stdout.getvalue().startswith("BoM " + directory + "/board_a.csv:\n" +
+                                                     expected_output))
+        self.assertIn("Alternatives for ", expected_output)
+        self.assertIn("Price of 1000 BoMs: ", expected_output)
+
+    def test_stream_components(self):
+        """ Tests that streamed components are emitted before every row has been read.
+        """
+        rows_read = []
+        def rows():
+            for component_data in [["Resistor", "CRCW080510K0FKEA"], ["Alternative", "X"],
+                                   ["Capacitor", "CL05A104KA5NNNC"]]:
+                rows_read.append(component_data)
+                yield component_data
+
+        test_converter = ComponentConverter(backend=FakeBackend(self.FIXTURES))
+        components = test_converter.stream_components(test_converter.resolve_alternatives(rows()))
+        first_component = next(components)
+        self.assertEqual(len(rows_read), 1)
+        self.assertEqual(first_component._name, "CRCW080510K0FKEA")
+        self.assertEqual(next(components), "X")
+        self.assertEqual(rows_read[1][DESCRIPTION_TYPE_INDEX], "Resistor")
+        self.assertIsInstance(next(components), Capacitor)
+
 
 if __name__ == '__main__':
     digikey_logger = logging.getLogger('digikey')
@@ -0,0 +1,69 @@
+#-*- coding: utf-8 -*-
+
+import unittest
+from unittest.mock import patch
+import os
+from io import StringIO
+from component_manager.src import *
+
+class CostingTesting(unittest.TestCase):
+    PRICE_BREAKS = [[1, 0.1], [10, 0.05], [100, 0.02], [1000, 0.01]]
+
+    def test_price_breaks(self):
+        """ Tests that components without stored price breaks fall back to their 1 of and 100 of
+            prices.
+        """
+        test_resistor = Resistor("CRCW080510K0FKEA")
+        self.assertEqual(component_price_breaks(test_resistor), [])
+        test_resistor._price = [0.1, 2]
+        self.assertEqual(component_price_breaks(test_resistor), [[1, 0.1], [100, 0.02]])
+        test_resistor._price_breaks = self.PRICE_BREAKS
+        self.assertEqual(component_price_breaks(test_resistor), self.PRICE_BREAKS)
+
+    def test_costs(self):
+        """ Tests that each part is costed at the break it reaches at each build quantity.
+        """
+        test_table = PriceBreakTable([self.PRICE_BREAKS, [[10, 1.0], [50, 0.5]], []])
+        costs = test_table.costs([1, 2, 1], [1, 9, 10, 500, 2000])
+        self.assertEqual(costs.shape, (3, 5))
+        self.assertEqual(costs[0].tolist(), [0.1, 0.9, 0.5, 10, 20])
+        # The second part must be bought at least 10 at a time
+        self.assertEqual(costs[1].tolist(), [10, 18, 20, 500, 2000])
+        self.assertEqual(costs[2].tolist(), [0, 0, 0, 0, 0])
+        self.assertEqual(test_table.costs([0, 0, 0], [100]).tolist(), [[0], [0], [0]])
+
+    def test_cost_curve(self):
+        """ Tests costing a component list with parts that weren't found.
+        """
+        test_resistor = Resistor("CRCW080510K0FKEA")
+        test_resistor._price_breaks = self.PRICE_BREAKS
+        test_capacitor = Capacitor("CL05A104KA5NNNC")
+        test_capacitor._price = [0.5, 20]
+        costs = cost_curve([test_resistor, "STE1206M1W0R016F", test_capacitor], [4, 1, 2],
+                           [1, 100])
+        self.assertEqual([round(cost, 6) for cost in costs.tolist()], [1.4, 48])
+
+    @patch('sys.stdout', new_callable = StringIO)
+    def test_check_cost_curve(self, stdout):
+        """ Tests pricing a CSV BoM with per line quantities across build quantities.
+        """
+        test_backend = FakeBackend()
+        test_backend.add_records({"CRCW080510K0FKEA": {
+            "found": True, "parameters": {}, "price": [0.1, 2], "lead_time": 0,
+            "price_breaks": self.PRICE_BREAKS}})
+        test_converter = ComponentConverter(backend=test_backend)
+        test_converter._data = [["Resistor", "CRCW080510K0FKEA", "5"],
+                                ["Resistor", "CRCW080510K0FKEA", ""]]
+        test_converter.create_component_list()
+        self.assertEqual(test_converter.line_quantities(), [5, 1])
+        self.assertEqual(test_converter._components[0]._price_breaks, self.PRICE_BREAKS)
+
+        with patch.object(ComponentConverter, 'read_component_list', return_value=test_converter):
+            test_manager = ComponentManager("test")
+        test_manager.check_cost_curve([1, 200])
+        self.assertEqual(stdout.getvalue(), "Price of 1 BoMs: 0.6 $AUD per BoM.\n"
+                                            "Price of 200 BoMs: 0.07 $AUD per BoM.\n")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+#-*- coding: utf-8 -*-
+
+import unittest
+from unittest.mock import patch
+import os
+from io import StringIO
+from component_manager.src import *
+
+class IndexTesting(unittest.TestCase):
+    PATH_TO_TESTS = os.getcwd() + "/component_manager/test"
+    FIXTURES = PATH_TO_TESTS + "/fixtures.json"
+
+    def setUp(self):
+        self._converter = ComponentConverter(backend=FakeBackend(self.FIXTURES))
+        self._converter.read_csv_file(self.PATH_TO_TESTS + "/toplevel_test.csv")
+        self._converter.create_component_list()
+        self._components = self._converter._components
+
+    def test_functionality_key(self):
+        """ Tests that components are keyed by class and exact match parameters.
+        """
+        self.assertEqual(functionality_key(self._components[0]),
+                         (Capacitor, "22 µF", "1210 (3225 Metric)"))
+        self.assertIsNone(functionality_key(Resistor("CRCW080510K0FKEA")))
+        self.assertIsNone(functionality_key(IC("STM32F405RGT6")))
+
+    def test_candidates(self):
+        """ Tests that candidates come from the bucket of the component and parts are indexed once.
+        """
+        test_index = ComponentIndex(self._components + self._components)
+        indexed_names = set(component._name for component in self._components
+                            if not isinstance(component, str) and
+                            functionality_key(component) is not None)
+        self.assertEqual(test_index._part_names, indexed_names)
+        self.assertEqual(sum(len(bucket) for bucket in test_index._buckets.values()),
+                         len(indexed_names))
+        self.assertEqual([candidate._name for candidate in test_index.candidates(self._components[0])],
+                         ["C3225X5R1C226M250AA", "GRM32ER61C226KE20L"])
+        self.assertEqual(test_index.candidates(Resistor("CRCW080510K0FKEA")), [])
+
+    def test_find_alternatives(self):
+        """ Tests that the index finds the same alternatives as checking every pair of components.
+        """
+        test_index = ComponentIndex(self._components)
+        components = [component for component in self._components
+                      if not isinstance(component, str)]
+        reasons = validate_matrix(components, components)
+        for i, component in enumerate(components):
+            expected_names = [candidate._name for j, candidate in enumerate(components)
+                              if reasons[i, j] == REASON_VALID and candidate._name != component._name]
+            self.assertEqual([alternative._name for alternative in
+                              test_index.find_alternatives(component)], expected_names)
+        self.assertEqual(test_index.find_alternatives("STE1206M1W0R016F"), [])
+
+    @patch('sys.stdout', new_callable = StringIO)
+    def test_check_discovery(self, stdout):
+        """ Tests discovering alternatives among a catalogue of further components.
+        """
+        with patch.object(ComponentConverter, 'read_component_list',
+                          return_value=self._converter):
+            test_manager = ComponentManager("test")
+        test_manager._component_converter._components = self._components[:1]
+        test_manager.check_discovery(self._components)
+        self.assertEqual(stdout.getvalue(),
+                         "Alternatives for C3225X5R1C226M250AA: GRM32ER61C226KE20L.\n")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+#-*- coding: utf-8 -*-
+
+import unittest
+import os
+import io
+import csv
+import json
+from component_manager.src import *
+
+class ReportTesting(unittest.TestCase):
+    PATH_TO_TESTS = os.getcwd() + "/component_manager/test"
+
+    def test_alternative_results(self):
+        """ Tests that alternative checks return a result per pair naming the failing parameter.
+        """
+        test_manager = ComponentManager(self.PATH_TO_TESTS + "/toplevel_test",
+                                        renderer=TextRenderer(io.StringIO()))
+        results = test_manager.check_alternative()
+        self.assertEqual(len(results), len(test_manager._component_converter._components) // 2)
+
+        invalid = [result for result in results if result.verdict == VERDICT_INVALID]
+        self.assertEqual(len(invalid), 1)
+        self.assertEqual(invalid[0].part, "RC0402FR-07715KL")
+        self.assertEqual(invalid[0].alternative, "WR04X7152FTL")
+        self.assertEqual(invalid[0].parameter, Resistor.RESISTANCE_SEARCH_CODE)
+        self.assertEqual(invalid[0].values, {"original": "715 kOhms", "alternative": "71.5 kOhms"})
+        self.assertEqual(len([result for result in results if result.verdict == VERDICT_VALID]),
+                         17)
+
+        parallel_results = test_manager.check_alternative(processes=2)
+        self.assertEqual([result.as_dict() for result in parallel_results],
+                         [result.as_dict() for result in results])
+
+    def test_type_mismatch(self):
+        """ Tests that a pair of components of different types gives the same result whether the
+            pairs are validated in this process or across processes.
+        """
+        stream = io.StringIO()
+        test_manager = ComponentManager(self.PATH_TO_TESTS + "/toplevel_test",
+                                        renderer=TextRenderer(stream))
+        components = test_manager._component_converter._components
+        test_manager._component_converter._components = [
+            next(c for c in components if isinstance(c, Resistor)),
+            next(c for c in components if isinstance(c, Capacitor))]
+
+        results = test_manager.check_alternative()
+        parallel_results = test_manager.check_alternative(processes=2)
+        self.assertEqual([result.as_dict() for result in parallel_results],
+                         [result.as_dict() for result in results])
+        self.assertEqual(results[0].verdict, VERDICT_INVALID)
+        self.assertTrue(results[0].message.endswith(": Component types don't match."))
+        self.assertEqual(len(set(stream.getvalue().splitlines())), 1)
+
+    def test_json_lines(self):
+        """ Tests that the JSON Lines renderer writes every result, including valid ones.
+        """
+        stream = io.StringIO()
+        test_manager = ComponentManager(self.PATH_TO_TESTS + "/toplevel_test",
+                                        renderer=JsonLinesRenderer(stream))
+        results = test_manager.check_lead_time()
+
+        lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual(lines, [result.as_dict() for result in results])
+        self.assertIn({"check": "lead_time", "part": "WR04X4702FTL", "alternative": None,
+                       "verdict": VERDICT_LEAD_TIME, "parameter": None,
+                       "values": {"lead_time": "29 week(s)"},
+                       "message": "Leads time of WR04X4702FTL is 29 week(s)."}, lines)
+
+    def test_csv(self):
+        """ Tests that the CSV renderer writes a header and a row per result.
+        """
+        stream = io.StringIO()
+        test_manager = ComponentManager(self.PATH_TO_TESTS + "/toplevel_test",
+                                        renderer=CsvRenderer(stream))
+        test_manager.check_bom_cost()
+
+        rows = list(csv.DictReader(io.StringIO(stream.getvalue())))
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[1]["verdict"], VERDICT_PRICE)
+        self.assertEqual(json.loads(rows[1]["values"]), {"boms": 100, "price_per_bom": 3.81})
+
+    def test_buffering(self):
+        """ Tests that results are only written once the buffer fills or is flushed.
+        """
+        stream = io.StringIO()
+        renderer = TextRenderer(stream, buffer_size=3)
+        renderer.write_all(CheckResult("lead_time", str(i), VERDICT_UNAVAILABLE,
+                                       message=str(i) + " is not available.") for i in range(4))
+        self.assertEqual(stream.getvalue(), "".join(str(i) + " is not available.\n"
+                                                    for i in range(3)))
+        renderer.flush()
+        self.assertEqual(stream.getvalue().count("\n"), 4)
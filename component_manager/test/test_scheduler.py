@@ -0,0 +1,103 @@
+#-*- coding: utf-8 -*-
+
+import unittest
+import os
+from component_manager.src import *
+
+class FakeClock():
+    """ Clock that only advances when slept on """
+    def __init__(self):
+        self._now = 0.0
+
+    def time(self):
+        return self._now
+
+    def sleep(self, seconds):
+        self._now += seconds
+
+
+class SchedulerTesting(unittest.TestCase):
+    FIXTURES = os.getcwd() + "/component_manager/test/fixtures.json"
+
+    def test_token_bucket(self):
+        """ Tests that the token bucket allows a burst then paces requests to its rate.
+        """
+        clock = FakeClock()
+        test_bucket = TokenBucket(2, 3, clock.time, clock.sleep)
+        for i in range(3):
+            test_bucket.acquire()
+        self.assertEqual(clock.time(), 0)
+
+        for i in range(4):
+            test_bucket.acquire()
+        self.assertAlmostEqual(clock.time(), 2)
+
+    def test_adaptive_limiter(self):
+        """ Tests that the concurrency limit halves on throttling and grows back additively.
+        """
+        test_limiter = AdaptiveLimiter(8, latency_target=1)
+        test_limiter.acquire()
+        test_limiter.release(0.1, throttled=True)
+        self.assertEqual(test_limiter._limit, 4)
+        test_limiter.acquire()
+        test_limiter.release(5)
+        self.assertEqual(test_limiter._limit, 2)
+
+        for i in range(2):
+            test_limiter.acquire()
+            test_limiter.release(0.1)
+        self.assertGreater(test_limiter._limit, 2.5)
+        self.assertLess(test_limiter._limit, 3)
+        self.assertEqual(test_limiter._active, 0)
+
+    def test_scheduled_retry(self):
+        """ Tests that throttled searches are retried with backoff and counted against the budget.
+        """
+        clock = FakeClock()
+        test_backend = FakeBackend(self.FIXTURES, throttle_rate=0.5, seed=2)
+        test_scheduler = ScheduledBackend(test_backend, 60, 1000, attempts=20, seed=1,
+                                          clock=clock.time, sleep=clock.sleep)
+        for i in range(10):
+            record = test_scheduler.part_search("CL05A104KA5NNNC")
+            self.assertTrue(record["found"])
+
+        self.assertEqual(test_scheduler._requests, test_backend._search_count)
+        self.assertEqual(test_scheduler._requests, 10 + test_scheduler._throttled)
+        self.assertGreater(test_scheduler._throttled, 0)
+        self.assertGreaterEqual(clock.time(), test_scheduler._requests - 1)
+        self.assertEqual(test_scheduler.requests_remaining(), 1000 - test_scheduler._requests)
+
+    def test_scheduled_errors(self):
+        """ Tests that a search fails once its attempts or the daily budget run out.
+        """
+        clock = FakeClock()
+        test_scheduler = ScheduledBackend(FakeBackend(self.FIXTURES, error_rate=1), attempts=3,
+                                          clock=clock.time, sleep=clock.sleep)
+        with self.assertRaises(BackendError):
+            test_scheduler.part_search("CL05A104KA5NNNC")
+        self.assertEqual(test_scheduler._requests, 3)
+
+        test_scheduler = ScheduledBackend(FakeBackend(self.FIXTURES), daily_budget=2,
+                                          clock=clock.time, sleep=clock.sleep)
+        test_scheduler.part_search("CL05A104KA5NNNC")
+        test_scheduler.part_search("CRCW080510K0FKEA")
+        with self.assertRaises(BackendError):
+            test_scheduler.part_search("CL05A104KA5NNNC")
+        self.assertEqual(test_scheduler.budget_report(), "Requests used: 2 of 2 daily (100.0%), "
+                                                         "throttled: 0, remaining: 0.")
+
+    def test_scheduled_component_list(self):
+        """ Tests creating a component list through the scheduler with concurrent searches.
+        """
+        clock = FakeClock()
+        test_converter = ComponentConverter(backend=ScheduledBackend(
+            FakeBackend(self.FIXTURES, throttle_rate=0.2, seed=3), workers=4, attempts=20,
+            seed=1, clock=clock.time, sleep=clock.sleep))
+        test_converter.read_csv_file(os.getcwd() + "/component_manager/test/toplevel_test.csv")
+        test_converter.create_component_list(workers=4)
+        self.assertEqual(len(test_converter._components), len(test_converter._data))
+        self.assertEqual(test_converter._components[21], "STE1206M1W0R016F")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+#-*- coding: utf-8 -*-
+
+import unittest
+import os
+import io
+import csv
+import sys
+import argparse
+import tempfile
+import threading
+from unittest.mock import patch
+from component_manager.src import *
+from component_manager.src.component_client import *
+from component_manager.src.component_server import *
+
+class ServerTesting(unittest.TestCase):
+    PATH_TO_TESTS = os.getcwd() + "/component_manager/test"
+    FIXTURES = PATH_TO_TESTS + "/fixtures.json"
+
+    def setUp(self):
+        self._backend = FakeBackend(self.FIXTURES, latency=0.001)
+        self._server = ComponentServer(("127.0.0.1", 0), workers=4, backend=self._backend)
+        self._url = "http://127.0.0.1:" + str(self._server.server_address[1])
+        self._thread = threading.Thread(target=self._server.serve_forever)
+        self._thread.start()
+
+    def tearDown(self):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def test_server_running(self):
+        """ Tests that the client finds a running server, and no server at a closed port.
+        """
+        self.assertTrue(server_running(self._url))
+        self.assertFalse(server_running("http://127.0.0.1:1"))
+
+    def test_concurrent_queries(self):
+        """ Tests that concurrent queries for the same BoM search each part once and answer with
+            the output of the local checks, leaving the standard output of the process alone.
+        """
+        stdout = sys.stdout
+        with open(self.PATH_TO_TESTS + "/toplevel_test.csv", "r", newline="") as csv_file:
+            csv_text = csv_file.read()
+
+        outputs = []
+        def query():
+            outputs.append(query_server(csv_text, bom_cost=True, quantities=[],
+                                        url=self._url))
+        threads = [threading.Thread(target=query) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        part_names = set(row[CSV_PART_NUMBER_INDEX] for row in
+                         csv.reader(io.StringIO(csv_text)) if row)
+        self.assertIs(sys.stdout, stdout)
+        self.assertEqual(self._backend._search_count, len(part_names))
+        self.assertEqual(len(set(outputs)), 1)
+        self.assertIn("Price of 1 BoM: 9.36 $AUD per BoM.", outputs[0])
+        self.assertIn("Price of 1000 BoMs: 3.81 $AUD per BoM.", outputs[0])
+
+    def run_args(self, filename, **options):
+        """ Creates the parsed command line arguments of a run pricing the given file.
+
+        Parameters:
+            - filename: The name of the CSV file
+            - options: The arguments given other than their defaults
+
+        Returns: The parsed arguments
+        """
+        args = argparse.Namespace(filename=[filename], a=False, j=None, l=False, d=False, p=True,
+                                  q=None, w=None, n=True, f=None, c=None, s=False, i=False,
+                                  stats=None, server=self._url, local=False, format="text")
+        for option, value in options.items():
+            setattr(args, option, value)
+        return args
+
+    @patch('sys.stdout', new_callable = io.StringIO)
+    def test_server_run(self, stdout):
+        """ Tests that a run sent to the server prints its answer and saves the snapshot a local
+            run saves.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            filename = directory + "/board.csv"
+            with open(self.PATH_TO_TESTS + "/toplevel_test.csv", "r") as csv_file:
+                csv_text = csv_file.read()
+            with open(filename, "w") as csv_file:
+                csv_file.write(csv_text)
+
+            run(self.run_args(filename, n=False))
+            server_search_count = self._backend._search_count
+            self.assertGreater(server_search_count, 0)
+            self.assertIn("Price of 1 BoM: 9.36 $AUD per BoM.", stdout.getvalue())
+
+            test_converter = ComponentConverter(backend=FakeBackend(self.FIXTURES),
+                                                facets=check_facets(pricing=True))
+            test_converter.read_csv_file(filename)
+            test_converter.create_component_list()
+            read_converter = test_converter.read_component_list(filename[:-4])
+            self.assertEqual(read_converter._data, test_converter._data)
+            self.assertEqual(read_converter._components, test_converter._components)
+            self.assertEqual([component._price for component in read_converter._components
+                              if not isinstance(component, str)],
+                             [component._price for component in test_converter._components
+                              if not isinstance(component, str)])
+            self.assertEqual(self._backend._search_count, server_search_count)
+
+    @patch('sys.stdout', new_callable = io.StringIO)
+    def test_local_options(self, stdout):
+        """ Tests that checks given options the server can't apply are run locally.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            filename = directory + "/board.csv"
+            with open(self.PATH_TO_TESTS + "/toplevel_test.csv", "r") as csv_file:
+                csv_text = csv_file.read()
+            with open(filename, "w") as csv_file:
+                csv_file.write(csv_text)
+
+            args = self.run_args(filename, f=self.FIXTURES)
+            self.assertEqual(local_options(args), ["-n", "-f"])
+            run(args)
+            self.assertTrue(os.path.exists(filename[:-4]))
+        self.assertEqual(self._backend._search_count, 0)
+        self.assertIn("Price of 1 BoM: 9.36 $AUD per BoM.", stdout.getvalue())
+
+    def test_invalid_query(self):
+        """ Tests that a query without a BoM is refused.
+        """
+        with self.assertRaises(ServerError):
+            query_server(None, url=self._url)
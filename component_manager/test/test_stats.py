@@ -0,0 +1,76 @@
+#-*- coding: utf-8 -*-
+
+import unittest
+import os
+import json
+import tempfile
+from component_manager.src import *
+
+class StatsTesting(unittest.TestCase):
+    PATH_TO_TESTS = os.getcwd() + "/component_manager/test"
+    FIXTURES = PATH_TO_TESTS + "/fixtures.json"
+
+    def test_report(self):
+        """ Tests that phases, counters and latency percentiles are summarised.
+        """
+        test_stats = RunStats()
+        with test_stats.phase("read_csv_file"):
+            pass
+        with test_stats.phase("read_csv_file"):
+            pass
+        for latency in range(1, 101):
+            test_stats.record_call(latency / 1000, failed=latency > 98)
+        test_stats.count("cache_hits", 3)
+        test_stats.count("cache_misses")
+
+        report = test_stats.report()
+        self.assertEqual(report["phases"]["read_csv_file"]["calls"], 2)
+        self.assertEqual((report["api_calls"], report["api_errors"]), (100, 2))
+        self.assertEqual(report["latency"]["p50"], 0.05)
+        self.assertEqual(report["latency"]["p99"], 0.099)
+        self.assertEqual(report["latency"]["max"], 0.1)
+        self.assertEqual(report["cache"]["hit_rate"], 0.75)
+        json.dumps(report)
+
+        test_stats.reset()
+        self.assertEqual(test_stats.report()["phases"], {})
+        self.assertEqual(test_stats.report()["latency"], {})
+
+    def test_latency_window(self):
+        """ Tests that latency percentiles are taken over the most recent API calls only.
+        """
+        test_stats = RunStats()
+        for latency in range(LATENCY_WINDOW + 100):
+            test_stats.record_call(latency)
+        report = test_stats.report()
+        self.assertEqual(len(test_stats._latencies), LATENCY_WINDOW)
+        self.assertEqual(report["api_calls"], LATENCY_WINDOW + 100)
+        self.assertEqual(report["latency"]["max"], LATENCY_WINDOW + 99)
+        self.assertEqual(report["latency"]["p50"], LATENCY_WINDOW // 2 + 99)
+
+    def test_run_stats(self):
+        """ Tests that a run records its phases, API calls, cache use and bytes written.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            test_cache = ComponentCache(os.path.join(directory, "cache.db"))
+            RUN_STATS.reset()
+            for i in range(2):
+                test_converter = ComponentConverter(test_cache, FakeBackend(self.FIXTURES))
+                test_converter.read_csv_file(self.PATH_TO_TESTS + "/toplevel_test.csv")
+                test_converter.create_component_list(workers=4)
+            test_converter.save_component_list(os.path.join(directory, "snapshot"))
+            snapshot_size = os.path.getsize(os.path.join(directory, "snapshot"))
+            test_cache.close()
+
+        report = RUN_STATS.report()
+        part_count = len(set(component_data[CSV_PART_NUMBER_INDEX]
+                             for component_data in test_converter._data))
+        self.assertEqual(report["phases"]["create_component_list"]["calls"], 2)
+        self.assertEqual(report["api_calls"], part_count)
+        self.assertEqual(report["cache"], {"hits": part_count, "misses": part_count,
+                                           "hit_rate": 0.5})
+        self.assertEqual(report["bytes_written"], snapshot_size)
+
+
+if __name__ == '__main__':
+    unittest.main()
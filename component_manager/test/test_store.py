@@ -0,0 +1,133 @@
+#-*- coding: utf-8 -*-
+
+import unittest
+import os
+import tempfile
+from component_manager.src import *
+
+class StoreTesting(unittest.TestCase):
+    PATH_TO_TESTS = os.getcwd() + "/component_manager/test"
+    FIXTURES = PATH_TO_TESTS + "/fixtures.json"
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self._filename = os.path.join(self._directory.name, "snapshot")
+        self._converter = ComponentConverter(backend=FakeBackend(self.FIXTURES))
+        self._converter.read_csv_file(self.PATH_TO_TESTS + "/toplevel_test.csv")
+        self._converter.create_component_list()
+        self._converter.save_component_list(self._filename)
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def test_read_write(self):
+        """ Tests that a saved component list is read back unchanged.
+        """
+        self.assertTrue(is_component_store(self._filename))
+        read_converter = self._converter.read_component_list(self._filename)
+        self.assertEqual(read_converter._data, self._converter._data)
+        self.assertEqual(len(read_converter._components), len(self._converter._components))
+        for read_component, component in zip(read_converter._components,
+                                              self._converter._components):
+            self.assertEqual(type(read_component), type(component))
+            if isinstance(component, str):
+                self.assertEqual(read_component, component)
+            else:
+                self.assertEqual(read_component, component)
+                self.assertEqual(read_component._price, component._price)
+                self.assertEqual(read_component._lead_time, component._lead_time)
+
+    def test_read_legacy_pickle(self):
+        """ Tests that pickled snapshots saved by older versions can still be read.
+        """
+        self.assertFalse(is_component_store(self.PATH_TO_TESTS + "/toplevel_test"))
+        read_converter = self._converter.read_component_list(self.PATH_TO_TESTS + "/toplevel_test")
+        self.assertEqual(len(read_converter._components), len(self._converter._components))
+
+    def test_read_part(self):
+        """ Tests reading a single part from a snapshot.
+        """
+        test_store = ComponentStore(self._filename)
+        test_resistor = test_store.read_part("RC0402FR-07715KL")
+        self.assertIsInstance(test_resistor, Resistor)
+        self.assertEqual(test_resistor._lead_time, "20 week(s)")
+        self.assertEqual(test_resistor._parameters[test_resistor.RESISTANCE_SEARCH_CODE],
+                         "715 kOhms")
+        self.assertEqual(test_store.read_part("STE1206M1W0R016F"), "STE1206M1W0R016F")
+        self.assertIsNone(test_store.read_part("NOT-A-PART"))
+        test_store.close()
+
+    def test_read_column(self):
+        """ Tests reading a single column from a snapshot.
+        """
+        test_store = ComponentStore(self._filename)
+        prices = test_store.read_column("price")
+        lead_times = dict(test_store.read_column("lead_time"))
+        self.assertEqual(prices[0], ("C3225X5R1C226M250AA", [0.51, 23.88]))
+        self.assertEqual(lead_times["CL31A476MPHNNNE"], "28 week(s)")
+        self.assertNotIn("STE1206M1W0R016F", lead_times)
+        with self.assertRaises(StoreError):
+            test_store.read_column("parameters")
+        test_store.close()
+
+    def test_price_breaks(self):
+        """ Tests that the price breaks of each part are stored.
+        """
+        self._converter._components[0]._price_breaks = [[1, 0.51], [10, 0.4], [100, 0.2388]]
+        self._converter.save_component_list(self._filename)
+
+        test_store = ComponentStore(self._filename)
+        self.assertEqual(test_store.read_part("C3225X5R1C226M250AA")._price_breaks,
+                         [[1, 0.51], [10, 0.4], [100, 0.2388]])
+        self.assertEqual(test_store.read_column("price_breaks")[0],
+                         ("C3225X5R1C226M250AA", [[1, 0.51], [10, 0.4], [100, 0.2388]]))
+        test_store.close()
+
+        data, components = ComponentStore(self._filename).read()
+        self.assertEqual(components[0]._price_breaks, [[1, 0.51], [10, 0.4], [100, 0.2388]])
+        self.assertEqual(components, self._converter._components)
+
+    def test_parameter_values(self):
+        """ Tests that each distinct parameter value is stored once and restored as one object.
+        """
+        test_store = ComponentStore(self._filename)
+        test_store.connect()
+        value_count = test_store._connection.execute(
+            "SELECT COUNT(*) FROM parameter_values").fetchone()[0]
+        parameter_count = test_store._connection.execute(
+            "SELECT COUNT(*) FROM parameters WHERE value_id IS NOT NULL").fetchone()[0]
+        self.assertLess(value_count, parameter_count)
+        test_store.close()
+
+        data, components = ComponentStore(self._filename).read()
+        statuses = [component.parameter(component.STATUS_SEARCH_CODE) for component in components
+                    if not isinstance(component, str)]
+        self.assertEqual(statuses[0], "Active")
+        self.assertTrue(all(status is statuses[0] for status in statuses if status == "Active"))
+
+    def test_unsupported_version(self):
+        """ Tests that snapshots with a different format version are rejected.
+        """
+        test_store = ComponentStore(self._filename)
+        test_store.connect()
+        with test_store._connection:
+            test_store._connection.execute("UPDATE meta SET value = '0' WHERE key = 'version'")
+        test_store.close()
+        with self.assertRaises(StoreError):
+            ComponentStore(self._filename).read()
+
+    def test_failed_write(self):
+        """ Tests that a write failing partway through leaves the previous snapshot in place.
+        """
+        with open(self._filename, "rb") as snapshot_file:
+            snapshot = snapshot_file.read()
+        test_store = ComponentStore(self._filename)
+        with self.assertRaises(IndexError):
+            test_store.write([], self._converter._components)
+        with open(self._filename, "rb") as snapshot_file:
+            self.assertEqual(snapshot_file.read(), snapshot)
+        self.assertEqual(os.listdir(self._directory.name), ["snapshot"])
+
+
+if __name__ == '__main__':
+    unittest.main()
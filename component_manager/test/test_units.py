@@ -0,0 +1,50 @@
+#-*- coding: utf-8 -*-
+
+import unittest
+from component_manager.src import *
+
+class UnitTesting(unittest.TestCase):
+    def test_parse_quantity(self):
+        """ Tests normalisation of parameter values into base SI units.
+        """
+        self.assertEqual(parse_quantity("10 kOhms"), 10000)
+        self.assertAlmostEqual(parse_quantity("16 mOhms"), 0.016)
+        self.assertEqual(parse_quantity("0.125W, 1/8W"), 0.125)
+        self.assertEqual(parse_quantity("1W"), 1)
+        self.assertEqual(parse_quantity("25V"), 25)
+        self.assertEqual(parse_quantity("30 V"), 30)
+        self.assertAlmostEqual(parse_quantity("0.1 µF"), 1e-7)
+        self.assertAlmostEqual(parse_quantity("120 pF"), 1.2e-10)
+        self.assertAlmostEqual(parse_quantity("4.7 µH"), 4.7e-6)
+        self.assertEqual(parse_quantity("7 A"), 7)
+        self.assertAlmostEqual(parse_quantity("500mA"), 0.5)
+        self.assertAlmostEqual(parse_quantity("200mA (DC)"), 0.2)
+        self.assertIsNone(parse_quantity("-"))
+        self.assertIsNone(parse_quantity(None))
+
+    def test_parse_temperature_range(self):
+        """ Tests normalisation of temperature ranges.
+        """
+        self.assertEqual(parse_temperature_range("-55°C ~ 155°C"), (-55, 155))
+        self.assertEqual(parse_temperature_range("-40°C ~ 125°C (TJ)"), (-40, 125))
+        self.assertIsNone(parse_temperature_range("-"))
+
+    def test_numeric_parameters(self):
+        """ Tests that numeric values are stored when parameters are set and used for alternatives.
+        """
+        resistor_one = Resistor("PRL1632-R016-F-T1")
+        resistor_two = Resistor("STE1206M1W0R016F")
+        for test_resistor, power in ((resistor_one, "0.5W, 1/2W"), (resistor_two, "1W")):
+            test_resistor._parameters[test_resistor.RESISTANCE_SEARCH_CODE] = "16 mOhms"
+            test_resistor._parameters[test_resistor.PACKAGE_SEARCH_CODE] = "1206 (3216 Metric)"
+            test_resistor._parameters[test_resistor.TEMPERATURE_SEARCH_CODE] = "-55°C ~ 155°C"
+            test_resistor._parameters[test_resistor.POWER_SEARCH_CODE] = power
+
+        self.assertEqual(resistor_two.numeric(resistor_two.POWER_SEARCH_CODE), 1)
+        self.assertEqual(resistor_two.numeric(resistor_two.TEMPERATURE_SEARCH_CODE), (-55, 155))
+        self.assertTrue(resistor_one.is_alternative(resistor_two))
+        self.assertFalse(resistor_two.is_alternative(resistor_one))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+#-*- coding: utf-8 -*-
+
+import unittest
+from unittest.mock import patch
+import os
+from io import StringIO
+from component_manager.src import *
+
+class ValidatorTesting(unittest.TestCase):
+    PATH_TO_TESTS = os.getcwd() + "/component_manager/test"
+
+    def setUp(self):
+        test_converter = ComponentConverter()
+        self._components = test_converter.read_component_list(
+            self.PATH_TO_TESTS + "/toplevel_test")._components
+
+    @patch('sys.stdout', new_callable = StringIO)
+    def test_validate_pairs(self, stdout):
+        """ Tests that batched pair validation agrees with each component's alternative check.
+        """
+        originals = self._components[0::2]
+        alternatives = self._components[1::2]
+        results = validate_pairs(originals, alternatives)
+
+        self.assertEqual(len(results), len(originals))
+        for (valid, reason), original, alternative in zip(results, originals, alternatives):
+            if isinstance(original, str) or isinstance(alternative, str):
+                self.assertEqual((valid, reason), (False, "Part wasn't found."))
+            else:
+                self.assertEqual(valid, original.is_alternative(alternative))
+        self.assertIn((False, "Part specfications don't match."), results)
+
+    def test_validate_pairs_parallel(self):
+        """ Tests that pairs validated across processes give the results of a single process in
+            pair order.
+        """
+        originals = self._components[0::2]
+        alternatives = self._components[1::2]
+        results = list(validate_pairs_parallel(originals, alternatives, processes=2, chunk_size=3))
+        self.assertEqual(results, validate_pairs(originals, alternatives))
+
+        restored = restore_component(compact_component(originals[2]))
+        self.assertEqual(type(restored), type(originals[2]))
+        self.assertEqual(restored._parameters, originals[2]._parameters)
+        self.assertEqual(restore_component(compact_component("NOT-A-PART")), "NOT-A-PART")
+
+    def test_validate_matrix(self):
+        """ Tests validation of every candidate against every original component.
+        """
+        reasons = validate_matrix(self._components, self._components)
+        self.assertEqual(reasons.shape, (len(self._components), len(self._components)))
+
+        # Every found resistor and capacitor is a valid alternative for itself
+        for i, component in enumerate(self._components):
+            if isinstance(component, str):
+                self.assertEqual(reasons[i, i], REASON_NOT_FOUND)
+            else:
+                self.assertEqual(reasons[i, i], REASON_VALID)
+
+        # Capacitors are never alternatives for resistors
+        capacitor = self._components.index(
+            next(c for c in self._components if isinstance(c, Capacitor)))
+        resistor = self._components.index(
+            next(c for c in self._components if isinstance(c, Resistor)))
+        self.assertEqual(reasons[resistor, capacitor], REASON_TYPE)
+
+    def test_rating_reason(self):
+        """ Tests that failing minimum ratings are reported with their rating name.
+        """
+        resistor_one = Resistor("PRL1632-R016-F-T1")
+        resistor_two = Resistor("STE1206M1W0R016F")
+        for test_resistor, power in ((resistor_one, "1W"), (resistor_two, "0.5W, 1/2W")):
+            test_resistor._parameters[test_resistor.RESISTANCE_SEARCH_CODE] = "16 mOhms"
+            test_resistor._parameters[test_resistor.PACKAGE_SEARCH_CODE] = "1206 (3216 Metric)"
+            test_resistor._parameters[test_resistor.TEMPERATURE_SEARCH_CODE] = "-55°C ~ 155°C"
+            test_resistor._parameters[test_resistor.POWER_SEARCH_CODE] = power
+
+        self.assertEqual(validate_pairs([resistor_one, resistor_two], [resistor_two, resistor_one]),
+                         [(False, "Power specfications aren't sufficient."), (True, None)])
+        self.assertEqual(validate_pairs([IC("APT1608CGCK")], [IC("KP1608CGCK")]),
+                         [(False, "Alternatives can't be verified.")])
+
+        # Every rating of the component classes has a fixed reason code
+        for component_class in (Resistor, Capacitor, Inductor, Ferrite, Choke, Diode):
+            for rating in component_class.MINIMUM_RATINGS.values():
+                self.assertEqual(REASONS[rating_reason(rating)],
+                                 rating + " specfications aren't sufficient.")
+        self.assertEqual(rating_reason("Power"), REASON_POWER)
+
+
+if __name__ == '__main__':
+    unittest.main()